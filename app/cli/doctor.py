@@ -10,7 +10,7 @@ from datetime import datetime, timedelta  # 处理时间窗口
 from pathlib import Path  # 统一处理路径对象
 from typing import List  # 类型提示
 
-from sqlalchemy import inspect, text  # 数据库元信息查询与执行原生 SQL
+from sqlalchemy import DateTime, bindparam, inspect, text  # 数据库元信息查询与执行原生 SQL
 from sqlalchemy.exc import SQLAlchemyError  # 捕获 SQLAlchemy 异常
 
 from config.settings import (  # 导入配置及目录常量
@@ -145,7 +145,7 @@ def _check_theme_inventory(session) -> List[CheckResult]:
     """统计主题库存并输出近 7 天消耗情况。"""
 
     results: List[CheckResult] = []  # 初始化结果列表
-    cutoff = (datetime.utcnow() - timedelta(days=7)).isoformat()  # 计算 7 天窗口
+    cutoff = datetime.utcnow() - timedelta(days=7)  # 计算 7 天窗口，以原生时间类型绑定
     try:  # 捕获数据库异常
         with session.begin():  # 开启事务
             count_stmt = text(
@@ -160,7 +160,7 @@ def _check_theme_inventory(session) -> List[CheckResult]:
                 GROUP BY day
                 ORDER BY day DESC
                 """
-            )  # 构造近 7 天消耗统计 SQL
+            ).bindparams(bindparam("cutoff", type_=DateTime()))  # 构造近 7 天消耗统计 SQL
             history = session.execute(history_stmt, {"cutoff": cutoff}).mappings().all()  # 执行查询
         status = STATUS_OK if remaining >= settings.theme_low_watermark else STATUS_WARN  # 根据阈值决定状态
         message = (
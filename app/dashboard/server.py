@@ -30,6 +30,7 @@ from app.dispatch.api import router as dispatch_router  # 分发队列路由
 from app.dispatch.store import run_dispatch_migrations  # 分发库迁移
 from app.dashboard.views.alerts import router as alerts_router  # 告警面板路由
 from app.scheduler.api import list_schedules, pause_schedule, resume_schedule, run_now  # 调度控制
+from app.telemetry.client import flush_metrics  # 关停时冲刷异步指标
 from app.utils.logger import get_logger  # 日志工具
 from app.telemetry.metrics import (  # Prometheus 指标工具
     PROMETHEUS_ENABLED,  # 指标开关
@@ -129,6 +130,13 @@ async def on_startup() -> None:  # 启动事件
     run_dispatch_migrations()  # 确保分发数据库建表
 
 
+@app.on_event("shutdown")  # 注册关停事件
+def on_shutdown() -> None:  # 关停事件
+    """等待后台线程写完已入队的 task_*/job_* 指标。"""  # 中文说明
+
+    flush_metrics()  # 冲刷异步指标队列
+
+
 @app.get("/healthz")  # 健康检查路由
 def healthz() -> dict[str, str]:  # 健康检查
     """返回简单的健康状态。"""  # 中文说明
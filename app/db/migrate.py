@@ -8,6 +8,8 @@
 
 from __future__ import annotations
 
+from functools import lru_cache  # 按 URL 复用引擎
+
 from sqlalchemy import create_engine, text  # 创建数据库连接与执行原生 SQL
 from sqlalchemy.orm import sessionmaker  # 创建 Session 工厂
 
@@ -21,13 +23,27 @@ LOGGER = get_logger(__name__)  # 初始化模块级日志记录器
 
 
 def get_engine():
-    """根据配置创建数据库引擎。"""
+    """返回当前配置 URL 对应的数据库引擎，同一 URL 在进程内只创建一次。"""
+
+    return _engine_for_url(settings.database.url)  # 按 URL 复用引擎与连接池
+
+
+@lru_cache(maxsize=8)
+def _engine_for_url(url: str):
+    """创建数据库引擎：SQLite 允许跨线程复用连接，其余数据库配置连接池参数。"""
 
-    LOGGER.info("创建数据库引擎 url=%s", settings.database.url)  # 记录引擎创建意图
+    LOGGER.info("创建数据库引擎 url=%s", url)  # 记录引擎创建意图
+    if url.startswith("sqlite"):  # SQLite 文件库沿用默认队列池，避免多个会话共用同一连接
+        return create_engine(url, echo=False, future=True, connect_args={"check_same_thread": False})
     return create_engine(  # 返回 SQLAlchemy 引擎
-        settings.database.url,  # 使用配置中的数据库 URL
+        url,  # 使用配置中的数据库 URL
         echo=False,  # 关闭 SQL 回显
         future=True,  # 启用 2.0 风格
+        pool_size=10,  # 常驻连接数
+        max_overflow=20,  # 峰值额外连接数
+        pool_timeout=30,  # 等待空闲连接的超时秒数
+        pool_pre_ping=True,  # 取出连接前探活
+        pool_recycle=1800,  # 定期回收避免服务端超时断开
     )
 
 
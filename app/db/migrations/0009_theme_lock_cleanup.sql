@@ -0,0 +1,14 @@
+-- -*- coding: utf-8 -*-  # 指定文件编码
+-- 清理旧版以文本写入的主题软锁，此后 locked_at 以原生时间类型比较。  # 文件说明
+
+BEGIN;  -- 开启事务，确保执行失败时整体回滚
+
+-- 清理旧版以 isoformat() 文本写入的软锁（形如 2026-01-01T08:00:00+00:00）：
+-- SQLite 按文本比较时 'T' 排在空格之后，同日的旧锁永远不满足 locked_at < :expire，崩溃运行留下的锁无法回收。
+-- PostgreSQL 的 TIMESTAMP 列转文本后以空格分隔，不会命中该条件。请在停止生成任务后执行。
+UPDATE psychology_themes
+SET locked_by_run_id = NULL,
+    locked_at = NULL
+WHERE CAST(locked_at AS TEXT) LIKE '____-__-__T%';
+
+COMMIT;  -- 提交事务
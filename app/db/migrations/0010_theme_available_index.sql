@@ -0,0 +1,10 @@
+-- -*- coding: utf-8 -*-  # 指定文件编码
+-- 为未使用主题建立部分索引，并发领取时按 id 顺序直接定位候选行。  # 文件说明
+
+BEGIN;  -- 开启事务，确保执行失败时整体回滚
+
+CREATE INDEX IF NOT EXISTS ix_themes_available  -- 仅收录未使用主题，配合 FOR UPDATE SKIP LOCKED 跳过已锁行
+ON psychology_themes(id)
+WHERE used IS NULL OR used = 0;
+
+COMMIT;  -- 提交事务
@@ -0,0 +1,10 @@
+-- -*- coding: utf-8 -*-  # 指定文件编码
+-- 为持有软锁的主题建立部分索引，加速回收过期软锁的分支。  # 文件说明
+
+BEGIN;  -- 开启事务，确保执行失败时整体回滚
+
+CREATE INDEX IF NOT EXISTS ix_themes_lock  -- 仅收录被锁定的主题，按 locked_at 范围定位过期锁
+ON psychology_themes(locked_at)
+WHERE locked_by_run_id IS NOT NULL;
+
+COMMIT;  -- 提交事务
@@ -10,6 +10,7 @@ from sqlalchemy import (  # 引入 SQLAlchemy 类型与约束工具
     ForeignKey,  # 外键约束
     Index,  # 普通索引构造器
     Integer,  # 整型列
+    LargeBinary,  # 二进制列用于内容哈希
     String,  # 可变字符串列
     Text,  # 文本列
     UniqueConstraint,  # 唯一约束
@@ -115,7 +116,8 @@ class TaskQueue(SchedBase):  # 队列表定义
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)  # 主键自增 ID
     profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id"), nullable=False)  # 关联 Profile
-    payload_json: Mapped[str] = mapped_column(Text, nullable=False)  # 序列化的任务负载
+    payload_json: Mapped[str] = mapped_column(Text, nullable=False)  # 序列化的任务负载，去重入队时留空
+    payload_sha: Mapped[bytes | None] = mapped_column(LargeBinary(32), nullable=True)  # 指向 payload_blobs 的内容哈希
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)  # 入队时间
     available_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)  # 可被租约的时间
     priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # 优先级数值，数字越大越优先
@@ -132,6 +134,24 @@ class TaskQueue(SchedBase):  # 队列表定义
     )
 
 
+class PayloadBlob(SchedBase):  # 任务负载内容寻址表
+    """按内容哈希存储唯一的任务负载，相同 payload 的任务共享同一行。"""  # 类中文说明
+
+    __tablename__ = "payload_blobs"  # 指定表名
+
+    sha: Mapped[bytes] = mapped_column(LargeBinary(32), primary_key=True)  # 负载内容哈希主键
+    payload_json: Mapped[str] = mapped_column(Text, nullable=False)  # 序列化的负载内容
+
+
+class QueueCounter(SchedBase):  # 队列状态计数表
+    """按状态维护任务数量，状态变更时同步增减，供队列统计直接读取。"""  # 类中文说明
+
+    __tablename__ = "queue_counters"  # 指定表名
+
+    status: Mapped[str] = mapped_column(String(16), primary_key=True)  # 任务状态主键
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # 当前状态的任务数量
+
+
 class Heartbeat(SchedBase):  # Worker 心跳表
     """保存 Worker 最近在线时间与附加信息。"""  # 类中文说明
 
@@ -176,10 +196,19 @@ Index("idx_jobrun_started", JobRun.started_at)  # JobRun 开始时间索引
 Index("idx_jobrun_profile", JobRun.profile_id)  # JobRun Profile 索引
 Index("idx_jobrun_date", JobRun.run_date)  # 新增: JobRun 运行日期索引
 Index(
-    "idx_taskqueue_status_available",
+    "idx_taskqueue_lease_order",
     TaskQueue.status,
     TaskQueue.available_at,
-)  # 队列状态+可用时间索引
+    TaskQueue.priority.desc(),
+    TaskQueue.id,
+)  # 租约候选查询的复合索引: 过滤列在前，排序列随后，取代原 status+available_at 索引
+Index(
+    "idx_taskqueue_dead",
+    TaskQueue.status,
+    TaskQueue.id.desc(),
+    sqlite_where=TaskQueue.status == "dead",
+    postgresql_where=TaskQueue.status == "dead",
+)  # 死信列表的部分索引，仅收录死亡任务
 Index("idx_taskqueue_priority", TaskQueue.priority)  # 队列优先级索引
 Index("idx_taskqueue_lease", TaskQueue.lease_by)  # 队列租约持有者索引
 Index("idx_heartbeat_seen", Heartbeat.last_seen_at)  # 心跳最近时间索引
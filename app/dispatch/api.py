@@ -2,7 +2,6 @@
 
 from __future__ import annotations  # 启用未来注解语法
 
-import json  # 处理 JSON
 from datetime import datetime  # 解析时间
 from typing import Any, Dict, List  # 类型提示
 
@@ -103,7 +102,7 @@ def lease_tasks(payload: LeaseRequest, _: None = Depends(_require_worker_token))
                 "profile_id": task.profile_id,
                 "attempts": task.attempts,
                 "max_attempts": task.max_attempts,
-                "payload": json.loads(task.payload_json),
+                "payload": service.load_task_payload(task),
                 "lease_until": task.lease_until.isoformat() if task.lease_until else None,
             }
         )  # 序列化任务
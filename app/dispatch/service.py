@@ -2,30 +2,138 @@
 
 from __future__ import annotations  # 启用未来注解语法
 
+import errno  # 识别跨设备移动错误
+import hashlib  # 计算负载内容哈希
 import json  # 用于序列化 payload
+import os  # 底层文件系统调用
 import shutil  # 文件移动辅助
-from datetime import datetime, timedelta  # 时间运算
+import time  # 单调时钟用于读缓存过期
+from collections import Counter  # 汇总状态计数变化
+from concurrent.futures import ThreadPoolExecutor  # 并行执行跨设备复制
+from datetime import datetime, timedelta, timezone  # 时间运算
+from functools import lru_cache  # 缓存 Profile 名称查询
 from pathlib import Path  # 路径操作
-from typing import Any, Dict, List  # 类型提示
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple  # 类型提示
 
-from sqlalchemy import and_, func, or_  # 使用 SQL 表达式与布尔组合
+from sqlalchemy import and_, bindparam, or_, select, update  # 使用 SQL 表达式与布尔组合
+from sqlalchemy.dialects.postgresql import insert as pg_insert  # PostgreSQL 冲突忽略插入
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert  # SQLite 冲突忽略插入
+from sqlalchemy.orm.attributes import set_committed_value  # 回填实体属性而不标记为脏
 
 from config.settings import settings  # 引入配置
 from app.chaos.hooks import maybe_inject_chaos  # 引入混沌注入钩子
 from app.db.migrate_sched import sched_session_scope  # 调度库会话
-from app.db.models_sched import Heartbeat, JobRun, TaskQueue  # ORM 模型
+from app.db.models_sched import Heartbeat, JobRun, PayloadBlob, Profile, QueueCounter, TaskQueue  # ORM 模型
 from app.utils.logger import get_logger  # 日志工具
 from .store import dispatch_session_scope  # 分发库会话
-from app.telemetry.client import emit_metric  # 指标事件上报
+from app.telemetry.client import emit_metric_async  # 指标事件异步上报
 from app.telemetry.metrics import inc_run, observe_latency  # Prometheus 指标
 
 LOGGER = get_logger(__name__)  # 初始化日志记录器
+_DIR_FD_SUPPORTED = os.rename in os.supports_dir_fd and os.open in os.supports_dir_fd  # 平台是否支持 renameat/openat
+_READ_CACHE_TTL_SEC = 2.0  # Dashboard 轮询读接口的缓存时长
+_READ_CACHE: Dict[str, Tuple[float, Any]] = {}  # 读缓存: 键 -> (过期时刻, 结果)
+_PROFILE_LABEL_TTL_SEC = 300.0  # Profile 指标标签缓存时长，兜底跨进程改名
+_PROFILE_LABELS: Dict[int, Tuple[float, str]] = {}  # Profile 标签缓存: ID -> (过期时刻, 名称)
+
+# 热路径语句在导入时构建一次，调用时仅绑定参数，省去每次拼装查询对象的开销
+_LEASE_CANDIDATE_STMT = (  # 按优先级挑选一条可租约任务
+    select(TaskQueue)
+    .where(
+        or_(
+            TaskQueue.status == "pending",
+            and_(
+                TaskQueue.status == "leased",
+                TaskQueue.lease_until.isnot(None),
+                TaskQueue.lease_until < bindparam("now"),
+            ),
+        )
+    )
+    .where(TaskQueue.available_at <= bindparam("now"))
+    .order_by(TaskQueue.priority.desc(), TaskQueue.id.asc())
+    .limit(1)
+)
+_TASK_BY_IDEMPOTENCY_STMT = select(TaskQueue).where(TaskQueue.idempotency_key == bindparam("idempotency_key"))  # 按幂等键查任务
+_TASKS_BY_IDS_STMT = select(
+    TaskQueue.id,
+    TaskQueue.profile_id,
+    TaskQueue.status,
+    TaskQueue.lease_by,
+    TaskQueue.attempts,
+    TaskQueue.max_attempts,
+    TaskQueue.payload_json,
+    TaskQueue.payload_sha,
+    TaskQueue.created_at,
+    TaskQueue.available_at,
+).where(TaskQueue.id.in_(bindparam("task_ids", expanding=True)))  # 按 ID 批量取任务列，不构造 ORM 实体
+_SETTLE_TASK_STMT = (  # 完成/失败时按任务写回状态，供 executemany 使用
+    update(TaskQueue)
+    .where(TaskQueue.id == bindparam("t_id"))
+    .values(
+        status=bindparam("status"),
+        available_at=bindparam("available_at"),
+        last_error=bindparam("last_error"),
+        lease_by=None,
+        lease_until=None,
+    )
+)
+_JOB_RUNS_BY_IDS_STMT = select(JobRun.id, JobRun.profile_id, JobRun.started_at).where(
+    JobRun.id.in_(bindparam("job_run_ids", expanding=True))
+)  # 按 ID 批量查 JobRun 指标字段
+_DEAD_LETTERS_STMT = (  # 死信列表只取展示所需列，走 idx_taskqueue_dead
+    select(
+        TaskQueue.id,
+        TaskQueue.profile_id,
+        TaskQueue.attempts,
+        TaskQueue.last_error,
+        TaskQueue.payload_json,
+        TaskQueue.payload_sha,
+    )
+    .where(TaskQueue.status == "dead")
+    .order_by(TaskQueue.id.desc())
+)
+_HEARTBEATS_STMT = select(Heartbeat).order_by(Heartbeat.last_seen_at.desc())  # 列出全部心跳
+_PAYLOAD_BLOB_STMT = select(PayloadBlob.payload_json).where(PayloadBlob.sha == bindparam("sha"))  # 按哈希读共享负载
+_PAYLOAD_BLOB_EXISTS_STMT = select(PayloadBlob.sha).where(PayloadBlob.sha == bindparam("sha"))  # 判断共享负载是否已存在
+
+
+class TaskView(NamedTuple):  # 完成/失败路径使用的只读任务视图
+    """按列取回的任务快照，字段名与 TaskQueue 一致，供接口序列化与 JobRun 更新使用。"""  # 类中文说明
+
+    id: int  # 任务 ID
+    profile_id: int  # 关联 Profile
+    status: str  # 任务状态
+    lease_by: str | None  # 租约持有者
+    attempts: int  # 已尝试次数
+    max_attempts: int  # 最大尝试次数
+    payload_json: str  # 行内负载
+    payload_sha: bytes | None  # 共享负载哈希
+    created_at: datetime | None  # 入队时间
+    available_at: datetime | None  # 可领取时间
 
 
 def _utcnow() -> datetime:  # 内部统一获取当前 UTC 时间
-    """返回当前的 UTC 时间，确保数据库时序一致。"""  # 中文说明
+    """返回当前的 UTC 时间，确保数据库时序一致；公开入口取一次后向下传递。"""  # 中文说明
+
+    return datetime.now(timezone.utc).replace(tzinfo=None)  # 朴素 UTC，与数据库列保持一致
+
+
+def _cached_read(key: str, loader: Callable[[], Any]) -> Any:  # 短时读缓存
+    """在 TTL 内复用读接口结果，过期或被写路径清除后重新加载。"""  # 中文说明
+
+    now = time.monotonic()  # 单调时钟
+    hit = _READ_CACHE.get(key)  # 查找缓存
+    if hit is not None and hit[0] > now:  # 命中且未过期
+        return hit[1]
+    value = loader()  # 重新加载
+    _READ_CACHE[key] = (now + _READ_CACHE_TTL_SEC, value)  # 写入缓存
+    return value
 
-    return datetime.utcnow()  # 使用标准库获取朴素 UTC
+
+def _invalidate_read_cache(key: str) -> None:  # 清除读缓存
+    """写路径调用，确保下一次读取看到最新数据。"""  # 中文说明
+
+    _READ_CACHE.pop(key, None)  # 删除缓存项
 
 
 def enqueue_task(
@@ -45,17 +153,17 @@ def enqueue_task(
         max_attempts = settings.job_max_retries  # 使用配置默认值
     with dispatch_session_scope() as session:  # 打开分发库会话
         if idempotency_key:  # 若提供幂等键
-            existing = (  # 查询是否已存在任务
-                session.query(TaskQueue)
-                .filter(TaskQueue.idempotency_key == idempotency_key)
-                .one_or_none()
-            )
+            existing = session.execute(
+                _TASK_BY_IDEMPOTENCY_STMT, {"idempotency_key": idempotency_key}
+            ).scalar_one_or_none()  # 查询是否已存在任务
             if existing:  # 若已存在
                 LOGGER.info("命中幂等键 idempotency_key=%s task_id=%s", idempotency_key, existing.id)  # 记录日志
                 return existing  # 直接返回
+        payload_sha = _store_payload_blob(session, payload)  # 相同负载只存一份
         record = TaskQueue(  # 创建任务对象
             profile_id=profile_id,
-            payload_json=json.dumps(payload, ensure_ascii=False),
+            payload_json="",  # 负载由 payload_sha 指向共享行
+            payload_sha=payload_sha,
             available_at=available_at,
             priority=priority,
             status="pending",
@@ -64,8 +172,59 @@ def enqueue_task(
         )
         session.add(record)  # 加入会话
         session.flush()  # 刷新以获取 ID
-        LOGGER.info("任务入队 task_id=%s profile_id=%s", record.id, profile_id)  # 记录入队日志
-        return record  # 返回任务
+        _bump_counters(session, Counter({"pending": 1}))  # 同步状态计数
+    _invalidate_read_cache("queue_stats")  # 提交后使统计缓存失效，避免并发读取缓存提交前的计数
+    LOGGER.info("任务入队 task_id=%s profile_id=%s", record.id, profile_id)  # 记录入队日志
+    return record  # 返回任务
+
+
+def _store_payload_blob(session, payload: Dict[str, Any]) -> bytes:  # 写入共享负载
+    """按序列化后的 JSON 计算内容哈希，payload_blobs 中不存在时插入，返回哈希。"""  # 中文说明
+
+    payload_text = json.dumps(payload, ensure_ascii=False)  # 保持调用方键序，Worker 读到的负载与入队时一致
+    sha = hashlib.blake2b(payload_text.encode("utf-8"), digest_size=32).digest()  # 32 字节内容哈希
+    dialect = session.get_bind().dialect.name  # 当前数据库方言
+    if dialect in ("sqlite", "postgresql"):  # 支持冲突忽略的方言
+        insert_fn = sqlite_insert if dialect == "sqlite" else pg_insert  # 选择方言插入构造
+        session.execute(
+            insert_fn(PayloadBlob).values(sha=sha, payload_json=payload_text).on_conflict_do_nothing()
+        )  # 已存在则忽略
+    elif session.execute(_PAYLOAD_BLOB_EXISTS_STMT, {"sha": sha}).first() is None:  # 其他方言先查后插
+        session.add(PayloadBlob(sha=sha, payload_json=payload_text))
+    return sha
+
+
+def load_task_payload(task: TaskQueue | TaskView) -> Dict[str, Any]:  # 解析任务负载
+    """优先解析行内 payload_json，留空时按 payload_sha 读取共享负载。"""  # 中文说明
+
+    if task.payload_json or not task.payload_sha:  # 旧数据或已被改写的任务
+        return json.loads(task.payload_json)
+    return dict(_load_payload_blob(task.payload_sha))  # 浅拷贝，避免调用方改动缓存
+
+
+def _task_job_run_id(task: TaskQueue | TaskView) -> Any:  # 读取任务关联的 JobRun ID
+    """只读解析 payload 中的 job_run_id，共享负载直接读缓存不做拷贝，非法负载返回 None。"""  # 中文说明
+
+    try:
+        if task.payload_json or not task.payload_sha:  # 行内负载
+            payload = json.loads(task.payload_json)
+        else:
+            payload = _load_payload_blob(task.payload_sha)  # 仅读取键值，无需拷贝
+    except ValueError:  # 解析失败或共享负载缺失
+        LOGGER.warning("任务 payload 非法，跳过 JobRun 更新 task_id=%s", task.id)  # 记录警告
+        return None
+    return payload.get("job_run_id")  # 读取 JobRun ID
+
+
+@lru_cache(maxsize=1024)
+def _load_payload_blob(sha: bytes) -> Dict[str, Any]:  # 读取共享负载
+    """按内容哈希读取并解析负载；内容寻址保证缓存不会过期。"""  # 中文说明
+
+    with dispatch_session_scope(read_only=True) as session:  # 只读会话
+        payload_text = session.execute(_PAYLOAD_BLOB_STMT, {"sha": sha}).scalar_one_or_none()  # 查询负载
+    if payload_text is None:  # 共享负载缺失
+        raise ValueError(f"payload blob {sha.hex()} not found")
+    return json.loads(payload_text)  # 解析负载
 
 
 def lease_tasks(agent_name: str, limit: int) -> List[TaskQueue]:  # 租约任务
@@ -76,310 +235,602 @@ def lease_tasks(agent_name: str, limit: int) -> List[TaskQueue]:  # 租约任务
     leased: List[TaskQueue] = []  # 准备返回列表
     ttl = timedelta(seconds=settings.job_heartbeat_ttl_sec)  # 计算租约过期时间
     with dispatch_session_scope() as session:  # 打开分发库会话
+        supports_returning = session.get_bind().dialect.update_returning  # MySQL 等不支持 UPDATE ... RETURNING
         for _ in range(limit):  # 最多尝试 limit 次
-            candidate = (  # 查询符合条件的任务
-                session.query(TaskQueue)
-                .filter(
-                    or_(
-                        TaskQueue.status == "pending",
-                        and_(
-                            TaskQueue.status == "leased",
-                            TaskQueue.lease_until.isnot(None),
-                            TaskQueue.lease_until < now,
-                        ),
-                    )
-                )
-                .filter(TaskQueue.available_at <= now)
-                .order_by(TaskQueue.priority.desc(), TaskQueue.id.asc())
-                .first()
-            )
+            candidate = session.execute(_LEASE_CANDIDATE_STMT, {"now": now}).scalars().first()  # 查询符合条件的任务
             if candidate is None:  # 无可用任务
                 break  # 结束循环
             original_status = candidate.status  # 记录原始状态
-            update_payload = {  # 构造更新字段
-                TaskQueue.status: "leased",
-                TaskQueue.lease_by: agent_name,
-                TaskQueue.lease_until: now + ttl,
+            lease_values: Dict[str, Any] = {  # 构造更新字段
+                "status": "leased",
+                "lease_by": agent_name,
+                "lease_until": now + ttl,
             }
             if original_status != "leased":  # 原状态非 leased 才累加尝试次数
-                update_payload[TaskQueue.attempts] = TaskQueue.attempts + 1  # 增加尝试计数
-            updated = (  # 使用条件更新确保状态竞争安全
-                session.query(TaskQueue)
-                .filter(TaskQueue.id == candidate.id)
-                .filter(TaskQueue.status == original_status)
-                .filter(
+                lease_values["attempts"] = TaskQueue.attempts + 1  # 增加尝试计数
+            stmt = (  # 使用条件更新确保状态竞争安全
+                update(TaskQueue)
+                .where(TaskQueue.id == candidate.id)
+                .where(TaskQueue.status == original_status)
+                .where(
                     or_(
                         TaskQueue.status == "pending",
                         TaskQueue.lease_until.is_(None),
                         TaskQueue.lease_until < now,
                     )
                 )
-                .update(
-                    update_payload,
-                    synchronize_session=False,
-                )
+                .values(**lease_values)
+                .execution_options(synchronize_session=False)
             )
-            if not updated:  # 若更新失败说明被竞争
+            if supports_returning:  # RETURNING 取回最新尝试次数
+                row = session.execute(stmt.returning(TaskQueue.attempts)).first()
+                attempts = row.attempts if row is not None else None
+            elif session.execute(stmt).rowcount == 1:  # 条件更新命中时本地推算尝试次数
+                attempts = candidate.attempts + 1 if original_status != "leased" else candidate.attempts
+            else:
+                attempts = None
+            if attempts is None:  # 若更新失败说明被竞争
                 session.rollback()  # 回滚当前事务
                 continue  # 重试下一轮
-            session.refresh(candidate)  # 刷新实体
+            if original_status != "leased":  # 状态发生变化时同步计数
+                _bump_counters(session, Counter({original_status: -1, "leased": 1}))
+            lease_values["attempts"] = attempts  # 以更新后的尝试次数为准
+            for key, value in lease_values.items():  # 直接回填实体，省去 refresh 的二次 SELECT
+                set_committed_value(candidate, key, value)
             leased.append(candidate)  # 收集任务
-            _mark_job_running(candidate, agent_name)  # 同步 JobRun 状态
+    if leased:  # 提交后使统计缓存失效
+        _invalidate_read_cache("queue_stats")
+    _mark_jobs_running(leased, agent_name, now)  # 租约提交后一次性同步 JobRun 状态
     return leased  # 返回租约结果
 
 
-def _mark_job_running(task: TaskQueue, agent_name: str) -> None:  # 标记 JobRun 正在执行
-    """当任务被租约时更新 JobRun 状态与开始时间。"""  # 中文说明
+def _mark_jobs_running(tasks: List[TaskQueue], agent_name: str, now: datetime) -> None:  # 标记 JobRun 正在执行
+    """租约成功后批量更新关联 JobRun 的状态与开始时间，一条 UPDATE ... IN 完成。"""  # 中文说明
 
-    try:
-        payload = json.loads(task.payload_json)  # 解析 payload
-    except json.JSONDecodeError:  # 解析失败
-        LOGGER.warning("任务 payload 非法 task_id=%s", task.id)  # 记录告警
-        return  # 无法更新 JobRun
-    job_run_id = payload.get("job_run_id")  # 读取 JobRun ID
-    if not job_run_id:  # 未提供则跳过
-        return  # 不更新
+    job_run_ids = {job_run_id for job_run_id in map(_task_job_run_id, tasks) if job_run_id}  # 收集 JobRun ID
+    if not job_run_ids:  # 均未关联 JobRun 时不打开调度库
+        return
+    stmt = (  # 单条 UPDATE 覆盖全部 JobRun
+        update(JobRun)
+        .where(JobRun.id.in_(job_run_ids))
+        .values(status="running", started_at=now, finished_at=None, error=None)
+    )
     with sched_session_scope() as session:  # 打开调度库
-        job_run = session.query(JobRun).filter(JobRun.id == job_run_id).one_or_none()  # 查询 JobRun
-        if not job_run:  # 未找到
-            LOGGER.warning("JobRun 不存在 job_run_id=%s", job_run_id)  # 记录警告
-            return  # 直接返回
-        job_run.status = "running"  # 更新状态
-        job_run.started_at = _utcnow()  # 重置开始时间
-        job_run.finished_at = None  # 清空结束时间
-        job_run.error = None  # 清除错误
-        LOGGER.info("JobRun 开始执行 job_run_id=%s agent=%s", job_run_id, agent_name)  # 记录日志
+        if session.get_bind().dialect.update_returning:  # RETURNING 直接取回命中的 ID
+            updated = set(session.execute(stmt.returning(JobRun.id)).scalars().all())
+        elif session.execute(stmt).rowcount == len(job_run_ids):  # 全部命中时无需再查
+            updated = job_run_ids
+        else:  # 存在缺失时补查一次命中的 ID，用于告警
+            updated = set(
+                session.execute(
+                    _JOB_RUNS_BY_IDS_STMT.with_only_columns(JobRun.id), {"job_run_ids": list(job_run_ids)}
+                ).scalars().all()
+            )
+    for job_run_id in job_run_ids - updated:  # 记录缺失的 JobRun
+        LOGGER.warning("JobRun 不存在 job_run_id=%s", job_run_id)  # 记录警告
+    if updated:
+        LOGGER.info("JobRun 开始执行 job_run_ids=%s agent=%s", sorted(updated), agent_name)  # 记录日志
 
 
 def complete_task(
     task_id: int,  # 任务 ID
     agent_name: str,  # Worker 名称
     result: Dict[str, Any],  # 执行结果
-) -> TaskQueue:
+) -> TaskView:
     """将任务标记为完成并写回运行结果。"""  # 中文说明
 
+    return complete_tasks_batch([(task_id, result)], agent_name)[0]  # 复用批量实现
+
+
+def complete_tasks_batch(
+    results: List[Tuple[int, Dict[str, Any]]],  # (任务 ID, 执行结果) 列表
+    agent_name: str,  # Worker 名称
+) -> List[TaskView]:
+    """批量将任务标记为完成，队列与 JobRun 各在一个事务内分组更新。"""  # 中文说明
+
     maybe_inject_chaos("dispatch.complete")  # 混沌注入: 完成上报阶段
     now = _utcnow()  # 当前时间
     with dispatch_session_scope() as session:  # 打开分发库
-        task = session.query(TaskQueue).filter(TaskQueue.id == task_id).one_or_none()  # 查询任务
-        if task is None:  # 未找到任务
-            raise ValueError(f"task {task_id} not found")  # 抛出异常
-        if task.status != "leased" or task.lease_by != agent_name:  # 校验租约归属
-            raise ValueError("task not leased by agent")  # 抛出异常
-        task.status = "done"  # 标记为完成
-        task.lease_by = None  # 清理租约持有者
-        task.lease_until = None  # 清理租约到期
-        session.flush()  # 刷新持久化
-        _finalize_job_run(task, result, now, success=True)  # 更新 JobRun
-        emit_metric("dispatch", "task_success", 1, profile_id=task.profile_id)  # 记录任务成功指标
+        tasks = _load_leased_tasks(session, [task_id for task_id, _ in results], agent_name)  # 一次查询全部任务
+        session.execute(
+            update(TaskQueue)
+            .where(TaskQueue.id.in_([task.id for task in tasks]))
+            .values(status="done", lease_by=None, lease_until=None)
+        )  # 单条 UPDATE 标记完成并清理租约
+        tasks = [task._replace(status="done", lease_by=None) for task in tasks]  # 同步视图状态
+        _bump_counters(session, Counter({"leased": -len(tasks), "done": len(tasks)}))  # 同步状态计数
+        _finalize_job_runs(
+            [(task, result) for task, (_, result) in zip(tasks, results)], now, success=True
+        )  # 批量更新 JobRun
+    _invalidate_read_cache("queue_stats")  # 提交后使统计缓存失效
+    for task in tasks:  # 事务结束后逐任务上报指标
+        emit_metric_async("dispatch", "task_success", 1, profile_id=task.profile_id)  # 记录任务成功指标
         if task.created_at:  # 若记录了入队时间
             duration = (now - task.created_at).total_seconds()  # 计算执行耗时
             observe_latency(str(task.profile_id), duration)  # 写入 Prometheus 耗时
-        LOGGER.info("任务完成 task_id=%s agent=%s", task_id, agent_name)  # 记录日志
-        return task  # 返回任务
+        LOGGER.info("任务完成 task_id=%s agent=%s", task.id, agent_name)  # 记录日志
+    return tasks  # 返回任务
 
 
 def fail_task(
     task_id: int,  # 任务 ID
     agent_name: str,  # Worker 名称
     error: str,  # 错误信息
-) -> TaskQueue:
+) -> TaskView:
     """任务失败后根据重试策略重新入队或标记死亡。"""  # 中文说明
 
+    return fail_tasks_batch([(task_id, error)], agent_name)[0]  # 复用批量实现
+
+
+def fail_tasks_batch(
+    errors: List[Tuple[int, str]],  # (任务 ID, 错误信息) 列表
+    agent_name: str,  # Worker 名称
+) -> List[TaskView]:
+    """批量处理失败任务，按重试策略分组后统一写回队列与 JobRun。"""  # 中文说明
+
     maybe_inject_chaos("dispatch.fail")  # 混沌注入: 失败上报阶段
     now = _utcnow()  # 当前时间
     backoff = timedelta(seconds=settings.job_retry_backoff_sec)  # 重试退避
     with dispatch_session_scope() as session:  # 打开分发库
-        task = session.query(TaskQueue).filter(TaskQueue.id == task_id).one_or_none()  # 查询任务
-        if task is None:  # 未找到
-            raise ValueError(f"task {task_id} not found")  # 抛出异常
-        if task.status != "leased" or task.lease_by != agent_name:  # 校验租约归属
-            raise ValueError("task not leased by agent")  # 抛出异常
-        task.lease_by = None  # 清理租约
-        task.lease_until = None  # 清空到期时间
-        task.last_error = error  # 记录错误
-        if task.attempts >= task.max_attempts:  # 超过最大次数
-            task.status = "dead"  # 标记死亡
-            _finalize_job_run(task, {"error": error}, now, success=False)  # 更新 JobRun 失败
-            quarantine_dir = _move_task_drafts_to_quarantine(task, error)  # 尝试隔离草稿
-            emit_metric("dispatch", "task_dead", 1, profile_id=task.profile_id)  # 上报死亡指标
-            if quarantine_dir:  # 若生成隔离目录
-                LOGGER.error("任务达到重试上限并已隔离 task_id=%s dir=%s", task_id, quarantine_dir)  # 记录隔离信息
-            else:
-                LOGGER.error("任务达到重试上限 task_id=%s error=%s", task_id, error)  # 记录错误
-        else:  # 仍可重试
-            task.status = "pending"  # 回退为待处理
-            task.available_at = now + backoff  # 设置退避时间
-            _mark_job_retrying(task, error)  # 更新 JobRun 状态
-            emit_metric("dispatch", "task_retry", 1, profile_id=task.profile_id)  # 上报重试指标
-            LOGGER.warning("任务失败重试 task_id=%s next=%s", task_id, task.available_at)  # 记录警告
+        loaded = _load_leased_tasks(session, [task_id for task_id, _ in errors], agent_name)  # 一次查询全部任务
+        tasks: List[TaskView] = []  # 写回后的任务视图
+        dead: List[Tuple[TaskView, str]] = []  # 达到上限的任务
+        retrying: List[Tuple[TaskView, str]] = []  # 仍可重试的任务
+        for task, (_, error) in zip(loaded, errors):  # 计算每个任务的下一状态
+            if task.attempts >= task.max_attempts:  # 超过最大次数
+                task = task._replace(status="dead", lease_by=None)  # 标记死亡
+                dead.append((task, error))
+            else:  # 仍可重试
+                task = task._replace(status="pending", lease_by=None, available_at=now + backoff)  # 回退为待处理并设置退避
+                retrying.append((task, error))
+            tasks.append(task)
+        session.connection().execute(
+            _SETTLE_TASK_STMT,
+            [
+                {"t_id": task.id, "status": task.status, "available_at": task.available_at, "last_error": error}
+                for task, (_, error) in zip(tasks, errors)
+            ],
+        )  # executemany 写回状态、错误与退避时间
+        _bump_counters(
+            session, Counter({"leased": -len(tasks), "dead": len(dead), "pending": len(retrying)})
+        )  # 同步状态计数
+        _finalize_job_runs([(task, {"error": error}) for task, error in dead], now, success=False)  # 批量更新 JobRun 失败
+        _mark_jobs_retrying(retrying)  # 批量更新 JobRun 重试
+    _invalidate_read_cache("queue_stats")  # 提交后使统计缓存失效
+    quarantined = _quarantine_dead_tasks(dead, now)  # 事务提交后再搬移草稿，避免持锁期间做文件 I/O
+    for task, error in dead:  # 事务结束后上报死亡任务
+        emit_metric_async("dispatch", "task_dead", 1, profile_id=task.profile_id)  # 上报死亡指标
+        if quarantined[task.id]:  # 若生成隔离目录
+            LOGGER.error("任务达到重试上限并已隔离 task_id=%s dir=%s", task.id, quarantined[task.id])  # 记录隔离信息
+        else:
+            LOGGER.error("任务达到重试上限 task_id=%s error=%s", task.id, error)  # 记录错误
+    for task, _ in retrying:  # 处理重试任务
+        emit_metric_async("dispatch", "task_retry", 1, profile_id=task.profile_id)  # 上报重试指标
+        LOGGER.warning("任务失败重试 task_id=%s next=%s", task.id, task.available_at)  # 记录警告
+    for task in tasks:  # 统一上报耗时与失败指标
         if task.created_at:  # 若记录了入队时间
             duration = (now - task.created_at).total_seconds()  # 计算耗时
             observe_latency(str(task.profile_id), duration)  # 记录耗时
-        emit_metric("dispatch", "task_failure", 1, profile_id=task.profile_id)  # 上报失败指标
-        session.flush()  # 刷新持久化
-        return task  # 返回任务
+        emit_metric_async("dispatch", "task_failure", 1, profile_id=task.profile_id)  # 上报失败指标
+    return tasks  # 返回任务
+
+
+def _quarantine_dead_tasks(dead: List[Tuple[TaskView, str]], now: datetime) -> Dict[int, str | None]:
+    """在事务外隔离死亡任务的草稿，再以一次短事务回写隔离信息，返回任务 ID -> 隔离目录。"""  # 中文说明
+
+    quarantined: Dict[int, str | None] = {}  # 任务 ID -> 隔离目录
+    params: List[Dict[str, Any]] = []  # executemany 参数
+    for task, error in dead:  # 逐个隔离
+        try:
+            quarantine_dir, payload = _move_task_drafts_to_quarantine(task, error, now)  # 文件系统操作
+            payload_json = json.dumps(payload, ensure_ascii=False)  # 序列化隔离信息
+        except Exception:  # noqa: BLE001  # 任务已提交为 dead，隔离失败只记录不影响接口结果
+            LOGGER.exception("草稿隔离失败 task_id=%s", task.id)  # 记录异常
+            quarantined[task.id] = None
+            continue
+        quarantined[task.id] = quarantine_dir
+        params.append({"t_id": task.id, "payload_json": payload_json})
+    if params:  # 回写已完成隔离的任务负载，单个任务失败不影响其余任务
+        try:
+            with dispatch_session_scope() as session:  # 短事务仅包含 UPDATE
+                session.connection().execute(
+                    update(TaskQueue).where(TaskQueue.id == bindparam("t_id")).values(payload_json=bindparam("payload_json")),
+                    params,
+                )  # 将隔离信息回写到任务负载
+        except Exception:  # noqa: BLE001  # 回写失败时草稿已移动，记录目录便于人工补录
+            LOGGER.exception("隔离信息回写失败 dirs=%s", {item["t_id"]: quarantined[item["t_id"]] for item in params})
+    return quarantined
+
+
+def _bump_counters(session, deltas: Counter) -> None:
+    """按状态增减 queue_counters 计数，缺失的状态行即时补建；调用方在事务提交后使统计缓存失效。"""  # 中文说明
+
+    dialect = session.get_bind().dialect.name  # 当前数据库方言
+    for status, delta in deltas.items():  # 遍历状态变化
+        if not delta:  # 无变化跳过
+            continue
+        if dialect in ("sqlite", "postgresql"):  # UPSERT 单条完成，并发首次写入同一状态不会主键冲突
+            insert_fn = sqlite_insert if dialect == "sqlite" else pg_insert  # 选择方言插入构造
+            stmt = insert_fn(QueueCounter).values(status=status, count=delta)
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[QueueCounter.status],
+                    set_={"count": QueueCounter.count + stmt.excluded.count},
+                )
+            )  # 不存在则插入，存在则原地增减
+            continue
+        updated = session.execute(
+            update(QueueCounter)
+            .where(QueueCounter.status == status)
+            .values(count=QueueCounter.count + delta)
+        ).rowcount  # 原地增减计数
+        if not updated:  # 状态行尚不存在
+            session.add(QueueCounter(status=status, count=delta))  # 新建计数行
+
+
+def _load_leased_tasks(session, task_ids: List[int], agent_name: str) -> List[TaskView]:
+    """一次查询取回任务列并校验租约归属，顺序与 task_ids 一致；同一批次内任务 ID 不得重复。"""  # 中文说明
+
+    if len(set(task_ids)) != len(task_ids):  # 重复 ID 会导致状态计数重复增减
+        duplicated = sorted({task_id for task_id in task_ids if task_ids.count(task_id) > 1})  # 找出重复 ID
+        raise ValueError(f"duplicate task ids in batch: {duplicated}")  # 抛出异常
+    rows = session.execute(_TASKS_BY_IDS_STMT, {"task_ids": task_ids}).all()  # 批量查询元组
+    by_id = {row.id: TaskView(*row) for row in rows}  # 建立索引
+    tasks: List[TaskView] = []  # 准备返回列表
+    for task_id in task_ids:  # 按请求顺序校验
+        task = by_id.get(task_id)  # 查找任务
+        if task is None:  # 未找到任务
+            raise ValueError(f"task {task_id} not found")  # 抛出异常
+        if task.status != "leased" or task.lease_by != agent_name:  # 校验租约归属
+            raise ValueError("task not leased by agent")  # 抛出异常
+        tasks.append(task)  # 收集任务
+    return tasks  # 返回任务列表
 
 
-def _move_task_drafts_to_quarantine(task: TaskQueue, error: str) -> str | None:
-    """将与任务关联的草稿目录移动至隔离区并返回隔离路径。"""  # 中文说明
+def _move_task_drafts_to_quarantine(task: TaskView, error: str, now: datetime) -> Tuple[str | None, Dict[str, Any]]:
+    """将与任务关联的草稿目录移动至隔离区，返回隔离路径与补充了隔离信息的负载。"""  # 中文说明
 
     try:
-        payload = json.loads(task.payload_json)  # 解析任务负载
-    except json.JSONDecodeError:
+        payload = load_task_payload(task)  # 解析任务负载
+    except ValueError:  # 解析失败或共享负载缺失
         payload = {}  # 解析失败时使用空字典
-    run_date_raw = str(payload.get("run_date") or _utcnow().date().isoformat())  # 解析运行日期
+    run_date_raw = str(payload.get("run_date") or now.date().isoformat())  # 解析运行日期
     day_token = run_date_raw.replace("-", "")  # 统一目录格式
     quarantine_root = Path(settings.outbox_quarantine_dir).expanduser() / day_token  # 构造隔离目录
     quarantine_root.mkdir(parents=True, exist_ok=True)  # 确保目录存在
-    candidate_paths: set[str] = set()  # 准备候选目录集合
+    candidates: dict[Path, None] = {}  # 候选目录，按插入顺序去重
     for key in ("draft_dirs", "out_dirs", "quarantine_dirs"):  # 遍历常见字段
         value = payload.get(key)  # 读取值
         if isinstance(value, str):  # 单个路径
-            candidate_paths.add(value)
+            candidates[Path(value).expanduser()] = None
         elif isinstance(value, list):  # 列表路径
-            candidate_paths.update(str(item) for item in value if isinstance(item, str))
+            candidates.update((Path(item).expanduser(), None) for item in value if isinstance(item, str))
     dispatch_cfg = payload.get("dispatch", {})  # 读取 dispatch 配置
     if isinstance(dispatch_cfg, dict):  # 确保为字典
         extra_dirs = dispatch_cfg.get("draft_dirs")  # 额外目录提示
         if isinstance(extra_dirs, list):  # 若为列表
-            candidate_paths.update(str(item) for item in extra_dirs if isinstance(item, str))
+            candidates.update((Path(item).expanduser(), None) for item in extra_dirs if isinstance(item, str))
         platforms = dispatch_cfg.get("platforms") or settings.delivery_enabled_platforms  # 解析平台列表
     else:
         platforms = settings.delivery_enabled_platforms  # 回退到全局配置
+    outbox_root = Path(settings.outbox_dir).expanduser()  # 投递根目录
     for platform in platforms:  # 遍历平台推断当日目录
-        base = Path(settings.outbox_dir).expanduser() / str(platform) / day_token  # 计算平台当日目录
-        if base.exists():  # 目录存在时加入候选
-            candidate_paths.add(str(base))
-    moved_paths: list[str] = []  # 记录实际移动的目录
-    for path_str in sorted(candidate_paths):  # 遍历候选目录
-        path_obj = Path(path_str).expanduser()  # 展开用户目录
-        if not path_obj.exists():  # 路径不存在则跳过
+        platform_dir = outbox_root / str(platform)  # 平台目录
+        candidates[platform_dir / day_token] = None  # 是否存在交由下方按父目录统一判断
+    listings: dict[Path, set[str]] = {}  # 父目录 -> 现有条目名，每个父目录仅 scandir 一次
+    taken = _list_dir_names(quarantine_root)  # 隔离目录现有条目，替代逐个 exists 探测
+    moves: list[tuple[Path, Path]] = []  # 待执行的 (源, 目标) 列表
+    for path_obj in candidates:  # 按插入顺序遍历候选目录
+        parent = path_obj.parent  # 候选所在目录
+        if parent not in listings:  # 首次遇到该父目录
+            listings[parent] = _list_dir_names(parent)
+        if path_obj.name not in listings[parent]:  # 路径不存在则跳过
             continue
-        target = quarantine_root / f"{path_obj.name}-{task.id}"  # 构造目标路径
+        name = f"{path_obj.name}-{task.id}"  # 构造目标名
         counter = 1  # 初始化重名计数
-        while target.exists():  # 若目标已存在
-            target = quarantine_root / f"{path_obj.name}-{task.id}-{counter}"  # 叠加计数后重试
+        while name in taken:  # 若目标已存在或已被本批次占用
+            name = f"{path_obj.name}-{task.id}-{counter}"  # 叠加计数后重试
             counter += 1  # 自增计数
-        try:
-            shutil.move(str(path_obj), str(target))  # 执行移动
-            moved_paths.append(str(target))  # 记录成功路径
-        except Exception as exc:  # noqa: BLE001  # 捕获移动异常
-            LOGGER.warning("草稿隔离失败 path=%s error=%s", path_obj, exc)  # 记录警告
-    manifest = {  # 构造隔离清单
-        "task_id": task.id,
-        "profile_id": task.profile_id,
-        "error": error,
-        "payload": payload,
-        "moved": moved_paths,
-    }
-    manifest_path = quarantine_root / f"task_{task.id}.json"  # 清单文件路径
+        taken.add(name)  # 占用目标
+        moves.append((path_obj, quarantine_root / name))
+    root_fd = _open_dir_fd(quarantine_root)  # 打开隔离目录句柄，后续 renameat/openat 共用
     try:
-        manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")  # 写入清单
-    except Exception as exc:  # noqa: BLE001
-        LOGGER.warning("写入隔离清单失败 path=%s error=%s", manifest_path, exc)  # 记录警告
+        moved_paths = _move_paths(moves, root_fd)  # 执行移动
+        manifest = {  # 构造隔离清单
+            "task_id": task.id,
+            "profile_id": task.profile_id,
+            "error": error,
+            "payload": payload,
+            "moved": moved_paths,
+        }
+        manifest_path = quarantine_root / f"task_{task.id}.json"  # 清单文件路径
+        try:
+            _write_manifest(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2), root_fd)  # 写入清单
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.warning("写入隔离清单失败 path=%s error=%s", manifest_path, exc)  # 记录警告
+    finally:
+        if root_fd is not None:  # 释放目录句柄
+            os.close(root_fd)
     payload["quarantine_dir"] = str(quarantine_root)  # 将隔离目录回写到 payload
     payload["quarantined_paths"] = moved_paths  # 记录已移动路径
-    task.payload_json = json.dumps(payload, ensure_ascii=False)  # 更新任务负载
-    return str(quarantine_root) if moved_paths else None  # 若有移动则返回目录
+    return (str(quarantine_root) if moved_paths else None), payload  # 若有移动则返回目录
 
 
-def _finalize_job_run(task: TaskQueue, result: Dict[str, Any], finished_at: datetime, success: bool) -> None:
-    """根据任务执行结果更新 JobRun。"""  # 中文说明
+def _list_dir_names(path: Path) -> set[str]:
+    """单次 scandir 列出目录条目名，目录缺失时返回空集合。"""  # 中文说明
 
     try:
-        payload = json.loads(task.payload_json)  # 解析 payload
-    except json.JSONDecodeError:
-        LOGGER.warning("任务 payload 非法，跳过 JobRun 更新 task_id=%s", task.id)  # 记录警告
+        with os.scandir(path) as entries:  # 一次 readdir 取回全部条目
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()  # 目录不存在或不可读
+
+
+def _open_dir_fd(path: Path) -> int | None:
+    """以目录句柄打开隔离目录，平台不支持 dir_fd 时返回 None。"""  # 中文说明
+
+    if not _DIR_FD_SUPPORTED:  # 平台不支持相对目录句柄
+        return None
+    try:
+        return os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))  # 打开目录句柄
+    except OSError:
+        return None  # 打开失败回退到完整路径
+
+
+def _write_manifest(path: Path, text: str, dir_fd: int | None) -> None:
+    """通过 openat + 单次写入落盘清单，无目录句柄时退回普通写入。"""  # 中文说明
+
+    if dir_fd is None:  # 无目录句柄
+        path.write_text(text, encoding="utf-8")  # 普通写入
         return
-    job_run_id = result.get("job_run_id") or payload.get("job_run_id")  # 读取 JobRun ID
+    data = text.encode("utf-8")  # 预先编码
+    fd = os.open(path.name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)  # 相对目录句柄创建文件
+    try:
+        view = memoryview(data)  # 避免短写时复制
+        while view:  # 通常一次写完
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)  # 关闭文件
+
+
+def _move_paths(moves: list[tuple[Path, Path]], dir_fd: int | None = None) -> list[str]:
+    """同设备直接 rename，跨设备的复制回退交给线程池并行执行，返回成功的目标路径。
+
+    提供 dir_fd 时以 renameat 相对隔离目录句柄落位，目标路径无需逐次解析。
+    """  # 中文说明
+
+    done: dict[Path, bool] = {}  # 目标 -> 是否成功
+    slow: list[tuple[Path, Path]] = []  # 需要复制回退的移动
+    for src, target in moves:  # 先尝试单次系统调用的快速路径
+        try:
+            if dir_fd is not None:  # 目标均位于隔离目录下
+                os.rename(src, target.name, dst_dir_fd=dir_fd)  # renameat 相对目录句柄
+            else:
+                os.rename(src, target)  # 同一文件系统内原子重命名
+            done[target] = True
+        except OSError as exc:
+            if exc.errno == errno.EXDEV:  # 跨设备需要复制
+                slow.append((src, target))
+            else:
+                LOGGER.warning("草稿隔离失败 path=%s error=%s", src, exc)  # 记录警告
+                done[target] = False
+    if slow:  # 跨设备移动并行执行，隐藏复制的 I/O 延迟
+        with ThreadPoolExecutor(max_workers=min(8, len(slow))) as pool:
+            futures = {target: pool.submit(shutil.move, str(src), str(target)) for src, target in slow}
+        for src, target in slow:  # 收集结果
+            exc = futures[target].exception()
+            if exc is not None:
+                LOGGER.warning("草稿隔离失败 path=%s error=%s", src, exc)  # 记录警告
+            done[target] = exc is None
+    return [str(target) for _, target in moves if done.get(target)]  # 保持候选顺序
+
+
+def _finalize_job_run(task: TaskView, result: Dict[str, Any], finished_at: datetime, success: bool) -> None:
+    """根据任务执行结果更新 JobRun。"""  # 中文说明
+
+    job_run_id = result.get("job_run_id") or _task_job_run_id(task)  # 结果已带 ID 时无需解析 payload
     if not job_run_id:  # 若未提供
         return  # 直接返回
-    emitted = int(result.get("emitted_articles", 0) or 0)  # 解析生成数量
-    success_count = int(result.get("delivered_success", 0) or 0)  # 成功投递数
-    failed_count = int(result.get("delivered_failed", 0) or 0)  # 失败投递数
-    error_msg = result.get("error")  # 错误信息
+    values = _job_run_result_values(result, success)  # 计算写回字段
+    stmt = update(JobRun).where(JobRun.id == job_run_id).values(finished_at=finished_at, **values)  # 单条 UPDATE 写回结果
     with sched_session_scope() as session:  # 打开调度库
-        job_run = session.query(JobRun).filter(JobRun.id == job_run_id).one_or_none()  # 查询记录
-        if not job_run:
-            LOGGER.warning("JobRun 不存在 job_run_id=%s", job_run_id)  # 记录警告
-            return
-        job_run.finished_at = finished_at  # 写入结束时间
-        job_run.emitted_articles = emitted  # 写入生成数量
-        job_run.delivered_success = success_count  # 写入成功投递
-        job_run.delivered_failed = failed_count  # 写入失败投递
-        profile_label = (
-            job_run.profile.name if getattr(job_run, "profile", None) and getattr(job_run.profile, "name", None) else str(job_run.profile_id)
-        )  # 决定指标标签
-        if success:  # 根据结果写入状态
-            job_run.status = "success"
-            job_run.error = None
-            emit_metric("dispatch", "job_success", 1, profile_id=job_run.profile_id)  # 上报成功指标
-            inc_run("success", profile_label)  # Prometheus 记录成功
-        else:
-            job_run.status = "failed"
-            job_run.error = error_msg
-            emit_metric("dispatch", "job_failed", 1, profile_id=job_run.profile_id)  # 上报失败指标
-            inc_run("failed", profile_label)  # Prometheus 记录失败
-        if job_run.started_at:  # 若存在开始时间
-            duration = (finished_at - job_run.started_at).total_seconds()  # 计算耗时
-            if duration > 0:  # 确保耗时为正
-                observe_latency(profile_label, duration)  # 记录耗时直方图
-        LOGGER.info(
-            "JobRun 完成更新 job_run_id=%s status=%s", job_run_id, job_run.status
-        )  # 记录日志
-
-
-def _mark_job_retrying(task: TaskQueue, error: str) -> None:  # 更新 JobRun 为重试中
+        if session.get_bind().dialect.update_returning:  # RETURNING 同时取回指标所需字段
+            row = session.execute(stmt.returning(JobRun.profile_id, JobRun.started_at)).one_or_none()
+        else:  # 不支持 RETURNING 时先取指标字段，存在再更新
+            row = session.execute(_JOB_RUNS_BY_IDS_STMT, {"job_run_ids": [job_run_id]}).first()
+            if row is not None:
+                session.execute(stmt)
+    if row is None:
+        LOGGER.warning("JobRun 不存在 job_run_id=%s", job_run_id)  # 记录警告
+        return
+    profile_id, started_at = row.profile_id, row.started_at  # 读取指标字段
+    _report_job_run(profile_id, started_at, finished_at, success)  # 上报指标
+    LOGGER.info("JobRun 完成更新 job_run_id=%s status=%s", job_run_id, values["status"])  # 记录日志
+
+
+def _finalize_job_runs(
+    entries: List[Tuple[TaskView, Dict[str, Any]]], finished_at: datetime, success: bool
+) -> None:
+    """批量写回 JobRun 结果：一次查询取回指标字段，一次 executemany 完成更新。"""  # 中文说明
+
+    linked: Dict[Any, Tuple[TaskView, Dict[str, Any]]] = {}  # JobRun ID -> (任务, 结果)
+    for task, result in entries:  # 解析每个任务关联的 JobRun
+        job_run_id = result.get("job_run_id") or _task_job_run_id(task)  # 结果已带 ID 时无需解析 payload
+        if job_run_id:  # 仅收集关联了 JobRun 的任务
+            linked[job_run_id] = (task, result)
+    if len(linked) <= 1:  # 单条时走 UPDATE ... RETURNING 路径
+        for task, result in linked.values():
+            _finalize_job_run(task, result, finished_at, success)
+        return
+    with sched_session_scope() as session:  # 打开调度库
+        found = session.execute(_JOB_RUNS_BY_IDS_STMT, {"job_run_ids": list(linked)}).all()  # 一次查询取回存在的 JobRun
+        params = [
+            {"jr_id": row.id, "finished_at": finished_at, **_job_run_result_values(linked[row.id][1], success)}
+            for row in found
+        ]  # 组装 executemany 参数
+        if params:
+            session.connection().execute(
+                update(JobRun)
+                .where(JobRun.id == bindparam("jr_id"))
+                .values(
+                    status=bindparam("status"),
+                    error=bindparam("error"),
+                    finished_at=bindparam("finished_at"),
+                    emitted_articles=bindparam("emitted_articles"),
+                    delivered_success=bindparam("delivered_success"),
+                    delivered_failed=bindparam("delivered_failed"),
+                ),
+                params,
+            )  # 分组更新全部 JobRun
+    for job_run_id in set(linked) - {row.id for row in found}:  # 记录缺失的 JobRun
+        LOGGER.warning("JobRun 不存在 job_run_id=%s", job_run_id)  # 记录警告
+    for row in found:  # 逐条上报指标
+        _report_job_run(row.profile_id, row.started_at, finished_at, success)
+    LOGGER.info("JobRun 批量完成更新 count=%s success=%s", len(found), success)  # 记录日志
+
+
+def _job_run_result_values(result: Dict[str, Any], success: bool) -> Dict[str, Any]:
+    """将任务执行结果转换为 JobRun 写回字段。"""  # 中文说明
+
+    return {
+        "status": "success" if success else "failed",  # 根据结果决定状态
+        "error": None if success else result.get("error"),  # 错误信息
+        "emitted_articles": int(result.get("emitted_articles", 0) or 0),  # 生成数量
+        "delivered_success": int(result.get("delivered_success", 0) or 0),  # 成功投递数
+        "delivered_failed": int(result.get("delivered_failed", 0) or 0),  # 失败投递数
+    }
+
+
+def _report_job_run(profile_id: int, started_at: datetime | None, finished_at: datetime, success: bool) -> None:
+    """上报 JobRun 结束相关的指标与耗时。"""  # 中文说明
+
+    profile_label = _profile_label(profile_id)  # 决定指标标签
+    if success:  # 根据结果上报指标
+        emit_metric_async("dispatch", "job_success", 1, profile_id=profile_id)  # 上报成功指标
+        inc_run("success", profile_label)  # Prometheus 记录成功
+    else:
+        emit_metric_async("dispatch", "job_failed", 1, profile_id=profile_id)  # 上报失败指标
+        inc_run("failed", profile_label)  # Prometheus 记录失败
+    if started_at:  # 若存在开始时间
+        duration = (finished_at - started_at).total_seconds()  # 计算耗时
+        if duration > 0:  # 确保耗时为正
+            observe_latency(profile_label, duration)  # 记录耗时直方图
+
+
+def _profile_label(profile_id: int) -> str:  # 缓存 Profile 指标标签
+    """返回 Profile 名称作为指标标签，缺失时回退为 ID 字符串；仅缓存查到的名称，并按 TTL 过期。"""  # 中文说明
+
+    now = time.monotonic()  # 单调时钟
+    hit = _PROFILE_LABELS.get(profile_id)  # 查找缓存
+    if hit is not None and hit[0] > now:  # 命中且未过期
+        return hit[1]
+    with sched_session_scope() as session:  # 打开调度库
+        name = session.execute(select(Profile.name).where(Profile.id == profile_id)).scalar_one_or_none()  # 查询名称
+    if not name:  # Profile 尚未同步时不缓存回退值
+        return str(profile_id)
+    _PROFILE_LABELS[profile_id] = (now + _PROFILE_LABEL_TTL_SEC, name)  # 写入缓存
+    return name
+
+
+def invalidate_profile_labels() -> None:  # 清除 Profile 标签缓存
+    """Profile 同步或改名后调用，使本进程下一次上报读取最新名称；其他进程依赖 TTL 过期。"""  # 中文说明
+
+    _PROFILE_LABELS.clear()
+
+
+def _mark_job_retrying(task: TaskView, error: str) -> None:  # 更新 JobRun 为重试中
     """当任务等待重试时记录当前错误信息。"""  # 中文说明
 
-    try:
-        payload = json.loads(task.payload_json)  # 解析 payload
-    except json.JSONDecodeError:
-        return  # 无法解析直接返回
-    job_run_id = payload.get("job_run_id")  # 读取 JobRun
+    job_run_id = _task_job_run_id(task)  # 先取 JobRun ID，未关联时不打开调度库
     if not job_run_id:
         return  # 无 JobRun 直接返回
+    stmt = (  # 单条 UPDATE 写入重试状态
+        update(JobRun)
+        .where(JobRun.id == job_run_id)
+        .values(status="retrying", error=error)
+    )
+    with sched_session_scope() as session:  # 打开调度库
+        updated = session.execute(stmt).rowcount  # 执行更新并读取影响行数
+    if not updated:  # 未找到
+        LOGGER.warning("JobRun 不存在 job_run_id=%s", job_run_id)  # 记录警告
+
+
+def _mark_jobs_retrying(entries: List[Tuple[TaskView, str]]) -> None:
+    """批量将关联 JobRun 标记为重试中，使用一次 executemany 更新。"""  # 中文说明
+
+    if len(entries) <= 1:  # 单条时沿用原路径
+        for task, error in entries:
+            _mark_job_retrying(task, error)
+        return
+    params: List[Dict[str, Any]] = []  # executemany 参数
+    for task, error in entries:  # 解析关联 JobRun
+        job_run_id = _task_job_run_id(task)  # 读取 JobRun ID
+        if job_run_id:
+            params.append({"jr_id": job_run_id, "error": error})
+    if not params:  # 无关联 JobRun
+        return
     with sched_session_scope() as session:  # 打开调度库
-        job_run = session.query(JobRun).filter(JobRun.id == job_run_id).one_or_none()  # 查询记录
-        if not job_run:
-            return  # 未找到
-        job_run.status = "retrying"  # 更新状态
-        job_run.error = error  # 写入错误
+        session.connection().execute(
+            update(JobRun)
+            .where(JobRun.id == bindparam("jr_id"))
+            .values(status="retrying", error=bindparam("error")),
+            params,
+        )  # 分组更新
 
 
 def record_heartbeat(agent_name: str, meta: Dict[str, Any] | None) -> None:  # 记录心跳
     """写入或更新 Worker 心跳时间。"""  # 中文说明
 
+    now = _utcnow()  # 当前时间
+    meta_json = json.dumps(meta or {}, ensure_ascii=False)  # 序列化元信息
     with dispatch_session_scope() as session:  # 打开分发库
-        record = session.query(Heartbeat).filter(Heartbeat.agent_name == agent_name).one_or_none()  # 查询
-        meta_json = json.dumps(meta or {}, ensure_ascii=False)  # 序列化元信息
-        if record is None:  # 若不存在
-            record = Heartbeat(agent_name=agent_name, last_seen_at=_utcnow(), meta_json=meta_json)  # 创建记录
+        dialect = session.get_bind().dialect.name  # 当前数据库方言
+        if dialect in ("sqlite", "postgresql"):  # 支持 UPSERT 的方言单条语句完成
+            insert_fn = sqlite_insert if dialect == "sqlite" else pg_insert  # 选择方言插入构造
+            stmt = insert_fn(Heartbeat).values(agent_name=agent_name, last_seen_at=now, meta_json=meta_json)
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[Heartbeat.agent_name],
+                    set_={"last_seen_at": stmt.excluded.last_seen_at, "meta_json": stmt.excluded.meta_json},
+                )
+            )  # 插入或覆盖心跳
+        elif (record := session.get(Heartbeat, agent_name)) is None:  # 其他方言先查后写
+            record = Heartbeat(agent_name=agent_name, last_seen_at=now, meta_json=meta_json)  # 创建记录
             session.add(record)  # 添加
         else:  # 已存在
-            record.last_seen_at = _utcnow()  # 更新心跳时间
+            record.last_seen_at = now  # 更新心跳时间
             record.meta_json = meta_json  # 更新元数据
+    _invalidate_read_cache("heartbeats")  # 提交后使列表缓存失效
 
 
 def get_queue_stats() -> Dict[str, int]:  # 队列统计
-    """统计队列内各状态数量。"""  # 中文说明
+    """读取各状态的任务数量，结果短时缓存供 Dashboard 轮询复用。"""  # 中文说明
 
-    with dispatch_session_scope() as session:  # 打开分发库
-        rows = (
-            session.query(TaskQueue.status, func.count(TaskQueue.id))
-            .group_by(TaskQueue.status)
-            .all()
-        )  # 聚合统计
+    return dict(_cached_read("queue_stats", _load_queue_stats))  # 返回副本避免调用方改写缓存
+
+
+def _load_queue_stats() -> Dict[str, int]:  # 读取计数表
+    """直接扫描计数表而非聚合队列表。"""  # 中文说明
+
+    with dispatch_session_scope(read_only=True) as session:  # 只读会话
+        rows = session.execute(
+            select(QueueCounter.status, QueueCounter.count).where(QueueCounter.count > 0)
+        ).all()  # 读取计数
     return {status: count for status, count in rows}  # 转换为字典
 
 
 def list_heartbeats() -> List[Dict[str, Any]]:  # 列出心跳信息
-    """返回所有 Worker 心跳记录。"""  # 中文说明
+    """返回所有 Worker 心跳记录，结果短时缓存供 Dashboard 轮询复用。"""  # 中文说明
+
+    return list(_cached_read("heartbeats", _load_heartbeats))  # 返回副本避免调用方改写缓存
+
+
+def _load_heartbeats() -> List[Dict[str, Any]]:  # 读取心跳表
+    """查询心跳表并解析元信息。"""  # 中文说明
 
     now = _utcnow()  # 当前时间
-    with dispatch_session_scope() as session:  # 打开分发库
-        rows = session.query(Heartbeat).order_by(Heartbeat.last_seen_at.desc()).all()  # 查询全部
+    with dispatch_session_scope(read_only=True) as session:  # 只读会话
+        rows = session.execute(_HEARTBEATS_STMT).scalars().all()  # 查询全部
         result: List[Dict[str, Any]] = []  # 准备返回列表
         for row in rows:  # 遍历心跳记录
             meta = json.loads(row.meta_json) if row.meta_json else {}  # 解析元信息
@@ -397,29 +848,30 @@ def list_heartbeats() -> List[Dict[str, Any]]:  # 列出心跳信息
     return result  # 返回心跳列表
 
 
+def _extract_quarantine_dir(row: Any) -> str | None:  # 读取隔离目录
+    """解析死亡任务负载并返回顶层 quarantine_dir，负载非法或缺失时返回 None。"""  # 中文说明
+
+    try:
+        payload = load_task_payload(row)  # 行内负载优先，留空时读共享负载
+    except ValueError:  # 解析失败或共享负载缺失
+        return None
+    return payload.get("quarantine_dir") if isinstance(payload, dict) else None  # 只认顶层键
+
+
 def list_dead_letters() -> List[Dict[str, Any]]:  # 列出死亡任务
     """返回死亡任务摘要，供 Dashboard 展示死信箱。"""  # 中文说明
 
-    with dispatch_session_scope() as session:  # 打开分发库
-        rows = (  # 查询死亡任务
-            session.query(TaskQueue)
-            .filter(TaskQueue.status == "dead")
-            .order_by(TaskQueue.id.desc())
-            .all()
-        )
+    with dispatch_session_scope(read_only=True) as session:  # 只读会话
+        rows = session.execute(_DEAD_LETTERS_STMT).all()  # 仅投影需要的列
     dead_items: List[Dict[str, Any]] = []  # 准备结果列表
     for row in rows:  # 遍历死亡任务
-        try:
-            payload = json.loads(row.payload_json)  # 解析 payload
-        except json.JSONDecodeError:
-            payload = {}  # 解析失败时使用空字典
         dead_items.append(  # 组装记录
             {
                 "task_id": row.id,
                 "profile_id": row.profile_id,
                 "attempts": row.attempts,
                 "error": row.last_error,
-                "quarantine_dir": payload.get("quarantine_dir"),
+                "quarantine_dir": _extract_quarantine_dir(row),
             }
         )
     return dead_items  # 返回死信任务
@@ -3,24 +3,53 @@
 from __future__ import annotations  # 启用未来注解语法
 
 from contextlib import contextmanager  # 提供上下文管理器
+from functools import lru_cache  # 按 URL 复用引擎
 from pathlib import Path  # 处理路径
 from typing import Iterator  # 类型提示
 
-from sqlalchemy import create_engine  # 创建 SQLAlchemy 引擎
+from sqlalchemy import create_engine, delete, event, func, insert, inspect, select, text  # 创建 SQLAlchemy 引擎与语句
 from sqlalchemy.orm import sessionmaker  # Session 工厂
 
 from config.settings import settings  # 引入配置
-from app.db.models_sched import Heartbeat, SchedBase, TaskQueue  # 导入 ORM 模型
+from app.db.models_sched import Heartbeat, PayloadBlob, QueueCounter, SchedBase, TaskQueue  # 导入 ORM 模型
 from app.utils.logger import get_logger  # 日志工具
 
 LOGGER = get_logger(__name__)  # 初始化日志记录器
+_RETIRED_INDEXES = ("idx_taskqueue_status_available",)  # 已被复合索引取代、迁移时删除的索引
 
 
-def get_dispatch_engine():  # 创建分发库引擎
-    """根据配置初始化分发任务数据库引擎。"""  # 中文说明
+def get_dispatch_engine():  # 获取分发库引擎
+    """返回当前配置 URL 对应的分发库引擎，同一 URL 在进程内只创建一次。"""  # 中文说明
 
-    LOGGER.debug("创建分发数据库引擎 url=%s", settings.dispatch_db_url)  # 记录调试日志
-    return create_engine(settings.dispatch_db_url, future=True, echo=False)  # 返回引擎实例
+    return _engine_for_url(settings.dispatch_db_url)  # 按 URL 复用引擎与连接池
+
+
+@lru_cache(maxsize=8)
+def _engine_for_url(url: str):  # 按 URL 创建引擎
+    """创建分发库引擎：SQLite 开启 WAL 并允许跨线程，其余数据库配置连接池参数。"""  # 中文说明
+
+    LOGGER.debug("创建分发数据库引擎 url=%s", url)  # 记录调试日志
+    if url.startswith("sqlite"):  # SQLite 不使用连接池参数
+        engine = create_engine(url, future=True, echo=False, connect_args={"check_same_thread": False})  # 允许线程池复用连接
+        event.listen(engine, "connect", _enable_sqlite_wal)  # 每个新连接开启 WAL
+        return engine
+    return create_engine(
+        url,
+        future=True,
+        echo=False,
+        pool_size=10,  # 常驻连接数
+        max_overflow=20,  # 峰值额外连接数
+        pool_pre_ping=True,  # 取出连接前探活
+        pool_recycle=1800,  # 定期回收避免服务端超时断开
+    )  # 返回引擎实例
+
+
+def _enable_sqlite_wal(dbapi_connection, _connection_record) -> None:  # SQLite 连接钩子
+    """开启 WAL，读写互不阻塞。"""  # 中文说明
+
+    cursor = dbapi_connection.cursor()  # 获取游标
+    cursor.execute("PRAGMA journal_mode=WAL")  # 切换日志模式
+    cursor.close()  # 关闭游标
 
 
 # expire_on_commit=False 确保提交后 ORM 实例仍可访问字段，供 API 序列化使用
@@ -28,13 +57,14 @@ SessionDispatch = sessionmaker(bind=get_dispatch_engine(), expire_on_commit=Fals
 
 
 @contextmanager
-def dispatch_session_scope() -> Iterator:  # 分发库 Session 上下文
-    """提供 with 语法的分发库会话生命周期管理。"""  # 中文说明
+def dispatch_session_scope(read_only: bool = False) -> Iterator:  # 分发库 Session 上下文
+    """提供 with 语法的分发库会话生命周期管理；只读调用跳过提交，由 close 直接归还连接。"""  # 中文说明
 
     session = SessionDispatch()  # 创建 Session
     try:  # 捕获异常
         yield session  # 暴露 Session 给调用方
-        session.commit()  # 正常结束时提交事务
+        if not read_only:  # 只读路径无需提交空事务
+            session.commit()  # 正常结束时提交事务
     except Exception:  # noqa: BLE001  # 捕获全部异常
         session.rollback()  # 发生异常时回滚
         raise  # 继续抛出异常
@@ -45,16 +75,47 @@ def dispatch_session_scope() -> Iterator:  # 分发库 Session 上下文
 def run_dispatch_migrations() -> None:  # 执行分发库建表
     """确保分发任务所需的表结构存在。"""  # 中文说明
 
-    engine = get_dispatch_engine()  # 获取引擎
-    SessionDispatch.configure(bind=engine)  # 重新绑定 Session 工厂
+    engine = get_dispatch_engine()  # 获取引擎（同一 URL 复用同一实例）
+    if SessionDispatch.kw.get("bind") is not engine:  # 仅在 URL 变更时切换 Session 工厂绑定
+        SessionDispatch.configure(bind=engine)
     if engine.url.get_backend_name() == "sqlite" and engine.url.database:  # 若使用本地 SQLite
         Path(engine.url.database).parent.mkdir(parents=True, exist_ok=True)  # 确保目录存在
     tables = [  # 需要创建的表列表
-        SchedBase.metadata.tables[TaskQueue.__tablename__],  # 队列表
-        SchedBase.metadata.tables[Heartbeat.__tablename__],  # 心跳表
+        TaskQueue.__table__,  # 队列表
+        Heartbeat.__table__,  # 心跳表
+        QueueCounter.__table__,  # 状态计数表
+        PayloadBlob.__table__,  # 负载内容寻址表
     ]
     with engine.begin() as connection:  # 打开事务
+        LOGGER.debug("创建分发表=%s", [table.name for table in tables])  # 记录日志
+        SchedBase.metadata.create_all(bind=connection, tables=tables, checkfirst=True)  # 一次探测并建表
+        inspector = inspect(connection)  # 读取现有索引，补齐旧库建表后新增的索引
         for table in tables:  # 遍历表
-            LOGGER.debug("创建分发表=%s", table.name)  # 记录日志
-            table.create(connection, checkfirst=True)  # 幂等创建
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}  # 已有索引名
+            for index in table.indexes:  # 仅创建缺失的索引
+                if index.name not in existing:
+                    index.create(connection)
+        _ensure_task_queue_columns(connection)  # 为旧库补齐新增列
+        for index_name in _RETIRED_INDEXES:  # 删除被取代的索引
+            connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+        connection.execute(delete(QueueCounter))  # 清空计数，按队列现状重建
+        connection.execute(
+            insert(QueueCounter).from_select(
+                ["status", "count"],
+                select(TaskQueue.status, func.count(TaskQueue.id)).group_by(TaskQueue.status),
+            )
+        )  # 回填各状态计数
     LOGGER.info("分发数据库迁移完成")  # 记录完成日志
+
+
+def _ensure_task_queue_columns(connection) -> None:  # 补齐队列表新增列
+    """旧版 task_queue 缺少的可空列通过 ALTER TABLE 补齐。"""  # 中文说明
+
+    table = TaskQueue.__table__  # 队列表元数据
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}  # 现有列名
+    for column in table.columns:  # 遍历模型声明的列
+        if column.name in existing or not column.nullable:  # 已存在或非空列不自动补齐
+            continue
+        column_type = column.type.compile(dialect=connection.dialect)  # 按方言生成列类型
+        LOGGER.info("补齐分发表列 table=%s column=%s", table.name, column.name)  # 记录日志
+        connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))  # 新增列
@@ -2,20 +2,27 @@
 
 from __future__ import annotations  # 引入未来注解特性以支持前向引用
 
-import json  # 读取风格配置文件
-import random  # 提供随机选择心理特质的能力
+import re  # 单次扫描替换模板占位符
 from collections.abc import Mapping, Sequence  # 处理嵌套风格指令
+from contextlib import nullcontext  # 复用调用方会话时不负责关闭
 from datetime import datetime, timedelta, timezone  # TODO: 支持软锁过期计算
+from functools import lru_cache  # 缓存模板与风格配置
+from pathlib import Path  # 根据缓存键还原路径
+from random import choice as _random_choice  # 随机选择心理特质，预绑定避免逐次属性查找
+from types import MappingProxyType  # 只读暴露缓存的展开结果
 from typing import Any, Dict, Mapping, Optional  # 描述文章返回结构
 
 import structlog  # 结构化日志记录器，便于追踪生成状态
-from sqlalchemy import text  # TODO: 引入 text 以执行原生 SQL
+from sqlalchemy import DateTime, bindparam, text  # TODO: 引入 text 以执行原生 SQL
 from sqlalchemy.orm import Session  # 类型提示，便于静态检查
 
 from config.settings import BASE_DIR, settings  # TODO: 引入 settings 读取软锁配置
 from app.chaos.hooks import maybe_inject_chaos  # 引入混沌注入钩子
 from app.db.migrate import SessionLocal  # 数据库会话工厂
-from app.generator import character_selector  # 角色选择工具模块
+from app.generator.character_selector import (  # 随机抽取角色资料
+    get_random_character as _get_random_character,
+)
+from app.utils.helpers import load_json_bytes  # JSON 解析，可选 orjson 加速
 from app.prompting.registry import (  # Prompt 选择工具
     choose_prompt_variant,
     get_prompt,
@@ -30,60 +37,152 @@ ARTICLE_PROMPT_PATH = (  # 心理学影评提示词模板路径
 STYLE_PROFILE_PATH = BASE_DIR / "app" / "generator" / "style_profile.json"  # 风格配置文件路径
 MAX_VARIANT_ATTEMPTS = 3  # 最多尝试的 Prompt Variant 次数
 MAX_ARTICLE_LENGTH = 2300  # 输出字数上限保持与质量闸门一致
+_STR_TYPES = (str, bytes, bytearray)  # 按标量处理的序列类型，避免每个叶子节点重建元组
+_PLACEHOLDER_RE = re.compile(r"(\{\{[^{}]+\}\})")  # 模板占位符，分组保留以便 split 返回占位符本身
+
+
+@lru_cache(maxsize=4)
+def _read_template(path_str: str, mtime_ns: int) -> str:
+    """按路径与修改时间缓存模板文本，文件更新后 mtime 变化自动失效。"""
+
+    template = Path(path_str).read_text(encoding="utf-8")
+    LOGGER.debug(  # 仅在真正读盘时输出，缓存命中不再计算日志参数
+        "prompt_loaded",
+        template_length=len(template),
+        template_path=path_str,
+    )
+    return template
+
+
+@lru_cache(maxsize=4)
+def _read_style_profiles(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """按路径与修改时间缓存解析后的风格配置，命中时跳过读取与 JSON 解析。"""
+
+    profiles = load_json_bytes(Path(path_str).read_bytes())  # 安装 orjson 时走 C 解析
+    LOGGER.debug(
+        "style_profile_loaded",
+        profile_path=path_str,
+        available_profiles=list(profiles.keys()),
+    )
+    return profiles
+
+
+_LEASE_THEME_SQL = """
+    UPDATE psychology_themes
+    SET locked_by_run_id = :run_id,
+        locked_at = :now
+    WHERE id IN (
+        SELECT id
+        FROM psychology_themes
+        WHERE (used IS NULL OR used = 0)
+          AND (locked_by_run_id IS NULL OR locked_at < :expire)
+        ORDER BY id
+        LIMIT :limit{skip_locked}
+    )
+      AND (used IS NULL OR used = 0)
+      AND (locked_by_run_id IS NULL OR locked_at < :expire)
+    RETURNING id, psychology_keyword, psychology_definition, character_name, show_name, used
+"""  # 单条语句完成挑选与加锁；外层重复条件保证并发下不会覆盖他人刚加的锁
+
+_LOCK_TIME_PARAMS = (
+    bindparam("now", type_=DateTime(timezone=True)),
+    bindparam("expire", type_=DateTime(timezone=True)),
+)  # 以原生时间类型绑定软锁时间，避免逐行解析 ISO 字符串
+
+
+_SKIP_LOCKED_DIALECTS = frozenset({"postgresql", "mysql"})  # 支持 FOR UPDATE SKIP LOCKED 的方言
+_LOCAL_RUN_ID = "article-generator-local"  # TODO: 本地生成器固定软锁 ID
 
 
 def lease_theme_for_run(db: Session, run_id: str) -> Optional[dict]:
     """从主题库领取一个可用主题，但仅做软锁，不标记 used。"""
 
+    leased = lease_themes_for_run(db, run_id, limit=1)
+    return leased[0] if leased else None
+
+
+def lease_themes_for_run(db: Session, run_id: str, limit: int) -> list[dict]:
+    """按 id 顺序一次领取至多 ``limit`` 个可用主题并软锁，只提交一次；无可用主题时返回空列表。"""
+
     now = datetime.now(timezone.utc)  # TODO: 获取当前 UTC 时间
     expire_at = now - timedelta(minutes=settings.lock_expire_minutes)  # TODO: 计算软锁过期阈值
+    params = {"run_id": run_id, "now": now, "expire": expire_at, "limit": limit}
+    dialect = db.get_bind().dialect
+    # 并发 Worker 跳过他人已锁定的候选行；SQLite 写入本身串行，无需该子句
+    skip_locked = " FOR UPDATE SKIP LOCKED" if dialect.name in _SKIP_LOCKED_DIALECTS else ""
+    if not dialect.update_returning:  # MySQL、旧版 SQLite 等不支持 RETURNING，退回查询后更新
+        return _lease_theme_select_update(db, run_id, now, params, skip_locked)
     try:
-        row = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, psychology_keyword, psychology_definition, character_name, show_name,
-                           locked_by_run_id, locked_at, used
-                    FROM psychology_themes
-                    WHERE (used IS NULL OR used = 0)
-                      AND (locked_by_run_id IS NULL OR locked_at < :expire)
-                    ORDER BY id
-                    LIMIT 1
-                    """
-                ),
-                {"expire": expire_at.isoformat()},
-            )
-            .mappings()
-            .first()
-        )
+        statement = text(_LEASE_THEME_SQL.format(skip_locked=skip_locked)).bindparams(*_LOCK_TIME_PARAMS)
+        rows = db.execute(statement, params).mappings().all()
     except Exception as exc:  # noqa: BLE001
         raise RuntimeError("TODO: 无法从数据库领取主题，请确认 psychology_themes 表存在且结构正确。") from exc
-
-    if row is None:
-        return None
-
-    db.execute(
-        text(
-            """
-            UPDATE psychology_themes
-            SET locked_by_run_id = :run_id,
-                locked_at = :now
-            WHERE id = :theme_id
-            """
-        ),
-        {"run_id": run_id, "now": now.isoformat(), "theme_id": row["id"]},
-    )
     db.commit()
 
-    result = dict(row)
-    result["locked_by_run_id"] = run_id
-    result["locked_at"] = now
-    return result
+    # RETURNING 不保证顺序，按 id 排序与单条领取的先后一致；锁字段取本次写入值
+    return [dict(row, locked_by_run_id=run_id, locked_at=now) for row in sorted(rows, key=lambda row: row["id"])]
+
+
+def _lease_theme_select_update(
+    db: Session, run_id: str, now: datetime, params: dict, skip_locked: str = ""
+) -> list[dict]:
+    """不支持 UPDATE ... RETURNING 时的回退路径：先查询候选再逐条条件加锁，被他人抢先时补查下一批。"""
+
+    leased: list[dict] = []
+    while len(leased) < params["limit"]:
+        try:
+            rows = (
+                db.execute(
+                    text(
+                        f"""
+                        SELECT id, psychology_keyword, psychology_definition, character_name, show_name, used
+                        FROM psychology_themes
+                        WHERE (used IS NULL OR used = 0)
+                          AND (locked_by_run_id IS NULL OR locked_at < :expire)
+                        ORDER BY id
+                        LIMIT :limit{skip_locked}
+                        """
+                    ).bindparams(_LOCK_TIME_PARAMS[1]),
+                    {"expire": params["expire"], "limit": params["limit"] - len(leased)},
+                )
+                .mappings()
+                .all()
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise RuntimeError("TODO: 无法从数据库领取主题，请确认 psychology_themes 表存在且结构正确。") from exc
+
+        if not rows:
+            break
+
+        for row in rows:
+            locked = db.execute(
+                text(
+                    """
+                    UPDATE psychology_themes
+                    SET locked_by_run_id = :run_id,
+                        locked_at = :now
+                    WHERE id = :theme_id
+                      AND (used IS NULL OR used = 0)
+                      AND (locked_by_run_id IS NULL OR locked_at < :expire)
+                    """
+                ).bindparams(*_LOCK_TIME_PARAMS),
+                {"run_id": run_id, "now": params["now"], "expire": params["expire"], "theme_id": row["id"]},
+            ).rowcount  # 重复候选条件，查询与加锁之间被抢占时不覆盖他人的锁
+            if locked:
+                leased.append(dict(row, locked_by_run_id=run_id, locked_at=now))  # 一次构造结果，锁字段取本次写入值
+        db.commit()
+    return leased
 
 
 def release_theme_lock(db: Session, theme_id: int) -> None:
     """在失败或放弃时释放软锁。"""
 
+    release_theme_locks(db, [theme_id])
+
+
+def release_theme_locks(db: Session, theme_ids: Sequence[int]) -> None:
+    """以一条 UPDATE 释放一批主题的软锁并提交。"""
+
     try:
         db.execute(
             text(
@@ -91,28 +190,61 @@ def release_theme_lock(db: Session, theme_id: int) -> None:
                 UPDATE psychology_themes
                 SET locked_by_run_id = NULL,
                     locked_at = NULL
-                WHERE id = :theme_id
+                WHERE id IN :theme_ids
                 """
-            ),
-            {"theme_id": theme_id},
+            ).bindparams(bindparam("theme_ids", expanding=True)),
+            {"theme_ids": list(theme_ids)},
         )
         db.commit()
     except Exception as exc:  # noqa: BLE001
         raise RuntimeError("TODO: 释放主题软锁失败，请检查数据库权限与结构。") from exc
 
 
-def _load_theme_detail(db: Session, theme_id: int) -> Optional[dict]:
-    """辅助函数：重新读取主题详情，确保字段齐全。"""
+def _flatten_style_directives(style_profile: Mapping[str, Any]) -> Dict[str, str]:
+    """将嵌套的风格配置展开为模板可替换的键值。"""
 
-    stmt = text(
-        """
-        SELECT id, psychology_keyword, psychology_definition, character_name, show_name
-        FROM psychology_themes
-        WHERE id = :theme_id
-        """
-    )
-    row = db.execute(stmt, {"theme_id": theme_id}).mappings().first()
-    return dict(row) if row else None
+    flattened: Dict[str, str] = {}
+    stack: list[tuple[Any, tuple[str, ...]]] = [(style_profile, ("STYLE",))]  # 显式栈替代递归，路径以元组累积
+    while stack:
+        value, path = stack.pop()
+        if isinstance(value, Mapping):
+            # 逆序入栈，出栈顺序与配置文件中的键顺序一致
+            stack.extend((nested, path + (str(key),)) for key, nested in reversed(list(value.items())))
+            continue
+        if isinstance(value, Sequence) and not isinstance(value, _STR_TYPES):
+            try:
+                rendered = "、".join(value)  # 元素均为字符串时直接在 C 层拼接
+            except TypeError:  # 含数字等非字符串元素
+                rendered = "、".join(map(str, value))
+        else:
+            rendered = str(value)
+        flattened["{{" + ".".join(path) + "}}"] = rendered  # 仅在叶子节点拼接占位符
+    return flattened
+
+
+@lru_cache(maxsize=32)
+def _flattened_style_directives(path_str: str, mtime_ns: int, style_key: str) -> Mapping[str, str]:
+    """按配置路径、修改时间与风格键缓存展开结果，以只读视图返回，避免调用方污染共享缓存。"""
+
+    return MappingProxyType(_flatten_style_directives(_read_style_profiles(path_str, mtime_ns)[style_key]))
+
+
+@lru_cache(maxsize=4)
+def _compile_template(template: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """将模板预先切分为字面量与占位符交替的片段，并单独给出按出现顺序排列的占位符。"""
+
+    parts = tuple(_PLACEHOLDER_RE.split(template))  # 奇数位为占位符
+    return parts, parts[1::2]
+
+
+def _render_placeholders(template: str, replacements: Mapping[str, str]) -> str:
+    """按预编译片段整体回填占位符后一次拼接，未知占位符原样保留，替换结果不再参与二次替换。"""
+
+    parts, placeholders = _compile_template(template)
+    lookup = replacements.get
+    rendered = list(parts)
+    rendered[1::2] = [lookup(name, name) for name in placeholders]  # 切片赋值一次写回全部占位符
+    return "".join(rendered)
 
 
 class ArticleGenerator:
@@ -122,20 +254,13 @@ class ArticleGenerator:
         """存储 API Key，供真实实现调用大模型服务。"""
 
         self.api_key = api_key  # 保存 API Key；真实场景需校验是否为空
-        self._style_profiles: Dict[str, Any] | None = None  # 缓存风格配置，避免重复读取
 
     def _load_prompt_template(self) -> str:
         """读取心理学影评提示词模板。"""
 
-        template = ARTICLE_PROMPT_PATH.read_text(  # 从文件系统读取模板文本
-            encoding="utf-8"
-        )  # 以 UTF-8 读取模板文本
-        LOGGER.debug(  # 输出模板长度用于调试与监控
-            "prompt_loaded",
-            template_length=len(template),
-            template_path=str(ARTICLE_PROMPT_PATH),
-        )
-        return template  # 返回模板字符串供 generate_article 使用
+        return _read_template(  # 命中缓存时仅需一次 stat
+            str(ARTICLE_PROMPT_PATH), ARTICLE_PROMPT_PATH.stat().st_mtime_ns
+        )  # 返回模板字符串供 generate_article 使用
 
     def _get_session(self) -> Session:
         """创建数据库会话，方便在单元测试中重载 Session 工厂。"""
@@ -143,17 +268,9 @@ class ArticleGenerator:
         return SessionLocal()  # 返回新的数据库会话实例
 
     def _load_style_profiles(self) -> Dict[str, Any]:
-        """从磁盘加载风格配置并缓存。"""
+        """从磁盘加载风格配置，进程内按修改时间缓存，调用方只读使用。"""
 
-        if self._style_profiles is None:
-            profile_text = STYLE_PROFILE_PATH.read_text(encoding="utf-8")
-            self._style_profiles = json.loads(profile_text)
-            LOGGER.debug(
-                "style_profile_loaded",
-                profile_path=str(STYLE_PROFILE_PATH),
-                available_profiles=list(self._style_profiles.keys()),
-            )
-        return self._style_profiles
+        return _read_style_profiles(str(STYLE_PROFILE_PATH), STYLE_PROFILE_PATH.stat().st_mtime_ns)
 
     def _get_style_profile(self, style_key: str) -> Dict[str, Any]:
         """根据键名获取具体风格配置，不存在时抛出异常提醒补齐。"""
@@ -164,61 +281,100 @@ class ArticleGenerator:
             raise KeyError(f"未找到名为 {style_key} 的风格配置，请在 style_profile.json 中补充。")
         return profiles[style_key]
 
-    def _flatten_style_directives(self, style_profile: Mapping[str, Any]) -> Dict[str, str]:
-        """将嵌套的风格配置展开为模板可替换的键值。"""
+    def _get_style_replacements(self, style_key: str) -> Mapping[str, str]:
+        """返回指定风格展开后的占位符映射，按配置文件修改时间缓存，调用方只读使用。"""
 
-        flattened: Dict[str, str] = {}
+        mtime_ns = STYLE_PROFILE_PATH.stat().st_mtime_ns  # 每篇文章只需一次 stat
+        try:
+            return _flattened_style_directives(str(STYLE_PROFILE_PATH), mtime_ns, style_key)
+        except KeyError:  # 风格缺失时复用统一的日志与提示
+            self._get_style_profile(style_key)
+            raise
 
-        def _walk(value: Any, path: str) -> None:
-            if isinstance(value, Mapping):
-                for key, nested in value.items():
-                    next_path = f"{path}.{key}" if path else key
-                    _walk(nested, next_path)
-                return
-            if isinstance(value, Sequence) and not isinstance(value, (str, bytes, bytearray)):
-                rendered = "、".join(str(item) for item in value)
-            else:
-                rendered = str(value)
-            placeholder = f"{{{{{path}}}}}"
-            flattened[placeholder] = rendered
-
-        _walk(style_profile, "STYLE")
-        return flattened
-
-    def _acquire_theme(self) -> dict:
-        """获取一条未使用的心理学主题记录并仅做软锁。"""
-
-        run_id = "article-generator-local"  # TODO: 本地生成器固定软锁 ID
-        with self._get_session() as session:
-            leased = lease_theme_for_run(session, run_id)
-            if leased is None:
-                LOGGER.error("no_available_theme")
-                raise RuntimeError("没有可用的心理学影评主题，请补充数据库种子数据。")
-            detail = _load_theme_detail(session, leased["id"]) or leased
+    def _acquire_theme(self, session: Session) -> dict:
+        """在调用方提供的会话中获取一条未使用的心理学主题记录并仅做软锁。"""
+
+        return self._acquire_themes(session, 1)[0]
+
+    def _acquire_themes(self, session: Session, count: int) -> list[dict]:
+        """一次领取至多 ``count`` 条未使用主题并软锁，一条都没有时抛出异常提醒补种子数据。"""
+
+        leased = lease_themes_for_run(session, _LOCAL_RUN_ID, count)
+        if not leased:
+            LOGGER.error("no_available_theme")
+            raise RuntimeError("没有可用的心理学影评主题，请补充数据库种子数据。")
+        for theme in leased:
             LOGGER.debug(
                 "theme_leased",
-                theme_id=detail.get("id"),
-                keyword=detail.get("psychology_keyword"),
-                character=detail.get("character_name"),
-                show=detail.get("show_name"),
+                theme_id=theme.get("id"),
+                keyword=theme.get("psychology_keyword"),
+                character=theme.get("character_name"),
+                show=theme.get("show_name"),
             )
-            return detail
+        return leased
 
     def generate_article(
         self,
         topic: str,
         style_key: str = "psychology_analysis",
         profile_config: Mapping[str, Any] | None = None,
+        session: Session | None = None,
     ) -> Dict[str, Any]:
-        """根据主题生成文章草稿。"""
+        """根据主题生成文章草稿；传入 ``session`` 时复用调用方的会话，由调用方负责关闭。"""
 
         maybe_inject_chaos("generation.generate_article")  # 生成阶段触发混沌演练
         template = self._load_prompt_template()  # 加载提示词模板
-        theme = self._acquire_theme()  # 获取未使用的心理学主题
-        character_profile = character_selector.get_random_character()  # 随机抽取角色资料
-        chosen_trait = random.choice(character_profile["traits"])  # 从角色特质中随机选择一项
-        style_profile = self._get_style_profile(style_key)  # 读取指定风格配置
-        style_replacements = self._flatten_style_directives(style_profile)  # 展开风格指令
+        owned = self._get_session() if session is None else nullcontext(session)  # 未传入时自建会话
+        with owned as session:  # 主题领取、各轮重复度检查与软锁释放共用一个会话
+            theme = self._acquire_theme(session)  # 获取未使用的心理学主题
+            try:  # 无论各轮尝试是否异常，都在同一会话内释放软锁
+                return self._compose_article(session, theme, topic, template, style_key, profile_config)
+            except Exception:
+                session.rollback()  # 放弃未完成的事务，保证释放软锁的语句可以执行
+                raise
+            finally:
+                release_theme_lock(session, theme_id=theme["id"])  # TODO: 本地生成后主动释放软锁
+
+    def generate_articles(
+        self,
+        topic: str,
+        count: int,
+        style_key: str = "psychology_analysis",
+        profile_config: Mapping[str, Any] | None = None,
+        session: Session | None = None,
+    ) -> list[Dict[str, Any]]:
+        """批量生成草稿：一条语句领取至多 ``count`` 个主题，结束后一条语句释放全部软锁。"""
+
+        maybe_inject_chaos("generation.generate_article")  # 与单篇生成共用混沌演练点
+        template = self._load_prompt_template()  # 加载提示词模板
+        owned = self._get_session() if session is None else nullcontext(session)  # 未传入时自建会话
+        with owned as session:  # 整批共用一个会话
+            themes = self._acquire_themes(session, count)  # 主题不足时返回的篇数少于 count
+            try:
+                return [
+                    self._compose_article(session, theme, topic, template, style_key, profile_config)
+                    for theme in themes
+                ]
+            except Exception:
+                session.rollback()  # 放弃未完成的事务，保证释放软锁的语句可以执行
+                raise
+            finally:
+                release_theme_locks(session, [theme["id"] for theme in themes])  # 一次释放整批软锁
+
+    def _compose_article(
+        self,
+        session: Session,
+        theme: Mapping[str, Any],
+        topic: str,
+        template: str,
+        style_key: str,
+        profile_config: Mapping[str, Any] | None,
+    ) -> Dict[str, Any]:
+        """基于已领取的主题渲染正文并逐个 Variant 通过质量闸门，返回文章草稿结构。"""
+
+        character_profile = _get_random_character()  # 随机抽取角色资料
+        chosen_trait = _random_choice(character_profile["traits"])  # 从角色特质中随机选择一项
+        style_replacements = self._get_style_replacements(style_key)  # 读取已展开的风格指令
         replacements = {  # 构造模板占位符与实际内容的映射
             "{{心理学关键词}}": theme.get("psychology_keyword", "未知关键词"),
             "{{心理学定义}}": theme.get("psychology_definition", "未知定义"),
@@ -228,6 +384,17 @@ class ArticleGenerator:
             "{{TAGS}}": chosen_trait,
         }
         replacements.update(style_replacements)  # 合并风格指令占位符
+        rendered_body = _render_placeholders(template, replacements)  # 模板与映射在各轮尝试间不变，只渲染一次
+        capped_body = rendered_body[:MAX_ARTICLE_LENGTH]  # 无 Prompt 指令时直接使用的截断正文
+        title = (
+            f"{theme.get('psychology_keyword', '心理学主题')}是一种{theme.get('psychology_definition', '概念')} —— "
+            f"{character_profile['name']}（{character_profile['work']}）"
+        )  # 构造模拟标题，与 Variant 无关
+        quality_keywords = [
+            theme.get("psychology_keyword", "心理学主题"),
+            character_profile["name"],
+            character_profile["work"],
+        ]  # 质量闸门使用的关键词
         prompt_section = (profile_config or {}).get("prompting", {})  # 读取 Profile 中的 Prompt 策略
         strategy_config = prompt_section.get("strategy") if isinstance(prompt_section, Mapping) else {}
         max_attempts = int(prompt_section.get("max_attempts", MAX_VARIANT_ATTEMPTS)) if isinstance(prompt_section, Mapping) else MAX_VARIANT_ATTEMPTS  # 读取最大尝试次数
@@ -242,45 +409,36 @@ class ArticleGenerator:
         article_body = ""  # 初始化正文
         manual_review = False  # 标记是否进入人工复核
 
-        tried: set[str] = set()  # 跟踪已尝试的 Variant
+        untried = dict.fromkeys(available_variants)  # 尚未尝试的 Variant，保持列表顺序且 O(1) 移除
         for attempt in range(max(1, min(max_attempts, len(available_variants)))):  # 控制尝试次数
             if attempt == 0:  # 首次尝试按照策略选择
                 variant, prompt_text = choose_prompt_variant(profile_config or {}, strategy_config)
             else:  # 后续尝试按未使用的 Variant 顺序回退
-                fallback_candidates = [variant for variant in available_variants if variant not in tried]
-                if not fallback_candidates:  # 若已尝试所有 Variant，则回退至轮询
+                fallback_variant = next(iter(untried), None)  # 按顺序取第一个未尝试的 Variant
+                if fallback_variant is None:  # 若已尝试所有 Variant，则回退至轮询
                     variant, prompt_text = choose_prompt_variant(profile_config or {}, strategy_config)
                 else:
-                    variant = fallback_candidates[0]
+                    variant = fallback_variant
                     prompt_text = get_prompt(variant)
-            tried.add(variant)  # 记录已尝试 Variant
+            untried.pop(variant, None)  # 记录已尝试 Variant
 
             prompt_instructions = "\n".join(  # 清洗 Prompt 文本，去除注释行
                 line for line in prompt_text.splitlines() if not line.strip().startswith("#")
             ).strip()
-            rendered_body = template  # 从模板复制一份用于替换
-            for placeholder, value in replacements.items():  # 遍历占位符完成替换
-                rendered_body = rendered_body.replace(placeholder, value)
-            article_body = f"{prompt_instructions}\n\n{rendered_body}" if prompt_instructions else rendered_body  # 将 Prompt 指令前置便于审计
-            if len(article_body) > MAX_ARTICLE_LENGTH:  # 控制输出字数上限
-                article_body = article_body[:MAX_ARTICLE_LENGTH]
-
-            title = (
-                f"{theme.get('psychology_keyword', '心理学主题')}是一种{theme.get('psychology_definition', '概念')} —— "
-                f"{character_profile['name']}（{character_profile['work']}）"
-            )  # 构造模拟标题
-
-            with self._get_session() as session:  # 打开数据库会话供重复度检查
-                report = evaluate_quality(
-                    article_body,
-                    title=title,
-                    keywords=[
-                        theme.get("psychology_keyword", "心理学主题"),
-                        character_profile["name"],
-                        character_profile["work"],
-                    ],
-                    session=session,
-                )
+            if prompt_instructions:  # 将 Prompt 指令前置便于审计，并控制输出字数上限
+                header = f"{prompt_instructions}\n\n"
+                remaining = MAX_ARTICLE_LENGTH - len(header)
+                # 只截取上限内需要的正文再拼接，不生成超长中间串
+                article_body = header + capped_body[:remaining] if remaining > 0 else header[:MAX_ARTICLE_LENGTH]
+            else:
+                article_body = capped_body
+
+            report = evaluate_quality(
+                article_body,
+                title=title,
+                keywords=quality_keywords,
+                session=session,
+            )
 
             attempt_logs.append(
                 {
@@ -350,7 +508,4 @@ class ArticleGenerator:
             "manual_review": manual_review,
         }
 
-        with self._get_session() as session:
-            release_theme_lock(session, theme_id=theme["id"])  # TODO: 本地生成后主动释放软锁
-
         return result
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import json
 import random
 from functools import lru_cache
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, NamedTuple, Optional, Tuple
 
+from app.utils.helpers import load_json_bytes
 from config.settings import BASE_DIR
 
 CHARACTER_FILE_PATH = BASE_DIR / "app" / "generator" / "characters.json"
@@ -16,7 +16,15 @@ class CharacterSelectorError(ValueError):
     """当角色库数据非法或存在重复时抛出。"""
 
 
-def _validate_character_entry(entry: Dict[str, object]) -> Dict[str, object]:
+class Character(NamedTuple):
+    """校验后的不可变角色条目，供进程内缓存共享。"""
+
+    name: str
+    work: str
+    traits: Tuple[str, ...]
+
+
+def _validate_character_entry(entry: Dict[str, object]) -> Character:
     """校验单个角色条目结构与数据类型。"""
 
     if "name" not in entry or "work" not in entry or "traits" not in entry:
@@ -30,67 +38,58 @@ def _validate_character_entry(entry: Dict[str, object]) -> Dict[str, object]:
         raise CharacterSelectorError("work 字段必须为非空字符串")
     if not isinstance(traits, list) or not traits:
         raise CharacterSelectorError("traits 字段必须为非空列表")
-    cleaned_traits: List[str] = []
-    for trait in traits:
-        if not isinstance(trait, str) or not trait.strip():
-            raise CharacterSelectorError("traits 列表内的元素必须为非空字符串")
-        cleaned_traits.append(trait.strip())
-    return {
-        "name": name.strip(),
-        "work": work.strip(),
-        "traits": cleaned_traits,
-    }
+    if not all(isinstance(trait, str) and trait.strip() for trait in traits):
+        raise CharacterSelectorError("traits 列表内的元素必须为非空字符串")
+    return Character(name.strip(), work.strip(), tuple(trait.strip() for trait in traits))
 
 
 @lru_cache(maxsize=1)
-def _load_characters() -> List[Dict[str, object]]:
-    """读取角色库文件并进行基础校验。"""
+def _load_characters() -> Tuple[Tuple[Character, ...], Dict[str, Character]]:
+    """读取角色库文件并进行基础校验，返回角色元组与按角色名建立的索引（同名取首个）。"""
 
-    raw_text = CHARACTER_FILE_PATH.read_text(encoding="utf-8")
-    data = json.loads(raw_text)
+    data = load_json_bytes(CHARACTER_FILE_PATH.read_bytes())
     if not isinstance(data, list):
         raise CharacterSelectorError("角色库顶层结构必须为数组")
-    characters: List[Dict[str, object]] = []
+    if not all(isinstance(entry, dict) for entry in data):
+        raise CharacterSelectorError("角色条目必须是对象结构")
+    characters = tuple(_validate_character_entry(entry) for entry in data)
     seen: set[Tuple[str, str]] = set()
-    for entry in data:
-        if not isinstance(entry, dict):
-            raise CharacterSelectorError("角色条目必须是对象结构")
-        validated = _validate_character_entry(entry)
-        key = (validated["name"], validated["work"])
+    by_name: Dict[str, Character] = {}
+    for character in characters:
+        key = (character.name, character.work)
         if key in seen:
             raise CharacterSelectorError(
-                f"检测到重复角色组合: {validated['name']} @ {validated['work']}"
+                f"检测到重复角色组合: {character.name} @ {character.work}"
             )
         seen.add(key)
-        characters.append(validated)
-    return characters
+        by_name.setdefault(character.name, character)
+    return characters, by_name
 
 
-def get_random_character() -> Dict[str, object]:
-    """随机返回一个角色信息字典。"""
+def _as_dict(character: Character) -> Dict[str, object]:
+    """转换为对外返回的角色字典；traits 直接共享缓存中的只读元组，调用方不得修改。"""
 
-    characters = _load_characters()
-    selected = random.choice(characters)
     return {
-        "name": selected["name"],
-        "work": selected["work"],
-        "traits": list(selected["traits"]),
+        "name": character.name,
+        "work": character.work,
+        "traits": character.traits,
     }
 
 
+def get_random_character() -> Dict[str, object]:
+    """随机返回一个角色信息字典，traits 为只读元组。"""
+
+    characters, _ = _load_characters()
+    return _as_dict(random.choice(characters))
+
+
 def get_character_by_name(name: str) -> Optional[Dict[str, object]]:
     """根据角色名精确查找角色，未命中返回 None。"""
 
     if not isinstance(name, str):
         raise TypeError("name 参数必须为字符串")
-    for character in _load_characters():
-        if character["name"] == name:
-            return {
-                "name": character["name"],
-                "work": character["work"],
-                "traits": list(character["traits"]),
-            }
-    return None
+    character = _load_characters()[1].get(name)
+    return _as_dict(character) if character is not None else None
 
 
 def ensure_unique_characters() -> None:
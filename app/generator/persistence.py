@@ -1,145 +1,165 @@
 """生成结果持久化模块，负责调用去重并以事务方式写入数据库。"""  # 模块中文说明
 from __future__ import annotations  # 引入未来注解语法保证类型提示兼容
 from datetime import datetime, timezone  # 导入时间函数用于生成时间戳
-from typing import Any, Dict, Optional  # 引入类型提示增强可读性
-from sqlalchemy import text  # 导入 SQL 构造器用于执行原生语句
+from typing import Any, Dict, List, Mapping, Optional, Sequence  # 引入类型提示增强可读性
+from sqlalchemy import Column, Integer, MetaData, Table, insert, text  # 导入 SQL 构造器用于执行原生语句与批量插入
 from sqlalchemy.orm import Session  # 引入 SQLAlchemy 会话类型
 from app.dedup.deduplicator import decide_dedup, DedupConfig  # 导入去重判定逻辑与配置
 from app.chaos.hooks import maybe_inject_chaos  # 引入混沌注入钩子
 
+_ARTICLES = Table(  # articles 表的轻量 Core 描述，含迁移新增的去重列，供批量 INSERT ... RETURNING 使用
+    "articles",
+    MetaData(),  # 独立元数据，不参与 ORM 建表
+    Column("id", Integer, primary_key=True),  # 自增主键，按参数顺序回传
+    Column("run_id"),
+    Column("character_name"),
+    Column("work"),
+    Column("keyword"),
+    Column("title"),
+    Column("status"),
+    Column("content"),
+    Column("role_slug"),
+    Column("work_slug"),
+    Column("psych_keyword"),
+    Column("lang"),
+    Column("title_signature"),
+    Column("content_signature"),
+    Column("created_at"),
+    Column("meta"),
+)
+
+_INSERT_USED_PAIR_SQL = text(
+    """
+    INSERT INTO used_pairs (
+        character_name,
+        work,
+        keyword,
+        run_id,
+        used_on,
+        similarity_hash,
+        role_slug,
+        work_slug,
+        psych_keyword,
+        lang,
+        first_used_at,
+        last_used_at
+    )
+    VALUES (
+        :character_name,
+        :work,
+        :keyword,
+        :run_id,
+        :used_on,
+        :similarity_hash,
+        :role_slug,
+        :work_slug,
+        :psych_keyword,
+        :lang,
+        :first_used_at,
+        :last_used_at
+    )
+    ON CONFLICT(role_slug, work_slug, psych_keyword, lang)
+    DO UPDATE SET
+        last_used_at = excluded.last_used_at,
+        used_on = excluded.used_on,
+        run_id = excluded.run_id
+    """
+)  # 构造写入 used_pairs 的 UPSERT 语句
+
 
 def insert_article_tx(session: Session, title: str, body: str, role: str, work: str, keyword: str, lang: str = "zh", run_id: Optional[str] = None) -> Dict[str, Any]:  # 定义事务性插入函数
     """执行去重判定并在单个事务内写入 articles 与 used_pairs。"""  # 函数中文文档
+    row = {"title": title, "body": body, "role": role, "work": work, "keyword": keyword, "lang": lang, "run_id": run_id}  # 组装单篇参数
+    return insert_articles_tx(session, [row])[0]  # 复用批量写入路径
+
+
+def insert_articles_tx(session: Session, rows: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:  # 定义批量事务性插入函数
+    """逐篇执行去重判定后，以 executemany 在同一事务内写入全部文章与 used_pairs，只提交一次。
+
+    ``rows`` 中每项包含 ``title``/``body``/``role``/``work``/``keyword``，可选 ``lang`` 与 ``run_id``。
+    任意一篇与库内或批内其他文章冲突时整批不写入并抛出 ``ValueError``；返回值与 ``rows`` 顺序一致。
+    """  # 函数中文文档
     maybe_inject_chaos("generation.persist")  # 持久化阶段触发混沌演练
+    if not rows:  # 空批次无需访问数据库
+        return []
     now = datetime.now(timezone.utc)  # 获取当前 UTC 时间
     cfg = DedupConfig()  # 初始化默认去重配置
-    verdict = decide_dedup(session, title, body, role, work, keyword, lang, now, cfg)  # 执行去重判定
-    if verdict["combo_conflict"]:  # 判断组合是否冲突
-        raise ValueError("DUP_COMBO_DAY: 同日相同角色作品关键词组合已存在")  # 抛出明确错误提示
-    if verdict["signature_conflict"]:  # 判断签名是否冲突
-        raise ValueError("DUP_CONTENT_SIG: 正文签名重复")  # 抛出签名冲突异常
-    if verdict["near_duplicate"]:  # 判断近似重复
-        near = verdict["near_duplicate"]  # 读取近似信息
-        raise ValueError(f"DUP_NEAR: 与文章#{near['id']} 相似度过高")  # 抛出近似重复异常
-    transaction = session.begin()  # 显式开启事务以便手动提交或回滚
+    verdicts: List[Dict[str, Any]] = []  # 与 rows 一一对应的判定结果
+    seen_combos: set[tuple] = set()  # 批内已出现的组合
+    seen_signatures: set[str] = set()  # 批内已出现的正文签名
     try:
-        insert_article_sql = text(
-            """
-            INSERT INTO articles (
-                run_id,
-                character_name,
-                work,
-                keyword,
-                title,
-                status,
-                content,
-                role_slug,
-                work_slug,
-                psych_keyword,
-                lang,
-                title_signature,
-                content_signature,
-                created_at,
-                meta
-            )
-            VALUES (
-                :run_id,
-                :character_name,
-                :work,
-                :keyword,
-                :title,
-                :status,
-                :content,
-                :role_slug,
-                :work_slug,
-                :psych_keyword,
-                :lang,
-                :title_signature,
-                :content_signature,
-                :created_at,
-                :meta
-            )
-            """
-        )  # 构造插入文章的 SQL 语句
-        insert_params = {
-            "run_id": run_id,
-            "character_name": role,
-            "work": work,
-            "keyword": keyword,
-            "title": title,
-            "status": "draft",
-            "content": body,
-            "role_slug": verdict["role_slug"],
-            "work_slug": verdict["work_slug"],
-            "psych_keyword": verdict["psych_keyword"],
-            "lang": verdict["lang"],
-            "title_signature": verdict["title_signature"],
-            "content_signature": verdict["content_signature"],
-            "created_at": now,
-            "meta": "{}",
-        }  # 组装文章插入参数
-        result = session.execute(insert_article_sql, insert_params)  # 执行文章插入
-        article_id = result.lastrowid  # 获取新插入文章的主键 ID
-        if article_id is None:  # 若数据库未返回主键
-            article_id = session.execute(text("SELECT last_insert_rowid()"))  # 退回到 SQLite 专用查询
-            article_id = article_id.scalar_one()  # 提取主键值
-        simhash_tail = verdict["content_signature"].split("-")[-1] if verdict["content_signature"] else None  # 提取 SimHash 片段
-        insert_used_sql = text(
-            """
-            INSERT INTO used_pairs (
-                character_name,
-                work,
-                keyword,
-                run_id,
-                used_on,
-                similarity_hash,
-                role_slug,
-                work_slug,
-                psych_keyword,
-                lang,
-                first_used_at,
-                last_used_at
-            )
-            VALUES (
-                :character_name,
-                :work,
-                :keyword,
-                :run_id,
-                :used_on,
-                :similarity_hash,
-                :role_slug,
-                :work_slug,
-                :psych_keyword,
-                :lang,
-                :first_used_at,
-                :last_used_at
-            )
-            ON CONFLICT(role_slug, work_slug, psych_keyword, lang)
-            DO UPDATE SET
-                last_used_at = excluded.last_used_at,
-                used_on = excluded.used_on,
-                run_id = excluded.run_id
-            """
-        )  # 构造写入 used_pairs 的 UPSERT 语句
-        session.execute(
-            insert_used_sql,
+        for row in rows:  # 逐篇去重判定
+            verdict = decide_dedup(session, row["title"], row["body"], row["role"], row["work"], row["keyword"], row.get("lang", "zh"), now, cfg)  # 执行去重判定
+            combo = (verdict["role_slug"], verdict["work_slug"], verdict["psych_keyword"], verdict["lang"])  # 组合键
+            if verdict["combo_conflict"] or combo in seen_combos:  # 判断组合是否冲突
+                raise ValueError("DUP_COMBO_DAY: 同日相同角色作品关键词组合已存在")  # 抛出明确错误提示
+            if verdict["signature_conflict"] or verdict["content_signature"] in seen_signatures:  # 判断签名是否冲突
+                raise ValueError("DUP_CONTENT_SIG: 正文签名重复")  # 抛出签名冲突异常
+            if verdict["near_duplicate"]:  # 判断近似重复
+                near = verdict["near_duplicate"]  # 读取近似信息
+                raise ValueError(f"DUP_NEAR: 与文章#{near['id']} 相似度过高")  # 抛出近似重复异常
+            seen_combos.add(combo)  # 记录组合
+            if verdict["content_signature"]:  # 空签名不参与批内比较
+                seen_signatures.add(verdict["content_signature"])  # 记录签名
+            verdicts.append(verdict)  # 保存判定
+        article_params = [
             {
-                "character_name": role,
-                "work": work,
-                "keyword": keyword,
-                "run_id": run_id or "ad_hoc",
-                "used_on": now.date(),
-                "similarity_hash": simhash_tail,
+                "run_id": row.get("run_id"),
+                "character_name": row["role"],
+                "work": row["work"],
+                "keyword": row["keyword"],
+                "title": row["title"],
+                "status": "draft",
+                "content": row["body"],
                 "role_slug": verdict["role_slug"],
                 "work_slug": verdict["work_slug"],
                 "psych_keyword": verdict["psych_keyword"],
                 "lang": verdict["lang"],
-                "first_used_at": now,
-                "last_used_at": now,
-            },
-        )  # 执行 used_pairs 写入或更新
-        transaction.commit()  # 写入成功后提交事务
-        return {"article_id": article_id, "verdict": verdict}  # 返回文章 ID 与判定信息
+                "title_signature": verdict["title_signature"],
+                "content_signature": verdict["content_signature"],
+                "created_at": now,
+                "meta": "{}",
+            }
+            for row, verdict in zip(rows, verdicts)
+        ]  # 组装文章插入参数
+        article_ids = _insert_articles(session, article_params)  # 批量写入文章并取回主键
+        session.execute(
+            _INSERT_USED_PAIR_SQL,
+            [
+                {
+                    "character_name": row["role"],
+                    "work": row["work"],
+                    "keyword": row["keyword"],
+                    "run_id": row.get("run_id") or "ad_hoc",
+                    "used_on": now.date(),
+                    "similarity_hash": (verdict["content_signature"] or "").rpartition("-")[2] or None,  # 提取 SimHash 片段，无需拆分整串
+                    "role_slug": verdict["role_slug"],
+                    "work_slug": verdict["work_slug"],
+                    "psych_keyword": verdict["psych_keyword"],
+                    "lang": verdict["lang"],
+                    "first_used_at": now,
+                    "last_used_at": now,
+                }
+                for row, verdict in zip(rows, verdicts)
+            ],
+        )  # executemany 写入或更新 used_pairs
+        session.commit()  # 去重查询与写入同属一个事务，成功后统一提交
     except Exception:
-        transaction.rollback()  # 发生异常时回滚事务
+        session.rollback()  # 发生异常时回滚事务
         raise  # 将异常继续抛出给上层处理
+    return [{"article_id": article_id, "verdict": verdict} for article_id, verdict in zip(article_ids, verdicts)]  # 返回文章 ID 与判定信息
+
+
+def _insert_articles(session: Session, params: List[Dict[str, Any]]) -> List[int]:  # 定义文章批量插入函数
+    """支持按参数顺序返回主键的方言用一条 INSERT ... RETURNING 批量写入，否则逐条插入读取 lastrowid。"""  # 函数中文文档
+    dialect = session.get_bind().dialect  # 当前数据库方言
+    if dialect.insert_executemany_returning_sort_by_parameter_order:  # SQLite 3.35+、PostgreSQL 等
+        statement = insert(_ARTICLES).returning(_ARTICLES.c.id, sort_by_parameter_order=True)  # 主键顺序与参数一致
+        return list(session.execute(statement, params).scalars())
+    article_ids: List[int] = []  # 逐条插入收集主键
+    for item in params:
+        article_id = session.execute(insert(_ARTICLES), item).lastrowid  # 获取新插入文章的主键 ID
+        if article_id is None:  # 若数据库未返回主键
+            article_id = session.execute(text("SELECT last_insert_rowid()")).scalar_one()  # 退回到 SQLite 专用查询
+        article_ids.append(article_id)
+    return article_ids
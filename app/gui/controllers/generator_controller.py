@@ -6,65 +6,87 @@ from __future__ import annotations  # 启用未来注解
 import subprocess  # 运行外部脚本
 import sys  # 获取 Python 解释器路径
 from pathlib import Path  # 构建脚本绝对路径
-from typing import Callable, Optional  # 类型注解
+from typing import Callable, List, Optional  # 类型注解
 
 from PySide6.QtWidgets import QMessageBox  # 用于提示任务结果
 
-from app.gui.controllers.task_worker import TaskWorker  # 导入通用后台线程
+from app.gui.controllers.task_pool import (  # 共享线程池
+    GLOBAL_POOL,
+    TaskRunnable,
+    per_line,
+)
+from app.gui.controllers.task_worker import (  # 子进程输出读取与回收
+    iter_process_chunks,
+    terminate_process,
+    wait_process,
+)
 from app.utils.logger import get_logger  # 引入统一日志模块
 
 LOGGER = get_logger(__name__)  # 初始化控制器日志器
+_GEN_SCRIPT: Optional[Path] = next(  # 脚本布局在安装时即已固定，导入时选定一次避免每次启动重复 stat
+    (
+        path
+        for path in (
+            Path("scripts/generate_articles.py"),  # Round 5 规范脚本
+            Path("app/orchestrator/orchestrator.py"),  # Orchestrator 主脚本
+            Path("app/main.py"),  # 旧版主入口
+        )
+        if path.exists()
+    ),
+    None,
+)
+_GEN_COMMAND: Optional[tuple[str, ...]] = (sys.executable, str(_GEN_SCRIPT)) if _GEN_SCRIPT else None  # 预先构造的执行命令
 
 
 class GeneratorController:  # 定义生成控制器
     """负责在后台线程中执行文章生成脚本。"""  # 类说明
 
-    def __init__(self, log_callback: Callable[[str], None], status_callback: Callable[[str, str], None]) -> None:  # 构造函数
+    def __init__(
+        self,
+        log_callback: Callable[[str], None],
+        status_callback: Callable[[str, str], None],
+        log_batch_callback: Optional[Callable[[List[str]], None]] = None,
+    ) -> None:  # 构造函数
         self.log_callback = log_callback  # 保存日志回调
+        self.log_batch_callback = log_batch_callback or per_line(log_callback)  # 批量日志回调，缺省时逐行转发
         self.status_callback = status_callback  # 保存状态灯回调
         self.logger = LOGGER  # 暴露日志器供主窗口附加 handler
-        self.worker: Optional[TaskWorker] = None  # 记录当前线程
-        self._current_process: Optional[subprocess.Popen[str]] = None  # 保存子进程引用便于停止
+        self.worker: Optional[TaskRunnable] = None  # 当前线程池任务
+        self._busy = False  # 任务运行中标记，由完成信号清除
+        self._current_process: Optional[subprocess.Popen[bytes]] = None  # 保存子进程引用便于停止
 
     def start_generation(self) -> None:  # 启动生成任务
-        if self.worker and self.worker.isRunning():  # 若已有任务运行
+        if self._busy:  # 若已有任务运行
             QMessageBox.warning(None, "任务进行中", "文章生成正在进行，请稍后再试")  # 提示用户
             return  # 直接返回
         self.status_callback("#4c8bf5", "生成文章中……")  # 更新状态灯为运行中
         self.logger.info("准备启动文章生成流程")  # 输出日志
-        self.worker = TaskWorker(self._run_generation)  # 创建后台线程
-        self.worker.log_signal.connect(self.log_callback)  # 连接日志信号
-        self.worker.done_signal.connect(self._on_finished)  # 连接完成信号
-        self.worker.start()  # 启动线程
+        self.worker = TaskRunnable(self._run_generation)  # 创建线程池任务
+        self.worker.signals.log_batch_signal.connect(self.log_batch_callback)  # 连接批量日志信号
+        self.worker.signals.done_signal.connect(self._on_finished)  # 连接完成信号
+        self._busy = True  # 标记任务运行中
+        GLOBAL_POOL.start(self.worker)  # 交由共享线程池执行
 
     def _run_generation(self):  # 在线程内执行的函数，返回迭代器
-        script_candidates = [  # 备选脚本路径
-            Path("scripts/generate_articles.py"),  # Round 5 规范脚本
-            Path("app/orchestrator/orchestrator.py"),  # Orchestrator 主脚本
-            Path("app/main.py"),  # 旧版主入口
-        ]
-        target = next((path for path in script_candidates if path.exists()), None)  # 选择存在的脚本
-        if target is None:  # 若没有匹配脚本
+        target, command = _GEN_SCRIPT, _GEN_COMMAND  # 导入时已确定的脚本与命令
+        if target is None or command is None:  # 若没有匹配脚本
             raise FileNotFoundError("未找到可用的文章生成脚本")  # 抛出异常
         yield f"[INFO] 即将执行 {target}"  # 输出准备日志
-        command = [sys.executable, str(target)]  # 构造命令
         self.logger.debug("执行命令=%s", command)  # 记录调试信息
         self._current_process = subprocess.Popen(  # 启动子进程
             command,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
+            bufsize=0,  # 无缓冲二进制管道，由 iter_process_chunks 按块读取
         )
-        assert self._current_process.stdout is not None  # 静态检查：stdout 必不为空
-        for line in self._current_process.stdout:  # 逐行读取输出
-            yield line.rstrip()  # 去除换行并返回
-        return_code = self._current_process.wait()  # 等待进程结束
+        yield from iter_process_chunks(self._current_process)  # 每次读取的完整行作为一个日志批次返回
+        return_code = wait_process(self._current_process, cancelled=self.worker.is_cancelled if self.worker else None)  # 读到 EOF 后轮询进程结束，取消时立即终止
         if return_code != 0:  # 判断是否成功
             raise RuntimeError(f"文章生成脚本退出码 {return_code}")  # 报错
         yield "[INFO] 文章生成完成"  # 提示成功
 
     def _on_finished(self, code: int) -> None:  # 线程结束回调
+        self._busy = False  # 清除运行标记
         self._current_process = None  # 清理子进程引用
         if code == 0:  # 成功时
             self.status_callback("#1abc9c", "生成完成")  # 状态灯转为绿色
@@ -74,10 +96,10 @@ class GeneratorController:  # 定义生成控制器
             QMessageBox.critical(None, "生成失败", "生成过程中出现错误，请查看日志")  # 弹窗提示
 
     def shutdown(self) -> None:  # 程序关闭时清理资源
-        if self.worker and self.worker.isRunning():  # 如果线程仍在运行
+        if self._busy and self.worker:  # 如果线程仍在运行
             self.logger.info("正在尝试停止文章生成线程")  # 输出日志
             self.worker.stop()  # 请求线程停止
         if self._current_process and self._current_process.poll() is None:  # 若子进程存在
             self.logger.warning("正在终止文章生成子进程")  # 输出警告
-            self._current_process.terminate()  # 发送终止信号
+            terminate_process(self._current_process)  # 终止并排空管道，超时则强制结束
             self._current_process = None  # 清理引用
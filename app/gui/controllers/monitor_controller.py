@@ -3,16 +3,21 @@
 
 from __future__ import annotations  # 启用未来注解
 
-import subprocess  # 运行自检脚本
-import sys  # 获取解释器路径
+import re  # 解析自检输出
 from dataclasses import dataclass  # 定义结构体
 from typing import Callable, List, Optional  # 类型提示
 
-from app.gui.controllers.task_worker import TaskWorker  # 通用后台线程
+from app.gui.controllers.task_pool import (  # 共享线程池
+    GLOBAL_POOL,
+    TaskRunnable,
+    per_line,
+)
+from app.gui.controllers.task_worker import iter_logged_call  # 进程内调用并转发输出
 from app.gui.widgets.status_panel import StatusPanel, SimpleCheck  # 状态面板类型
 from app.utils.logger import get_logger  # 日志模块
 
 LOGGER = get_logger(__name__)  # 初始化日志器
+_CHECK_LINE_RE = re.compile(r"^([\u2705\u274c]|\u26a0\ufe0f?)\s+([^:]*?)\s*:\s*(.*?)\s*$")  # "✅ 名称: 消息"，⚠️ 含变体选择符
 
 
 @dataclass
@@ -25,68 +30,86 @@ class CheckResult:  # 简化后的检查结果结构
 class MonitorController:  # 系统监控控制器
     """定期运行 doctor 并解析输出。"""  # 类说明
 
-    def __init__(self, log_callback: Callable[[str], None], status_panel: StatusPanel) -> None:  # 构造函数
+    def __init__(
+        self,
+        log_callback: Callable[[str], None],
+        status_panel: StatusPanel,
+        log_batch_callback: Optional[Callable[[List[str]], None]] = None,
+    ) -> None:  # 构造函数
         self.log_callback = log_callback  # 保存日志回调
+        self.log_batch_callback = log_batch_callback or per_line(log_callback)  # 批量日志回调，缺省时逐行转发
         self.status_panel = status_panel  # 保存状态面板
         self.logger = LOGGER  # 暴露日志器
-        self.worker: Optional[TaskWorker] = None  # 后台线程引用
-        self._current_process: Optional[subprocess.Popen[str]] = None  # 子进程引用
+        self.worker: Optional[TaskRunnable] = None  # 当前线程池任务
+        self._busy = False  # 任务运行中标记，由完成信号清除
         self._latest_checks: List[CheckResult] = []  # 最近一次检查结果
+        self._previous_signature: Optional[tuple[tuple[str, str, str], ...]] = None  # 上次写入面板的检查结果，None 表示需整表重建
+        self.last_changed = True  # 最近一次自检结果是否与上次不同，供主窗口调整刷新节奏
+        self._last_failure: Optional[tuple] = None  # 上次失败时的返回码与已解析的检查结果
 
     def refresh_status(self) -> None:  # 启动 doctor 检查
-        if self.worker and self.worker.isRunning():  # 避免并发运行
+        if self._busy:  # 避免并发运行
             self.logger.debug("自检仍在运行，跳过本次刷新")  # 输出调试日志
             return  # 直接返回
         self.logger.info("开始执行系统自检")  # 记录日志
-        self.worker = TaskWorker(self._run_doctor)  # 创建线程
-        self.worker.log_signal.connect(self.log_callback)  # 连接日志信号
-        self.worker.done_signal.connect(self._on_finished)  # 连接完成信号
-        self.worker.start()  # 启动线程
+        self.worker = TaskRunnable(self._run_doctor)  # 创建线程池任务
+        self.worker.signals.log_batch_signal.connect(self.log_batch_callback)  # 连接批量日志信号
+        self.worker.signals.done_signal.connect(self._on_finished)  # 连接完成信号
+        self._busy = True  # 标记任务运行中
+        GLOBAL_POOL.start(self.worker)  # 交由共享线程池执行
 
     def _run_doctor(self):  # 在线程中执行 doctor
         self._latest_checks = []  # 清空旧结果
-        command = [sys.executable, "-m", "scripts.doctor"]  # 构造命令
-        self._current_process = subprocess.Popen(  # 启动进程
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-        )
-        assert self._current_process.stdout is not None  # 确保 stdout 可读
-        for line in self._current_process.stdout:  # 逐行读取输出
-            text = line.rstrip()  # 去除换行
-            if text:  # 非空行写入日志
-                self._parse_line(text)  # 尝试解析检查结果
-            yield text  # 返回给日志窗口
-        code = self._current_process.wait()  # 等待结束
+        # 延迟导入，GUI 启动时不加载数据库与 Profile 模块
+        from scripts.doctor import run as run_doctor
+
+        def doctor(emit: Callable[[str], None]) -> int:  # 边输出边解析检查结果
+            def log(text: str) -> None:
+                if text:  # 非空行尝试解析
+                    self._parse_line(text)  # 尝试解析检查结果
+                emit(text)  # 转发给日志窗口
+
+            return run_doctor(log)
+
+        code = yield from iter_logged_call(doctor)  # 进程内执行自检，省去解释器启动与管道读写
         if code != 0:  # 若退出码非零
             raise RuntimeError(f"doctor 退出码 {code}")  # 抛出异常
         yield "[INFO] 自检完成"  # 输出完成日志
 
     def _parse_line(self, line: str) -> None:  # 解析 doctor 输出
-        if not line or line[0] not in {"✅", "⚠️", "❌"}:  # 判断是否符合格式
-            return  # 非检查结果行直接跳过
-        try:
-            symbol, rest = line.split(" ", 1)  # 拆分状态符号与剩余文本
-            name, message = rest.split(":", 1)  # 根据冒号拆分名称与消息
-            self._latest_checks.append(CheckResult(name=name.strip(), status=symbol, message=message.strip()))  # 保存结果
-        except ValueError:  # 拆分失败时
-            self.logger.debug("无法解析自检行: %s", line)  # 输出调试
+        match = _CHECK_LINE_RE.match(line)  # 单次正则匹配状态符号、名称与消息
+        if match is None:  # 非检查结果行直接跳过
+            return
+        symbol, name, message = match.groups()  # 拆出三段
+        self._latest_checks.append(CheckResult(name=name, status=symbol, message=message))  # 保存结果
 
     def _on_finished(self, code: int) -> None:  # 线程完成回调
-        self._current_process = None  # 清理子进程
-        if code == 0:  # 成功时
-            simple = [SimpleCheck(name=item.name, status=item.status, message=item.message) for item in self._latest_checks]  # 转换为简单结构
-            self.status_panel.update_checks(simple)  # 更新状态面板
-        else:  # 失败时
+        self._busy = False  # 清除运行标记
+        signature = tuple((item.name, item.status, item.message) for item in self._latest_checks)  # 本次结果签名
+        if code != 0:  # 失败时
+            failure = (code, signature)  # 失败签名，连续相同失败视为无变化，刷新节奏照常退避
+            self.last_changed = failure != self._last_failure  # 记录是否变化
+            self._last_failure = failure  # 记录本次失败
+            self._previous_signature = None  # 面板改为错误提示，下次成功时整表重建
             self.status_panel.update_error("doctor 执行失败，请检查日志")  # 显示错误
+            return
+        self._last_failure = None  # 成功后清除失败记录
+        self.last_changed = True  # 结果变化时保持密集刷新
+        if signature == self._previous_signature:  # 与上次一致时不触碰面板
+            self.last_changed = False  # 记录无变化
+            return
+        current = {name: (status, message) for name, status, message in signature}  # 本次结果按名称索引
+        if self._previous_signature is None or len(current) != len(signature):  # 首次刷新或检查项重名时整表重建
+            self.status_panel.update_checks([SimpleCheck(name, status, message) for name, status, message in signature])
+        else:
+            previous = {name: (status, message) for name, status, message in self._previous_signature}  # 上次结果按名称索引
+            added = [SimpleCheck(name, *current[name]) for name in current if name not in previous]  # 新增行
+            removed = [name for name in previous if name not in current]  # 移除行
+            changed = [SimpleCheck(name, *current[name]) for name in current if name in previous and previous[name] != current[name]]  # 内容变化行
+            self.status_panel.update_checks_diff(added, removed, changed)  # 仅更新受影响的行
+        self._previous_signature = signature  # 记录本次签名
 
     def shutdown(self) -> None:  # 清理资源
-        if self.worker and self.worker.isRunning():  # 若线程仍运行
+        if self._busy and self.worker:  # 若线程仍运行
             self.logger.info("尝试停止自检线程")  # 输出日志
             self.worker.stop()  # 请求停止
-        if self._current_process and self._current_process.poll() is None:  # 若子进程仍存活
-            self.logger.warning("尝试终止自检进程")  # 输出警告
-            self._current_process.terminate()  # 终止进程
-            self._current_process = None  # 清理引用
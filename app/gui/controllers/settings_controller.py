@@ -8,12 +8,13 @@ import subprocess  # 打开目录
 import sys  # 判断操作系统
 from datetime import datetime  # 格式化时间
 from pathlib import Path  # 处理路径
-from typing import Callable, Dict  # 类型注解
+from typing import Callable, Dict, Optional  # 类型注解
 
 from PySide6.QtWidgets import QMessageBox  # 弹窗控件
 
 from app.gui.widgets.cookie_manager import CookieManager  # Cookie 管理组件
 from app.gui.widgets.status_panel import StatusPanel  # 状态面板组件
+from app.utils.helpers import load_json_bytes  # JSON 解析，可选 orjson 加速
 from app.utils.logger import get_logger  # 日志模块
 
 LOGGER = get_logger(__name__)  # 初始化日志器
@@ -37,16 +38,21 @@ class SettingsController:  # 设置控制器
             "wechat": self.cookie_dir / "wechat_mp.cookies.json",
             "zhihu": self.cookie_dir / "zhihu.cookies.json",
         }
+        self._last_info: Optional[Dict[str, Dict[str, str]]] = None  # 上次刷新得到的文件信息
 
-    def refresh_cookie_info(self) -> None:  # 刷新 Cookie 文件信息
+    def refresh_cookie_info(self) -> bool:  # 刷新 Cookie 文件信息，返回是否与上次不同
         info = {name: self._inspect_cookie(path) for name, path in self.cookie_files.items()}  # 收集信息
         self.widget.update_cookie_info(info)  # 更新组件
         self._sync_status_panel(info)  # 同步状态面板
+        changed = info != self._last_info  # 比较文件状态
+        self._last_info = info  # 记录本次结果
+        return changed
 
     def _inspect_cookie(self, path: Path) -> Dict[str, str]:  # 检查单个文件
-        if not path.exists():  # 文件不存在
+        try:
+            stat = path.stat()  # 单次 stat 同时判断存在性并获取文件状态
+        except OSError:  # 文件不存在或不可访问
             return {"status": "❌ 未找到", "mtime": "-", "size": "0 B"}  # 返回默认信息
-        stat = path.stat()  # 获取文件状态
         mtime = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")  # 格式化时间
         size = f"{stat.st_size} B"  # 构造大小
         return {"status": "✅ 存在", "mtime": mtime, "size": size}  # 返回信息
@@ -71,12 +77,14 @@ class SettingsController:  # 设置控制器
         if path is None:  # 未知平台
             QMessageBox.warning(None, "未知平台", platform)  # 弹窗提示
             return  # 返回
-        if not path.exists():  # 文件不存在
+        try:
+            raw = path.read_bytes()  # 读取原始字节，省去单独的存在性检查与文本解码
+        except FileNotFoundError:  # 文件不存在
             QMessageBox.warning(None, "未找到 Cookie", f"请先扫码登录 {platform}")  # 提示
             return  # 返回
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))  # 加载 JSON
-        except json.JSONDecodeError:  # 解析失败
+            data = load_json_bytes(raw)  # 加载 JSON，安装 orjson 时走快速路径
+        except json.JSONDecodeError:  # 解析失败（orjson 的异常同为其子类）
             QMessageBox.critical(None, "Cookie 无效", "JSON 文件损坏，请重新扫码")  # 提示
             return  # 返回
         expires = self._guess_expiry(data)  # 推测过期时间
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-  # 指定 UTF-8 编码防止中文注释乱码
+"""进程级共享线程池，复用工作线程运行长耗时任务并通过信号返回日志。"""  # 模块用途描述
+
+from __future__ import annotations  # 启用未来注解语法提升类型提示灵活度
+
+import threading  # 取消标记与完成事件
+import time  # 计算日志批次的刷新间隔
+import traceback  # 捕获异常堆栈以便记录
+from typing import Any, Callable, Iterable, List  # 引入泛型类型与可迭代对象
+
+from PySide6.QtCore import (  # Qt 线程池与信号基类
+    QObject,
+    QRunnable,
+    QThreadPool,
+    Signal,
+)
+
+from app.utils.logger import get_logger  # 引入统一日志模块
+
+LOGGER = get_logger(__name__)  # 初始化模块级记录器
+MAX_POOL_THREADS = 4  # 生成、投递、自检各占一个线程，预留一个余量
+LOG_BATCH_MIN = 64  # 逐行产出日志时的初始批次行数
+LOG_BATCH_MAX = 256  # 产出速度持续超过界面刷新时的批次上限
+LOG_FLUSH_INTERVAL = 0.01  # 距上次发送超过该秒数即发送当前批次
+
+GLOBAL_POOL = QThreadPool.globalInstance()  # 全部控制器共享的线程池
+GLOBAL_POOL.setMaxThreadCount(MAX_POOL_THREADS)  # 限制并发线程数
+
+
+class TaskSignals(QObject):  # 任务信号载体
+    """QRunnable 不是 QObject，由该对象在 GUI 线程中承载信号。"""  # 类说明
+
+    log_batch_signal = Signal(list)  # 日志信号一次携带多行文本，减少跨线程投递次数
+    done_signal = Signal(int)  # 完成信号携带返回码 0=成功 1=失败
+
+
+class TaskRunnable(QRunnable):  # 线程池任务实现
+    """包装任意可迭代任务，在共享线程池中执行并通过信号输出日志。"""  # 类说明
+
+    def __init__(self, func: Callable[..., Iterable[str] | None], *args: Any, **kwargs: Any) -> None:  # 构造函数记录待执行任务
+        super().__init__()  # 初始化 QRunnable 基类
+        self.setAutoDelete(False)  # 由控制器持有引用，避免 Qt 提前析构
+        self.func = func  # 保存任务函数引用
+        self.args = args  # 保存位置参数
+        self.kwargs = kwargs  # 保存关键字参数
+        self.signals = TaskSignals()  # 在调用线程（GUI 线程）创建信号对象
+        self._cancel = threading.Event()  # 取消标记，替代 QThread 的中断请求
+        self._finished = threading.Event()  # 任务结束标记，供 stop 限时等待
+
+    def run(self) -> None:  # 线程池分配线程后的执行入口
+        buffer: List[str] = []  # 待发送的日志行
+        batch_limit = LOG_BATCH_MIN  # 当前批次上限
+        last_flush = time.monotonic()  # 上次发送时间
+        try:
+            result = self.func(*self.args, **self.kwargs)  # 执行外部传入的任务函数
+            if result is not None:  # 若返回可迭代对象
+                for item in result:  # 逐项遍历日志输出，列表视为一次读取得到的整批行
+                    if self._cancel.is_set():  # 若收到取消请求
+                        LOGGER.debug("任务被请求中断，提前退出")  # 记录调试日志
+                        break  # 跳出循环
+                    if item is None:  # 忽略空行
+                        continue  # 直接跳过
+                    if isinstance(item, list):  # 子进程一次读取的整批行，生产者随后可能阻塞，立即发送
+                        buffer.extend(item)  # 生产者已给出 str 列表，无需逐行转换
+                    else:
+                        buffer.append(str(item))
+                        if len(buffer) >= batch_limit:  # 产出快于刷新间隔时放大批次
+                            batch_limit = min(batch_limit * 2, LOG_BATCH_MAX)
+                        elif time.monotonic() - last_flush < LOG_FLUSH_INTERVAL:  # 未满批且未到刷新间隔
+                            continue
+                        else:  # 按时间刷新说明产出放缓，恢复小批次以降低延迟
+                            batch_limit = LOG_BATCH_MIN
+                    self.signals.log_batch_signal.emit(buffer)  # 通过信号发送整批日志
+                    buffer = []  # 已发送的列表交由界面线程持有
+                    last_flush = time.monotonic()
+            if buffer:  # 发送剩余日志
+                self.signals.log_batch_signal.emit(buffer)
+            self.signals.done_signal.emit(0)  # 正常完成发出成功信号
+        except Exception as exc:  # noqa: BLE001  # 捕获任意异常保持线程稳定
+            stack = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))  # 格式化堆栈
+            LOGGER.error("后台任务异常\n%s", stack)  # 写入错误日志
+            self.signals.log_batch_signal.emit(buffer + [f"[ERROR] {exc}"])  # 连同未发送的日志通知界面出现错误
+            self.signals.done_signal.emit(1)  # 通知界面任务失败
+        finally:
+            self._finished.set()  # 标记任务结束
+
+    def is_cancelled(self) -> bool:  # 供任务函数轮询的取消状态
+        return self._cancel.is_set()  # 返回是否已请求取消
+
+    def stop(self, timeout: float = 2.0) -> None:  # 供外部调用的停止方法
+        self._cancel.set()  # 设置取消标记
+        self._finished.wait(timeout)  # 最多等待 timeout 秒结束
+
+
+def per_line(callback: Callable[[str], None]) -> Callable[[List[str]], None]:  # 批量回调适配
+    """将逐行日志回调包装为批量回调，供未提供批量接口的调用方使用。"""  # 函数说明
+
+    def forward(lines: List[str]) -> None:  # 逐行转发
+        for line in lines:
+            callback(line)
+
+    return forward
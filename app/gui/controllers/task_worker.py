@@ -1,49 +1,108 @@
 # -*- coding: utf-8 -*-  # 指定 UTF-8 编码防止中文注释乱码
-"""封装通用后台线程，负责运行长耗时任务并通过信号返回日志。"""  # 模块用途描述
+"""后台任务共用工具：按块读取子进程输出、限时回收子进程，以及在进程内调用脚本并转发其输出。"""  # 模块用途描述
 
 from __future__ import annotations  # 启用未来注解语法提升类型提示灵活度
 
-import traceback  # 捕获异常堆栈以便记录
-from typing import Any, Callable, Iterable  # 引入泛型类型与可迭代对象
-
-from PySide6.QtCore import QThread, Signal  # Qt 线程与信号基类
+import locale  # 与 text=True 相同的默认解码方式
+import os  # 按块读取管道
+import subprocess  # 子进程类型提示
+import threading  # 进程内调用脚本的辅助线程
+import time  # 轮询子进程退出
+from queue import Empty, SimpleQueue  # 辅助线程与任务线程之间传递日志
+from typing import Any, Callable, Generator, Iterator, List  # 引入迭代器类型
 
 from app.utils.logger import get_logger  # 引入统一日志模块
 
 LOGGER = get_logger(__name__)  # 初始化模块级记录器
+PIPE_READ_CHUNK = 1 << 16  # 每次从管道读取的最大字节数
+PROCESS_EXIT_TIMEOUT = 30  # stdout 关闭后等待子进程退出的秒数
+PROCESS_TERMINATE_TIMEOUT = 5  # 终止子进程后等待其排空管道的秒数
+PROCESS_POLL_INTERVAL = 0.005  # 轮询子进程退出的间隔秒数
+_CALL_DONE = object()  # 进程内调用结束的哨兵
+
+
+def iter_process_chunks(process: subprocess.Popen[bytes]) -> Iterator[List[str]]:  # 按块读取子进程输出
+    """以 64 KiB 为单位读取子进程 stdout，每次读取返回其中完整的行（不含换行符），EOF 时输出残余片段。"""  # 函数说明
+
+    assert process.stdout is not None  # 静态检查：stdout 必不为空
+    fd = process.stdout.fileno()  # 直接读取底层文件描述符，绕过逐行 readline
+    encoding = locale.getpreferredencoding(False)  # 与原 text=True 模式保持一致的解码
+    pending = b""  # 上一块末尾未结束的半行
+    while True:
+        chunk = os.read(fd, PIPE_READ_CHUNK)  # 阻塞直到有数据，一次取走管道内全部可读内容
+        if not chunk:  # 空字节串表示子进程已关闭 stdout
+            break
+        data = pending + chunk  # 拼接上次残留的半行
+        cut = data.rfind(b"\n") + 1  # 最后一个换行之后可能是不完整的行
+        pending = data[cut:]
+        if cut:  # 本次读取至少凑齐一行，整块解码一次再切分，不再逐行解码与 rstrip
+            yield data[:cut].decode(encoding, "replace").splitlines()
+    if pending:  # 输出没有以换行结尾时补发最后一行
+        yield pending.decode(encoding, "replace").splitlines()
+
 
+def wait_process(  # 等待子进程退出
+    process: subprocess.Popen[bytes],
+    timeout: float = PROCESS_EXIT_TIMEOUT,
+    cancelled: Callable[[], bool] | None = None,
+) -> int:
+    """在 stdout 读到 EOF 后轮询子进程退出，期间响应取消请求；超时则强制结束并排空管道，返回退出码。"""  # 函数说明
 
-class TaskWorker(QThread):  # 通用后台线程实现
-    """包装任意可迭代任务并通过信号输出日志。"""  # 类说明
+    deadline = time.monotonic() + timeout  # 超时截止时间
+    while (code := process.poll()) is None:  # 非阻塞检查退出状态
+        if cancelled is not None and cancelled():  # 任务被取消时立即终止子进程
+            terminate_process(process)
+            return process.returncode
+        if time.monotonic() >= deadline:  # 子进程关闭 stdout 后仍未退出
+            LOGGER.warning("子进程 %s 秒内未退出，强制结束", timeout)  # 记录警告
+            process.kill()  # 强制结束
+            process.communicate()  # 排空管道并回收进程
+            return process.returncode  # 返回被杀后的退出码
+        time.sleep(PROCESS_POLL_INTERVAL)  # 短暂休眠后再次检查
+    return code
 
-    log_signal = Signal(str)  # 日志信号用于输出每一行文本
-    done_signal = Signal(int)  # 完成信号携带返回码 0=成功 1=失败
 
-    def __init__(self, func: Callable[..., Iterable[str] | None], *args: Any, **kwargs: Any) -> None:  # 构造函数记录待执行任务
-        super().__init__()  # 初始化 QThread 基类
-        self.func = func  # 保存任务函数引用
-        self.args = args  # 保存位置参数
-        self.kwargs = kwargs  # 保存关键字参数
+def terminate_process(process: subprocess.Popen[bytes], timeout: float = PROCESS_TERMINATE_TIMEOUT) -> None:  # 终止子进程
+    """发送终止信号后用 communicate 排空管道，超时仍未退出则强制结束，避免遗留阻塞写入的孤儿进程。"""  # 函数说明
 
-    def run(self) -> None:  # 线程启动后的执行入口
+    process.terminate()  # 发送终止信号
+    try:
+        process.communicate(timeout=timeout)  # 排空管道缓冲并等待退出
+    except subprocess.TimeoutExpired:  # 子进程未响应终止信号
+        process.kill()  # 强制结束
+        process.communicate()  # 回收进程
+
+
+def iter_logged_call(func: Callable[[Callable[[str], None]], Any]) -> Generator[List[str], None, Any]:  # 进程内调用脚本
+    """在辅助线程中执行 ``func(log)``，把期间写入 ``log`` 的行按批产出；结束后返回 ``func`` 的返回值，异常原样抛出。"""  # 函数说明
+
+    lines: SimpleQueue = SimpleQueue()  # 辅助线程写入、任务线程读取
+    outcome: dict[str, Any] = {}  # 保存返回值或异常
+
+    def target() -> None:  # 辅助线程入口
         try:
-            result = self.func(*self.args, **self.kwargs)  # 执行外部传入的任务函数
-            if result is not None:  # 若返回可迭代对象
-                for line in result:  # 逐行遍历日志输出
-                    if self.isInterruptionRequested():  # 若收到中断请求
-                        LOGGER.debug("任务被请求中断，提前退出")  # 记录调试日志
-                        break  # 跳出循环
-                    if line is None:  # 忽略空行
-                        continue  # 直接跳过
-                    self.log_signal.emit(str(line))  # 通过信号发送日志文本
-            self.done_signal.emit(0)  # 正常完成发出成功信号
-        except Exception as exc:  # noqa: BLE001  # 捕获任意异常保持线程稳定
-            stack = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))  # 格式化堆栈
-            LOGGER.error("后台线程异常\n%s", stack)  # 写入错误日志
-            self.log_signal.emit(f"[ERROR] {exc}")  # 通知界面出现错误
-            self.done_signal.emit(1)  # 通知界面任务失败
-
-    def stop(self) -> None:  # 供外部调用的停止方法
-        self.requestInterruption()  # 设置中断标记
-        self.quit()  # 请求线程优雅退出
-        self.wait(2000)  # 最多等待 2 秒结束
+            outcome["result"] = func(lines.put)  # 每行日志直接入队
+        except BaseException as exc:  # noqa: BLE001  # 交由任务线程抛出
+            outcome["error"] = exc
+        finally:
+            lines.put(_CALL_DONE)  # 通知任务线程结束
+
+    threading.Thread(target=target, name=f"inproc-{getattr(func, '__name__', 'task')}", daemon=True).start()
+    finished = False
+    while not finished:
+        item = lines.get()  # 阻塞等待第一行
+        batch: List[str] = []  # 本批已就绪的行
+        while True:
+            if item is _CALL_DONE:  # 调用已结束
+                finished = True
+                break
+            batch.append(str(item))
+            try:
+                item = lines.get_nowait()  # 一并取走已就绪的行
+            except Empty:
+                break
+        if batch:
+            yield batch
+    if "error" in outcome:  # 透传调用异常
+        raise outcome["error"]
+    return outcome.get("result")
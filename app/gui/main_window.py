@@ -5,9 +5,10 @@ from __future__ import annotations  # 启用未来注解语法提升类型提示
 
 import logging  # 访问标准日志库以注入自定义 Handler
 from pathlib import Path  # 统一处理资源路径
-from typing import Callable  # 为回调定义清晰签名
+from collections import deque  # 日志缓冲区
+from typing import Callable, Deque, List  # 为回调定义清晰签名
 
-from PySide6.QtCore import QObject, Qt, Signal, QTimer  # Qt 基础类型、信号与定时器
+from PySide6.QtCore import QFileSystemWatcher, QObject, Qt, Signal, Slot, QTimer  # Qt 基础类型、信号、槽、文件监视与定时器
 from PySide6.QtGui import QAction, QIcon  # 工具栏动作与图标支持
 from PySide6.QtWidgets import (  # Qt 部件集合用于构建界面
     QHBoxLayout,
@@ -35,24 +36,44 @@ from app.gui.widgets.status_panel import StatusPanel  # 系统状态面板
 from app.utils.logger import get_logger  # 引入统一日志模块
 
 LOGGER = get_logger(__name__)  # 初始化当前模块记录器
+LOG_BUFFER_CAPACITY = 10000  # GUI 日志缓冲区上限
+LOG_DRAIN_BATCH = 500  # 每次事件循环最多取走的日志条数
+REFRESH_DELAYS_MS = (2000, 5000, 10000, 30000, 60000, 300000)  # 用户操作后先密后疏的刷新间隔，无变化时逐级退避至五分钟
 
 
 class _LogSignalEmitter(QObject):  # 自定义 QObject 以通过信号转发日志
-    """用于跨线程将日志字符串安全传递给界面。"""  # 类说明
+    """用于跨线程通知界面有待显示的日志。"""  # 类说明
 
-    log_signal = Signal(str)  # 定义信号携带日志文本
+    ready_signal = Signal()  # 缓冲区由空转为非空时发出，仅作唤醒不携带文本
 
 
 class QtLogHandler(logging.Handler):  # 自定义日志处理器将消息发往 Qt 信号
-    """将 Python 日志转发到 GUI。"""  # 类说明
+    """将 Python 日志写入有界缓冲区，并以排队信号唤醒 GUI 线程批量取走。"""  # 类说明
 
-    def __init__(self) -> None:  # 构造函数
+    def __init__(self, capacity: int = LOG_BUFFER_CAPACITY) -> None:  # 构造函数
         super().__init__()  # 调用父类初始化
         self.emitter = _LogSignalEmitter()  # 创建信号发射器实例
+        self._buffer: Deque[str] = deque(maxlen=capacity)  # 日志洪峰时丢弃最旧的记录
+        self._wakeup_pending = False  # 已发出唤醒但 GUI 尚未取走时不再重复发信号
+
+    def emit(self, record: logging.LogRecord) -> None:  # 重写 emit 方法，调用方 handle() 已持有 self.lock
+        self._buffer.append(self.format(record))  # 格式化后写入缓冲区
+        if not self._wakeup_pending:  # 仅在首条待取记录时唤醒界面
+            self._wakeup_pending = True
+            self.emitter.ready_signal.emit()
+
+    def drain(self, limit: int) -> List[str]:  # 供 GUI 线程批量取走日志
+        """取出最多 ``limit`` 条日志；仍有剩余时再次排队唤醒，让事件循环在两批之间处理其他事件。"""  # 方法说明
 
-    def emit(self, record: logging.LogRecord) -> None:  # 重写 emit 方法
-        message = self.format(record)  # 格式化日志记录
-        self.emitter.log_signal.emit(message)  # 通过信号发送日志文本
+        self.acquire()  # 与 emit 共用处理器锁
+        try:
+            batch = [self._buffer.popleft() for _ in range(min(limit, len(self._buffer)))]  # 按先后顺序取出
+            self._wakeup_pending = bool(self._buffer)  # 缓冲区清空后允许下一次唤醒
+        finally:
+            self.release()
+        if self._wakeup_pending:  # 剩余日志留到下一轮事件循环
+            self.emitter.ready_signal.emit()
+        return batch
 
 
 class StatusIndicator(QWidget):  # 自定义状态指示灯控件
@@ -90,7 +111,9 @@ class MainWindow(QMainWindow):  # 主窗口类
         self.tabs = QTabWidget()  # 创建中心标签页容器
         self.status_indicator = StatusIndicator()  # 创建状态指示灯
         self.qt_handler = QtLogHandler()  # 创建 Qt 日志处理器
-        self.refresh_timer: QTimer | None = None  # 定时器引用用于定期刷新
+        self.refresh_timer: QTimer | None = None  # 自适应刷新定时器
+        self._refresh_idx = 0  # 当前刷新间隔在 REFRESH_DELAYS_MS 中的位置
+        self.cookie_watcher: QFileSystemWatcher | None = None  # Cookie 目录监视器
         self._setup_logging_bridge()  # 注册日志信号桥梁
         self._build_toolbar()  # 构建顶部工具栏
         self._build_layout()  # 构建主界面布局
@@ -104,7 +127,11 @@ class MainWindow(QMainWindow):  # 主窗口类
         self.qt_handler.setLevel(logging.DEBUG)  # 设置处理器输出级别
         formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")  # 定义日志格式
         self.qt_handler.setFormatter(formatter)  # 绑定格式化器
-        self.qt_handler.emitter.log_signal.connect(self.log_viewer.append_log)  # 将信号接入日志窗口
+        self.qt_handler.emitter.ready_signal.connect(self._drain_log_handler, Qt.QueuedConnection)  # 始终排队到 GUI 线程，避免在绘制中重入
+
+    @Slot()
+    def _drain_log_handler(self) -> None:  # 批量取走处理器缓冲的日志
+        self.log_viewer.append_logs(self.qt_handler.drain(LOG_DRAIN_BATCH))  # 交由日志窗口合并刷新
 
     def _attach_logger(self, logger: logging.Logger) -> None:  # 将 GUI 处理器附加到指定 logger
         if self.qt_handler not in logger.handlers:  # 避免重复添加
@@ -134,6 +161,7 @@ class MainWindow(QMainWindow):  # 主窗口类
         central = QWidget(self)  # 创建中心容器
         root_layout = QVBoxLayout(central)  # 使用垂直布局组织组件
         splitter = QSplitter(Qt.Horizontal, central)  # 水平分割器负责左右布局
+        splitter.setOpaqueResize(False)  # 拖动时只移动预览线，松开后再重新布局左右面板
         left_panel = QWidget(splitter)  # 左侧容器
         left_layout = QVBoxLayout(left_panel)  # 左侧垂直布局
         left_layout.addWidget(self.status_panel)  # 上方放置状态面板
@@ -148,14 +176,48 @@ class MainWindow(QMainWindow):  # 主窗口类
         root_layout.addWidget(self.log_viewer, stretch=1)  # 底部日志窗口
         self.setCentralWidget(central)  # 设置中心部件
 
-    def _start_auto_refresh(self) -> None:  # 启动定时刷新任务
+    def _start_auto_refresh(self) -> None:  # 启动文件监视与自适应刷新
+        if self.cookie_watcher is None:  # 避免重复创建
+            self.cookie_watcher = QFileSystemWatcher(self)  # 由文件系统事件驱动 Cookie 刷新
+            self.cookie_watcher.directoryChanged.connect(self._on_cookie_path_changed)  # 目录内新增或删除文件
+            self.cookie_watcher.fileChanged.connect(self._on_cookie_path_changed)  # Cookie 文件内容变化
+            self._watch_cookie_paths()  # 注册监视路径
         if self.refresh_timer is None:  # 避免重复创建
-            self.refresh_timer = QTimer(self)  # 创建定时器
-            self.refresh_timer.setInterval(60000)  # 设置 60 秒
-            self.refresh_timer.timeout.connect(self.monitor_controller.refresh_status)  # 定时刷新系统状态
-            self.refresh_timer.timeout.connect(self.settings_controller.refresh_cookie_info)  # 定时刷新 Cookie
+            self.refresh_timer = QTimer(self)  # 创建刷新定时器
+            self.refresh_timer.setInterval(REFRESH_DELAYS_MS[self._refresh_idx])  # 启动后按最短间隔开始
+            self.refresh_timer.timeout.connect(self._on_refresh_tick)  # 到期刷新并调整间隔
             self.refresh_timer.start()  # 启动定时器
 
+    def _reset_refresh_cadence(self) -> None:  # 用户操作后恢复最短刷新间隔
+        self._refresh_idx = 0  # 回到首档
+        if self.refresh_timer is not None:
+            self.refresh_timer.start(REFRESH_DELAYS_MS[0])  # 以首档间隔重新计时
+
+    @Slot()
+    def _on_refresh_tick(self) -> None:  # 定时刷新
+        cookie_changed = self.settings_controller.refresh_cookie_info()  # 同步读取 Cookie 状态
+        changed = cookie_changed or self.monitor_controller.last_changed  # 自检异步执行，以上一轮结果判断
+        self.monitor_controller.refresh_status()  # 启动本轮自检
+        if changed:  # 有变化保持密集刷新
+            self._refresh_idx = 0
+        else:  # 无变化逐级退避
+            self._refresh_idx = min(self._refresh_idx + 1, len(REFRESH_DELAYS_MS) - 1)
+        self.refresh_timer.setInterval(REFRESH_DELAYS_MS[self._refresh_idx])  # 下一次到期生效
+
+    def _watch_cookie_paths(self) -> None:  # 补齐监视路径
+        cookie_dir = self.settings_controller.cookie_dir  # Cookie 目录
+        cookie_dir.mkdir(parents=True, exist_ok=True)  # 目录需存在才能监视
+        watched = set(self.cookie_watcher.directories()) | set(self.cookie_watcher.files())  # 已监视路径
+        candidates = [cookie_dir, *self.settings_controller.cookie_files.values()]  # 目录与各平台文件
+        missing = [str(path) for path in candidates if str(path) not in watched and path.exists()]  # 新建或被替换后失去监视的路径
+        if missing:
+            self.cookie_watcher.addPaths(missing)  # 一次注册
+
+    @Slot(str)
+    def _on_cookie_path_changed(self, _: str) -> None:  # Cookie 目录或文件变化
+        self._watch_cookie_paths()  # 原子替换写入会使文件监视失效，重新注册
+        self.settings_controller.refresh_cookie_info()  # 仅在变化时读取文件状态
+
     def _build_status_bar(self) -> None:  # 构建底部状态栏
         status_bar = QStatusBar(self)  # 创建状态栏
         status_bar.showMessage("准备就绪")  # 设置默认提示
@@ -164,9 +226,10 @@ class MainWindow(QMainWindow):  # 主窗口类
     def _init_controllers(self) -> None:  # 初始化控制器并连接信号
         log_callback: Callable[[str], None] = self.log_viewer.append_log  # 定义日志回调
         status_callback: Callable[[str, str], None] = self._update_indicator  # 定义状态灯回调
-        self.generator_controller = GeneratorController(log_callback, status_callback)  # 构造生成控制器
-        self.publisher_controller = PublisherController(log_callback, status_callback, self.report_viewer)  # 构造投递控制器
-        self.monitor_controller = MonitorController(log_callback, self.status_panel)  # 构造监控控制器
+        log_batch_callback: Callable[[List[str]], None] = self.log_viewer.append_logs  # 定义批量日志回调
+        self.generator_controller = GeneratorController(log_callback, status_callback, log_batch_callback)  # 构造生成控制器
+        self.publisher_controller = PublisherController(log_callback, status_callback, self.report_viewer, log_batch_callback)  # 构造投递控制器
+        self.monitor_controller = MonitorController(log_callback, self.status_panel, log_batch_callback)  # 构造监控控制器
         self.settings_controller = SettingsController(log_callback, self.cookie_manager, self.status_panel)  # 构造设置控制器
         for controller in (  # 遍历所有控制器并附加 GUI 日志处理器
             self.generator_controller,
@@ -178,16 +241,22 @@ class MainWindow(QMainWindow):  # 主窗口类
         self.cookie_manager.set_controller(self.settings_controller)  # 将控制器注入到 Cookie 管理组件
         self.report_viewer.set_controller(self.publisher_controller)  # 将控制器注入报表组件
 
+    @Slot(str, str)
     def _update_indicator(self, color: str, text: str) -> None:  # 更新状态指示灯
         self.status_indicator.set_state(color, text)  # 调用指示灯控件
         self.statusBar().showMessage(text)  # 同步更新状态栏提示
 
+    @Slot()
     def _on_generate_clicked(self) -> None:  # 响应生成按钮
         self.generator_controller.start_generation()  # 调用生成控制器
+        self._reset_refresh_cadence()  # 生成期间加密刷新
 
+    @Slot()
     def _on_publish_clicked(self) -> None:  # 响应投递按钮
         self.publisher_controller.start_publish()  # 调用投递控制器
+        self._reset_refresh_cadence()  # 投递期间加密刷新
 
+    @Slot()
     def _on_report_clicked(self) -> None:  # 响应导出报表按钮
         try:
             self.publisher_controller.export_report()  # 调用报表导出逻辑
@@ -196,9 +265,11 @@ class MainWindow(QMainWindow):  # 主窗口类
             QMessageBox.critical(self, "导出失败", str(exc))  # 弹窗显示错误信息
             LOGGER.exception("导出报表失败 error=%s", exc)  # 将异常写入日志
 
+    @Slot()
     def _on_refresh_clicked(self) -> None:  # 响应刷新按钮
         self.monitor_controller.refresh_status()  # 刷新系统状态
         self.settings_controller.refresh_cookie_info()  # 更新 Cookie 信息
+        self._reset_refresh_cadence()  # 手动刷新后加密刷新
 
     def closeEvent(self, event) -> None:  # 在窗口关闭时执行清理
         for controller in (
@@ -3,10 +3,12 @@
 
 from __future__ import annotations  # 启用未来注解
 
+from collections import deque  # 待插入的文本分块
 from pathlib import Path  # 处理路径
+from typing import Deque  # 类型注解
 
-from PySide6.QtCore import QItemSelection, Qt, QUrl  # Qt 核心类型
-from PySide6.QtGui import QDesktopServices  # 打开外部程序
+from PySide6.QtCore import QItemSelection, QObject, QRunnable, QThreadPool, QTimer, Qt, QUrl, Signal, Slot  # Qt 核心类型、线程池、定时器与信号槽
+from PySide6.QtGui import QDesktopServices, QTextCursor  # 打开外部程序与文本插入光标
 from PySide6.QtWidgets import (  # Qt 控件
     QApplication,
     QHBoxLayout,
@@ -21,6 +23,38 @@ from PySide6.QtWidgets import (  # Qt 控件
 
 from config.settings import OUTBOX_DIR  # 导入 outbox 配置
 
+MAX_PREVIEW_BYTES = 2 * 1024 * 1024  # 预览读取上限，超出部分不加载
+SELECTION_DEBOUNCE_MS = 150  # 选择停留该毫秒数后才读取文件
+PREVIEW_CHUNK_CHARS = 64 * 1024  # 每轮事件循环插入预览的字符数
+
+
+class _FileReadSignals(QObject):  # 读取结果信号载体
+    """QRunnable 不是 QObject，由该对象把读取结果排队送回 GUI 线程。"""  # 类说明
+
+    finished = Signal(str, str)  # (文件路径, 预览文本)
+
+
+class _FileReadJob(QRunnable):  # 后台读取任务
+    """在线程池中读取文件开头，避免大文件阻塞界面。"""  # 类说明
+
+    def __init__(self, path: Path, signals: _FileReadSignals, max_bytes: int = MAX_PREVIEW_BYTES) -> None:  # 构造函数
+        super().__init__()  # 初始化基类
+        self.path = path  # 待读取文件
+        self.signals = signals  # 由预览组件持有的信号对象
+        self.max_bytes = max_bytes  # 读取上限
+
+    def run(self) -> None:  # 线程池执行入口
+        try:
+            with self.path.open("rb") as handle:  # 二进制读取，按字节截断
+                raw = handle.read(self.max_bytes + 1)  # 多读一个字节用于判断是否截断
+        except OSError:  # 文件被删除或无权限
+            self.signals.finished.emit(str(self.path), "无法读取文件内容")  # 回退文本
+            return
+        content = raw[: self.max_bytes].decode("utf-8", errors="replace")  # 截断处的残缺字符以替换符显示
+        if len(raw) > self.max_bytes:  # 文件超过上限
+            content += f"\n\n……文件超过 {self.max_bytes // (1024 * 1024)} MiB，仅预览开头部分"  # 提示截断
+        self.signals.finished.emit(str(self.path), content)  # 交回 GUI 线程
+
 
 class ArticleViewer(QWidget):  # 文章预览组件
     """展示 outbox 目录树并支持预览选中文件。"""  # 类说明
@@ -29,14 +63,26 @@ class ArticleViewer(QWidget):  # 文章预览组件
         super().__init__(parent)  # 初始化父类
         self.outbox_dir = Path(OUTBOX_DIR).expanduser()  # 解析 outbox 目录
         self.current_file: Path | None = None  # 当前选中文件
+        self._read_signals = _FileReadSignals(self)  # 后台读取结果信号，所有任务共用
+        self._sel_timer = QTimer(self)  # 选择防抖定时器，方向键连续切换时只读取最后一项
+        self._sel_timer.setSingleShot(True)  # 单次触发
+        self._sel_timer.setInterval(SELECTION_DEBOUNCE_MS)  # 防抖间隔
+        self._sel_timer.timeout.connect(self._load_current_selection)  # 到期读取当前文件
+        self._pending_chunks: Deque[str] = deque()  # 尚未插入预览的分块
+        self._feed_timer = QTimer(self)  # 零间隔定时器，每轮事件循环插入一块
+        self._feed_timer.setInterval(0)  # 处理完其他事件后立即继续
+        self._feed_timer.timeout.connect(self._feed_chunks)  # 插入下一块
         self._build_ui()  # 构建界面
         self._load_model()  # 加载目录模型
 
     def _build_ui(self) -> None:  # 构建界面
         layout = QVBoxLayout(self)  # 主垂直布局
         splitter = QSplitter(Qt.Horizontal, self)  # 水平分割器
+        splitter.setOpaqueResize(False)  # 拖动时只移动预览线，松开后再重新布局
         self.model = QFileSystemModel(self)  # 文件系统模型
         self.model.setReadOnly(True)  # 设置只读
+        self.model.setOption(QFileSystemModel.DontUseCustomDirectoryIcons, True)  # 不读取目录自定义图标
+        self.model.directoryLoaded.connect(self._on_directory_loaded)  # 后台加载完成后按需展开
         self.tree = QTreeView(splitter)  # 左侧树视图
         self.tree.setModel(self.model)  # 绑定模型
         self.tree.setHeaderHidden(True)  # 隐藏表头
@@ -54,6 +100,8 @@ class ArticleViewer(QWidget):  # 文章预览组件
         right_layout.addLayout(button_bar)  # 添加按钮栏
         self.preview = QPlainTextEdit(right_container)  # 文本预览框
         self.preview.setReadOnly(True)  # 设置只读
+        self.preview.setUndoRedoEnabled(False)  # 分块插入不记录撤销栈
+        self._read_signals.finished.connect(self._on_file_loaded)  # 读取完成后更新预览
         right_layout.addWidget(self.preview)  # 添加预览框
         splitter.addWidget(self.tree)  # 将树加入分割器
         splitter.addWidget(right_container)  # 将右侧容器加入
@@ -64,30 +112,69 @@ class ArticleViewer(QWidget):  # 文章预览组件
     def _load_model(self) -> None:  # 加载目录模型
         self.outbox_dir.mkdir(parents=True, exist_ok=True)  # 确保目录存在
         root = self.model.setRootPath(str(self.outbox_dir))  # 设置根路径
-        self.tree.setRootIndex(root)  # 绑定根节点
-        self.tree.expandAll()  # 展开全部节点
+        self.tree.setRootIndex(root)  # 绑定根节点，子目录由模型后台加载后展开
+
+    @Slot(str)
+    def _on_directory_loaded(self, path: str) -> None:  # 目录内容加载完成
+        root = self.tree.rootIndex()  # outbox 根节点
+        if path != self.model.filePath(root):  # 只展开根目录的直接子目录，更深层级由用户点开
+            return
+        for row in range(self.model.rowCount(root)):  # 遍历第一层
+            child = self.model.index(row, 0, root)
+            if self.model.isDir(child):
+                self.tree.expand(child)  # 展开后模型再异步加载其内容
 
+    @Slot(QItemSelection, QItemSelection)
     def _on_selection_changed(self, selected: QItemSelection, _: QItemSelection) -> None:  # 选择变化
         indexes = selected.indexes()  # 获取索引
         if not indexes:  # 无选择
             return  # 返回
         index = indexes[0]  # 取第一个
-        file_path = Path(self.model.filePath(index))  # 获取路径
-        if file_path.is_file():  # 仅处理文件
-            self.current_file = file_path  # 记录当前文件
-            try:
-                content = file_path.read_text(encoding="utf-8")  # 读取内容
-            except Exception:  # noqa: BLE001  # 读取失败
-                content = "无法读取文件内容"  # 回退文本
-            self.preview.setPlainText(content)  # 更新预览
+        if not self.model.isDir(index):  # 仅处理文件，使用模型缓存的文件信息
+            self.current_file = Path(self.model.filePath(index))  # 记录当前文件，按钮立即可用
+            self._sel_timer.start()  # 重新计时，停留后再读取
         else:
+            self._sel_timer.stop()  # 取消待读取的文件
             self.current_file = None  # 清理当前文件
-            self.preview.clear()  # 清空预览
+            self._reset_preview()  # 清空预览
+
+    @Slot()
+    def _load_current_selection(self) -> None:  # 防抖到期后读取选中文件
+        if self.current_file is not None:
+            QThreadPool.globalInstance().start(_FileReadJob(self.current_file, self._read_signals))  # 后台读取，避免阻塞界面
+
+    @Slot(str, str)
+    def _on_file_loaded(self, path: str, content: str) -> None:  # 后台读取完成
+        if self.current_file is None or path != str(self.current_file):  # 选择已变化，丢弃过期结果
+            return
+        self._reset_preview()  # 停止上一个文件的插入
+        self._pending_chunks.extend(content[start : start + PREVIEW_CHUNK_CHARS] for start in range(0, len(content), PREVIEW_CHUNK_CHARS))  # 切分为固定大小的块
+        self._feed_chunks()  # 首块立即显示
+
+    def _reset_preview(self) -> None:  # 清空预览与待插入分块
+        self._feed_timer.stop()  # 停止插入
+        self._pending_chunks.clear()  # 丢弃剩余分块
+        self.preview.clear()  # 清空预览
+
+    @Slot()
+    def _feed_chunks(self) -> None:  # 插入一块文本，其余留待下一轮事件循环
+        if not self._pending_chunks:  # 已全部插入
+            self._feed_timer.stop()
+            return
+        cursor = QTextCursor(self.preview.document())  # 独立光标，不移动视图中的光标与滚动位置
+        cursor.movePosition(QTextCursor.End)  # 追加到末尾
+        cursor.insertText(self._pending_chunks.popleft())  # 插入当前块
+        if self._pending_chunks:  # 仍有剩余时让出事件循环
+            self._feed_timer.start()
+        else:
+            self._feed_timer.stop()
 
+    @Slot()
     def _open_folder(self) -> None:  # 打开所在文件夹
         target = self.current_file.parent if self.current_file else self.outbox_dir  # 确定目录
         QDesktopServices.openUrl(QUrl.fromLocalFile(str(target)))  # 调用系统打开
 
+    @Slot()
     def _copy_path(self) -> None:  # 复制路径
         if not self.current_file:  # 若未选中文件
             return  # 不执行
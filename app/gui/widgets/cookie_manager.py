@@ -3,8 +3,10 @@
 
 from __future__ import annotations  # 启用未来注解
 
+from functools import partial  # 绑定平台参数
 from typing import Dict  # 类型注解
 
+from PySide6.QtCore import Slot  # 槽声明
 from PySide6.QtWidgets import (  # Qt 控件
     QGridLayout,
     QGroupBox,
@@ -23,6 +25,7 @@ class CookieManager(QWidget):  # Cookie 管理组件
         super().__init__(parent)  # 初始化父类
         self.controller = None  # 控制器引用
         self.labels: Dict[str, Dict[str, QLabel]] = {}  # 存放各平台的标签
+        self._last_info: Dict[str, Dict[str, str]] = {}  # 各平台上次显示的信息
         self._build_ui()  # 构建界面
 
     def _build_ui(self) -> None:  # 构建界面布局
@@ -43,11 +46,11 @@ class CookieManager(QWidget):  # Cookie 管理组件
             grid.addWidget(mtime_label, 1, 0, 1, 2)  # 放置时间标签
             grid.addWidget(size_label, 2, 0, 1, 2)  # 放置大小标签
             check_button = QPushButton("检测有效性", box)  # 检测按钮
-            check_button.clicked.connect(lambda _, p=platform: self._check(p))  # 绑定事件
+            check_button.clicked.connect(partial(self._check, platform))  # 绑定事件，Qt 会丢弃多余的 checked 参数
             relogin_button = QPushButton("重新扫码登录", box)  # 重登按钮
-            relogin_button.clicked.connect(lambda _, p=platform: self._relogin(p))  # 绑定事件
+            relogin_button.clicked.connect(partial(self._relogin, platform))  # 绑定事件
             delete_button = QPushButton("删除缓存", box)  # 删除按钮
-            delete_button.clicked.connect(lambda _, p=platform: self._delete(p))  # 绑定事件
+            delete_button.clicked.connect(partial(self._delete, platform))  # 绑定事件
             grid.addWidget(check_button, 3, 0)  # 放置检测按钮
             grid.addWidget(relogin_button, 3, 1)  # 放置重登按钮
             grid.addWidget(delete_button, 4, 0, 1, 2)  # 放置删除按钮
@@ -67,22 +70,29 @@ class CookieManager(QWidget):  # Cookie 管理组件
             labels = self.labels.get(platform)  # 获取标签
             if not labels:  # 若未定义
                 continue  # 跳过
+            if self._last_info.get(platform) == payload:  # 内容未变化时不触发标签重新布局
+                continue
+            self._last_info[platform] = dict(payload)  # 记录本次显示内容
             labels["status"].setText(f"状态: {payload.get('status', '未知')}")  # 更新状态
             labels["mtime"].setText(f"更新时间: {payload.get('mtime', '-')}")  # 更新时间
             labels["size"].setText(f"文件大小: {payload.get('size', '-')}")  # 更新大小
 
+    @Slot()
     def _open_folder(self) -> None:  # 打开目录
         if self.controller:  # 若已绑定控制器
             self.controller.open_cookie_folder()  # 调用控制器
 
+    @Slot(str)
     def _check(self, platform: str) -> None:  # 检测按钮回调
         if self.controller:  # 若已绑定控制器
             self.controller.check_cookie(platform)  # 调用控制器
 
+    @Slot(str)
     def _relogin(self, platform: str) -> None:  # 重新扫码回调
         if self.controller:  # 若已绑定控制器
             self.controller.relogin(platform)  # 调用控制器
 
+    @Slot(str)
     def _delete(self, platform: str) -> None:  # 删除按钮回调
         if self.controller:  # 若已绑定控制器
             self.controller.delete_cookie(platform)  # 调用控制器
@@ -3,8 +3,11 @@
 
 from __future__ import annotations  # 启用未来注解
 
-from typing import List, Tuple  # 类型注解
+import re  # 匹配级别标记
+from collections import deque  # 待刷新日志缓冲
+from typing import Deque, List, Tuple  # 类型注解
 
+from PySide6.QtCore import QTimer, Slot  # 定时合并刷新与槽声明
 from PySide6.QtWidgets import (  # Qt 控件
     QComboBox,
     QHBoxLayout,
@@ -15,13 +18,23 @@ from PySide6.QtWidgets import (  # Qt 控件
     QWidget,
 )
 
+FLUSH_INTERVAL_MS = 80  # 合并写入编辑器的间隔毫秒数
+MAX_LOG_RECORDS = 5000  # 日志记录与编辑器保留的最大行数
+_LEVEL_RE = re.compile(r"\[(ERROR|WARNING|WARN|INFO|DEBUG)\]")  # 日志级别标记
+_LEVEL_PRIORITY = {"ERROR": 0, "WARNING": 1, "WARN": 2, "INFO": 3, "DEBUG": 4}  # 同一行含多个标记时的优先顺序
+
 
 class LogViewer(QWidget):  # 日志查看器
     """封装 QPlainTextEdit 提供过滤功能。"""  # 类说明
 
     def __init__(self, parent: QWidget | None = None) -> None:  # 构造函数
         super().__init__(parent)  # 初始化父类
-        self._records: List[Tuple[str, str]] = []  # 保存日志记录 (level, text)
+        self._records: Deque[Tuple[str, str]] = deque(maxlen=MAX_LOG_RECORDS)  # 保存最近的日志记录 (level, text)
+        self._pending: Deque[Tuple[str, str]] = deque()  # 尚未写入编辑器的记录
+        self._flush_timer = QTimer(self)  # 合并刷新定时器，有待写入记录时才启动
+        self._flush_timer.setSingleShot(True)  # 单次触发，空闲时不轮询
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)  # 刷新间隔
+        self._flush_timer.timeout.connect(self._flush)  # 到期后批量写入
         self._build_ui()  # 构建界面
 
     def _build_ui(self) -> None:  # 初始化界面
@@ -40,25 +53,50 @@ class LogViewer(QWidget):  # 日志查看器
         self.editor = QPlainTextEdit(self)  # 创建文本编辑器
         self.editor.setReadOnly(True)  # 设为只读
         self.editor.setLineWrapMode(QPlainTextEdit.NoWrap)  # 禁止自动换行
+        self.editor.setMaximumBlockCount(MAX_LOG_RECORDS)  # 超出上限时自动丢弃最早的行
         layout.addWidget(self.editor)  # 加入主布局
 
+    @Slot(str)
     def append_log(self, text: str) -> None:  # 追加日志
-        level = self._extract_level(text)  # 提取级别
-        self._records.append((level, text))  # 保存记录
-        if self._match_filter(level):  # 判断是否显示
-            self.editor.appendPlainText(text)  # 追加内容
-            self.editor.verticalScrollBar().setValue(self.editor.verticalScrollBar().maximum())  # 滚动到底
+        record = (self._extract_level(text), text)  # 提取级别
+        self._records.append(record)  # 保存记录
+        self._pending.append(record)  # 等待下一次合并刷新
+        self._schedule_flush()  # 确保刷新已排期
+
+    @Slot(list)
+    def append_logs(self, texts: List[str]) -> None:  # 批量追加日志
+        records = [(self._extract_level(text), text) for text in texts]  # 逐行提取级别
+        self._records.extend(records)  # 保存记录
+        self._pending.extend(records)  # 等待下一次合并刷新
+        self._schedule_flush()  # 确保刷新已排期
+
+    def _schedule_flush(self) -> None:  # 排期合并刷新
+        if self._pending and not self._flush_timer.isActive():  # 已排期时不重复启动，避免持续推迟
+            self._flush_timer.start()
+
+    @Slot()
+    def _flush(self) -> None:  # 将缓冲的记录一次写入编辑器
+        visible = [text for level, text in self._pending if self._match_filter(level)]  # 通过过滤的文本
+        self._pending.clear()  # 清空缓冲
+        if visible:  # 整批只追加与滚动一次
+            scroll_bar = self.editor.verticalScrollBar()  # 垂直滚动条
+            at_bottom = scroll_bar.value() >= scroll_bar.maximum() - 2  # 追加前是否停在底部
+            self.editor.appendPlainText("\n".join(visible))  # 追加内容
+            if at_bottom:  # 用户向上翻阅历史时保持当前位置
+                scroll_bar.setValue(scroll_bar.maximum())  # 滚动到底
 
+    @Slot()
     def clear_logs(self) -> None:  # 清空日志
         self._records.clear()  # 清除缓存
+        self._pending.clear()  # 丢弃尚未显示的记录
         self.editor.clear()  # 清空文本
 
     def _extract_level(self, text: str) -> str:  # 提取日志级别
-        for level in ("ERROR", "WARNING", "WARN", "INFO", "DEBUG"):  # 遍历候选
-            token = f"[{level}]"  # 构造匹配标记
-            if token in text:  # 若文本包含
-                return "WARNING" if level == "WARN" else level  # 统一 WARN 为 WARNING
-        return "INFO"  # 默认 INFO
+        found = _LEVEL_RE.findall(text)  # 单次正则扫描取出全部级别标记
+        if not found:  # 没有级别标记
+            return "INFO"  # 默认 INFO
+        level = min(found, key=_LEVEL_PRIORITY.__getitem__)  # 多个标记时按严重程度优先，与原逐项检查一致
+        return "WARNING" if level == "WARN" else level  # 统一 WARN 为 WARNING
 
     def _match_filter(self, level: str) -> bool:  # 判断是否匹配当前过滤
         current = self.filter_box.currentText()  # 获取选择
@@ -66,9 +104,8 @@ class LogViewer(QWidget):  # 日志查看器
             return True  # 返回 True
         return level == current  # 仅当级别一致
 
+    @Slot(str)
     def _apply_filter(self, _: str) -> None:  # 重新渲染日志
-        self.editor.clear()  # 清空显示
-        for level, text in self._records:  # 遍历记录
-            if self._match_filter(level):  # 判断过滤
-                self.editor.appendPlainText(text)  # 追加文本
+        self._pending.clear()  # 待刷新记录已包含在全量记录中，随本次重绘一并显示
+        self.editor.setPlainText("\n".join(text for level, text in self._records if self._match_filter(level)))  # 一次性替换全部文本
         self.editor.verticalScrollBar().setValue(self.editor.verticalScrollBar().maximum())  # 保持滚动到底
@@ -3,7 +3,8 @@
 
 from __future__ import annotations  # 启用未来注解
 
-from typing import Dict, List  # 类型注解
+import json  # 计算报表数据签名
+from typing import Any, Dict, List  # 类型注解
 
 from PySide6.QtCharts import (  # 图表控件
     QBarCategoryAxis,
@@ -33,6 +34,8 @@ class ReportViewer(QWidget):  # 报表组件
     def __init__(self, parent: QWidget | None = None) -> None:  # 构造函数
         super().__init__(parent)  # 初始化父类
         self.controller = None  # 保存控制器引用
+        self._last_sig: str | None = None  # 上次完整报表的签名
+        self._section_sigs: Dict[str, str] = {}  # 各图表与表格上次绘制时的数据签名
         self._build_ui()  # 构建界面
 
     def _build_ui(self) -> None:  # 构建界面
@@ -46,29 +49,81 @@ class ReportViewer(QWidget):  # 报表组件
         self.table.verticalHeader().setVisible(False)  # 隐藏行号
         layout.addWidget(self.table)  # 添加表格
         chart_row = QHBoxLayout()  # 第一排图表
-        self.line_view = QChartView(self)  # 折线图视图
+        self.line_view = QChartView(self._build_line_chart(), self)  # 折线图视图
         self.line_view.setRenderHint(QPainter.Antialiasing)  # 开启抗锯齿
         chart_row.addWidget(self.line_view)  # 添加折线图
-        self.pie_view = QChartView(self)  # 饼图视图
+        self.pie_view = QChartView(self._build_pie_chart(), self)  # 饼图视图
         self.pie_view.setRenderHint(QPainter.Antialiasing)  # 抗锯齿
         chart_row.addWidget(self.pie_view)  # 添加饼图
         layout.addLayout(chart_row)  # 将第一排加入布局
-        self.bar_view = QChartView(self)  # 柱状图视图
+        self.bar_view = QChartView(self._build_bar_chart(), self)  # 柱状图视图
         self.bar_view.setRenderHint(QPainter.Antialiasing)  # 抗锯齿
         layout.addWidget(self.bar_view)  # 添加柱状图
 
+    def _build_line_chart(self) -> QChart:  # 创建折线图，序列与坐标轴之后只更新数据
+        self._line_chart = QChart()  # 创建图表
+        self._line_chart.setTitle("近 7 日生成量")  # 设置标题
+        self._line_series = QLineSeries()  # 创建折线序列
+        self._line_chart.addSeries(self._line_series)  # 添加序列
+        self._line_axis_x = QValueAxis()  # X 轴使用数值轴
+        self._line_axis_x.setLabelFormat("%d")  # 设置标签格式
+        self._line_axis_x.setTitleText("天数序号")  # 标题
+        self._line_axis_y = QValueAxis()  # Y 轴
+        self._line_axis_y.setLabelFormat("%d")  # 设置标签格式
+        self._line_axis_y.setTitleText("篇数")  # 标题
+        self._line_chart.addAxis(self._line_axis_x, Qt.AlignBottom)  # 添加 X 轴
+        self._line_chart.addAxis(self._line_axis_y, Qt.AlignLeft)  # 添加 Y 轴
+        self._line_series.attachAxis(self._line_axis_x)  # 序列附加 X 轴
+        self._line_series.attachAxis(self._line_axis_y)  # 序列附加 Y 轴
+        return self._line_chart
+
+    def _build_pie_chart(self) -> QChart:  # 创建饼图
+        self._pie_chart = QChart()  # 创建图表
+        self._pie_chart.setTitle("平台成功率")  # 设置标题
+        self._pie_series = QPieSeries()  # 饼图序列
+        self._pie_chart.addSeries(self._pie_series)  # 添加序列
+        return self._pie_chart
+
+    def _build_bar_chart(self) -> QChart:  # 创建柱状图
+        self._bar_chart = QChart()  # 创建图表
+        self._bar_chart.setTitle("Top10 关键词")  # 标题
+        self._bar_set = QBarSet("出现次数")  # 数据集
+        self._bar_series = QBarSeries()  # 柱状序列
+        self._bar_series.append(self._bar_set)  # 添加数据集
+        self._bar_chart.addSeries(self._bar_series)  # 添加序列
+        self._bar_axis_x = QBarCategoryAxis()  # X 轴分类
+        self._bar_chart.addAxis(self._bar_axis_x, Qt.AlignBottom)  # 附加 X 轴
+        self._bar_series.attachAxis(self._bar_axis_x)  # 序列绑定 X 轴
+        self._bar_axis_y = QValueAxis()  # Y 轴
+        self._bar_axis_y.setTitleText("次数")  # 标题
+        self._bar_chart.addAxis(self._bar_axis_y, Qt.AlignLeft)  # 附加 Y 轴
+        self._bar_series.attachAxis(self._bar_axis_y)  # 序列绑定 Y 轴
+        return self._bar_chart
+
     def set_controller(self, controller) -> None:  # 注入控制器
         self.controller = controller  # 保存引用
 
     def update_report(self, data: Dict) -> None:  # 更新报表显示
+        sig = _signature(data)  # 完整报表签名
+        if sig == self._last_sig:  # 数据未变化时不重建表格与图表
+            return
+        self._last_sig = sig  # 记录签名
         window = data.get("window", {})  # 获取时间窗口
         self.info_label.setText(f"统计窗口: {window.get('start', '-') } 至 {window.get('end', '-')}")  # 更新说明
-        self._update_table(data)  # 更新表格
         metrics = data.get("metrics", {})  # 提取指标
-        self._update_line_chart(metrics.get("article_counts", {}))  # 更新折线图
-        self._update_pie_chart(metrics.get("platform", []))  # 更新饼图
         top_entities = metrics.get("top_entities", {})  # 获取热门实体
-        self._update_bar_chart(top_entities.get("keywords", []))  # 更新柱状图
+        sections = (  # 各区域的输入数据与更新函数
+            ("table", data, self._update_table),
+            ("line", metrics.get("article_counts", {}), self._update_line_chart),
+            ("pie", metrics.get("platform", []), self._update_pie_chart),
+            ("bar", top_entities.get("keywords", []), self._update_bar_chart),
+        )
+        for name, payload, update in sections:  # 仅重绘数据变化的区域
+            section_sig = sig if name == "table" else _signature(payload)  # 表格依赖整份报表
+            if self._section_sigs.get(name) == section_sig:
+                continue
+            self._section_sigs[name] = section_sig  # 记录区域签名
+            update(payload)  # 更新该区域
 
     def _update_table(self, data: Dict) -> None:  # 更新表格
         metrics = data.get("metrics", {})  # 提取指标
@@ -78,64 +133,52 @@ class ReportViewer(QWidget):  # 报表组件
             ("启用平台数", len(metrics.get("platform", []))),
             ("主题库存提示", metrics.get("dedup_hits", {})),
         ]
-        self.table.setRowCount(len(rows))  # 设置行数
-        for row, (name, value) in enumerate(rows):  # 遍历
-            self.table.setItem(row, 0, QTableWidgetItem(str(name)))  # 写入指标
-            self.table.setItem(row, 1, QTableWidgetItem(str(value)))  # 写入值
+        sorting = self.table.isSortingEnabled()  # 记录排序状态
+        self.table.setUpdatesEnabled(False)  # 填充期间暂停重绘
+        self.table.setSortingEnabled(False)  # 避免每次写入触发重排
+        self.table.blockSignals(True)  # 屏蔽逐格变化信号
+        try:
+            self.table.setRowCount(len(rows))  # 设置行数
+            for row, (name, value) in enumerate(rows):  # 遍历
+                self.table.setItem(row, 0, QTableWidgetItem(str(name)))  # 写入指标
+                self.table.setItem(row, 1, QTableWidgetItem(str(value)))  # 写入值
+        finally:
+            self.table.blockSignals(False)  # 恢复信号
+            self.table.setSortingEnabled(sorting)  # 恢复排序状态
+            self.table.setUpdatesEnabled(True)  # 恢复重绘
+        self.table.viewport().update()  # 统一重绘一次
 
     def _update_line_chart(self, counts: Dict[str, int]) -> None:  # 更新折线图
-        chart = QChart()  # 创建图表
-        chart.setTitle("近 7 日生成量")  # 设置标题
-        series = QLineSeries()  # 创建折线序列
-        if not counts:  # 若无数据
-            series.append(QPointF(0.0, 0.0))  # 添加占位点
-        for idx, day in enumerate(sorted(counts.keys())):  # 按日期排序
-            series.append(QPointF(float(idx), counts[day]))  # 使用索引作为 X 轴
-        chart.addSeries(series)  # 添加序列
-        axis_x = QValueAxis()  # X 轴使用数值轴
-        axis_x.setTickCount(max(len(counts), 1))  # 设置刻度
-        axis_x.setLabelFormat("%d")  # 设置标签格式
-        axis_x.setTitleText("天数序号")  # 标题
-        axis_y = QValueAxis()  # Y 轴
-        axis_y.setLabelFormat("%d")  # 设置标签格式
-        axis_y.setTitleText("篇数")  # 标题
-        chart.addAxis(axis_x, Qt.AlignBottom)  # 添加 X 轴
-        chart.addAxis(axis_y, Qt.AlignLeft)  # 添加 Y 轴
-        series.attachAxis(axis_x)  # 序列附加 X 轴
-        series.attachAxis(axis_y)  # 序列附加 Y 轴
-        self.line_view.setChart(chart)  # 更新视图
+        points = [QPointF(float(idx), counts[day]) for idx, day in enumerate(sorted(counts))]  # 按日期排序，使用索引作为 X 轴
+        if not points:  # 若无数据
+            points = [QPointF(0.0, 0.0)]  # 添加占位点
+        self._line_series.replace(points)  # 一次替换全部数据点，只发出一次 pointsReplaced
+        self._line_axis_x.setRange(0, max(len(points) - 1, 1))  # 复用坐标轴，仅调整范围
+        self._line_axis_x.setTickCount(max(len(points), 2))  # 设置刻度
+        self._line_axis_y.setRange(0, max(max(point.y() for point in points), 1))  # Y 轴覆盖最大值
 
     def _update_pie_chart(self, platforms: List[Dict]) -> None:  # 更新饼图
-        chart = QChart()  # 创建图表
-        chart.setTitle("平台成功率")  # 设置标题
-        series = QPieSeries()  # 饼图序列
+        self._pie_series.clear()  # 清空旧分片
         total = 0  # 总数
         for item in platforms:  # 遍历平台数据
             success = item.get("success", 0)  # 成功数
             total += success  # 累加
-            series.append(item.get("platform", "未知"), success)  # 添加分片
+            self._pie_series.append(item.get("platform", "未知"), success)  # 添加分片
         if total == 0:  # 若无数据
-            series.append("暂无数据", 1)  # 添加占位
-        chart.addSeries(series)  # 添加序列
-        self.pie_view.setChart(chart)  # 更新视图
+            self._pie_series.append("暂无数据", 1)  # 添加占位
 
     def _update_bar_chart(self, keywords: List[Dict]) -> None:  # 更新柱状图
-        chart = QChart()  # 创建图表
-        chart.setTitle("Top10 关键词")  # 标题
-        bar_set = QBarSet("出现次数")  # 数据集
-        categories = []  # 类别标签
-        for item in keywords[:10]:  # 取前十
-            categories.append(item.get("keyword", "未知"))  # 记录类别
-            bar_set.append(float(item.get("count", 0)))  # 追加数据
-        series = QBarSeries()  # 柱状序列
-        series.append(bar_set)  # 添加数据集
-        chart.addSeries(series)  # 添加序列
-        axis_x = QBarCategoryAxis()  # X 轴分类
-        axis_x.append(categories)  # 添加类别
-        chart.addAxis(axis_x, Qt.AlignBottom)  # 附加 X 轴
-        series.attachAxis(axis_x)  # 序列绑定 X 轴
-        axis_y = QValueAxis()  # Y 轴
-        axis_y.setTitleText("次数")  # 标题
-        chart.addAxis(axis_y, Qt.AlignLeft)  # 附加 Y 轴
-        series.attachAxis(axis_y)  # 序列绑定 Y 轴
-        self.bar_view.setChart(chart)  # 更新视图
+        top = keywords[:10]  # 取前十
+        categories = [item.get("keyword", "未知") for item in top]  # 类别标签
+        values = [float(item.get("count", 0)) for item in top]  # 出现次数
+        self._bar_set.remove(0, self._bar_set.count())  # 清空旧数据
+        self._bar_set.append(values)  # 一次性追加
+        self._bar_axis_x.clear()  # 清空旧类别
+        self._bar_axis_x.append(categories)  # 添加类别
+        self._bar_axis_y.setRange(0, max(values, default=0) or 1)  # Y 轴覆盖最大值
+
+
+def _signature(payload: Any) -> str:  # 计算数据签名
+    """以排序键的 JSON 文本作为签名，直接比较字符串避免哈希碰撞。"""  # 函数说明
+
+    return json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)  # 无法序列化的值按字符串处理
@@ -28,6 +28,7 @@ class StatusPanel(QWidget):  # 状态面板
 
     def __init__(self, parent: QWidget | None = None) -> None:  # 构造函数
         super().__init__(parent)  # 初始化父类
+        self._row_names: List[str] = []  # 表格各行对应的检查项名称
         self._build_ui()  # 构建界面
 
     def _build_ui(self) -> None:  # 构建界面布局
@@ -57,8 +58,29 @@ class StatusPanel(QWidget):  # 状态面板
             self.table.setItem(row, 0, QTableWidgetItem(item.status))  # 填写状态
             self.table.setItem(row, 1, QTableWidgetItem(item.name))  # 填写名称
             self.table.setItem(row, 2, QTableWidgetItem(item.message))  # 填写详情
+        self._row_names = [item.name for item in checks]  # 记录行与检查项的对应关系
         self._update_summary(checks)  # 更新顶部摘要
 
+    def update_checks_diff(self, added: List[SimpleCheck], removed: List[str], changed: List[SimpleCheck]) -> None:  # 增量更新表格
+        """只改动新增、移除与内容变化的行，其余行保持不变。"""  # 方法说明
+
+        for name in removed:  # 删除不再出现的检查项
+            row = self._row_names.index(name)  # 定位行号
+            self.table.removeRow(row)  # 删除行
+            del self._row_names[row]  # 同步名称列表
+        for item in changed:  # 原地更新状态与详情
+            row = self._row_names.index(item.name)  # 定位行号
+            self.table.setItem(row, 0, QTableWidgetItem(item.status))  # 更新状态
+            self.table.setItem(row, 2, QTableWidgetItem(item.message))  # 更新详情
+        for item in added:  # 新增检查项追加到末尾
+            row = self.table.rowCount()  # 新行行号
+            self.table.insertRow(row)  # 插入行
+            self.table.setItem(row, 0, QTableWidgetItem(item.status))  # 填写状态
+            self.table.setItem(row, 1, QTableWidgetItem(item.name))  # 填写名称
+            self.table.setItem(row, 2, QTableWidgetItem(item.message))  # 填写详情
+            self._row_names.append(item.name)  # 同步名称列表
+        self._update_summary(changed + added)  # 仅刷新受影响的摘要
+
     def _update_summary(self, checks: List[SimpleCheck]) -> None:  # 根据检查更新摘要标签
         for item in checks:  # 遍历检查结果
             if "数据库连接" in item.name:  # 匹配数据库状态
@@ -75,6 +97,7 @@ class StatusPanel(QWidget):  # 状态面板
         self.cookie_label.setText(f"Cookie 状态: {text}")  # 设置文本
 
     def update_error(self, message: str) -> None:  # 显示错误信息
+        self._row_names = []  # 错误行不对应任何检查项
         self.table.setRowCount(1)  # 设置单行
         self.table.setItem(0, 0, QTableWidgetItem("❌"))  # 状态列
         self.table.setItem(0, 1, QTableWidgetItem("系统自检"))  # 检查项
@@ -6,7 +6,7 @@ import argparse  # 解析命令行参数
 from datetime import date, datetime, timedelta, timezone  # TODO: 增加 timezone 以便软锁记录
 from typing import List  # 类型别名
 
-from sqlalchemy import or_, select, text  # 构造查询条件与手写 SQL
+from sqlalchemy import DateTime, bindparam, or_, select, text  # 构造查询条件与手写 SQL
 from sqlalchemy.orm import Session  # SQLAlchemy 会话类型
 
 from config.settings import settings  # 导入全局配置
@@ -155,8 +155,8 @@ def finalize_theme_used(db: Session, theme_id: int, run_id: str) -> None:
                 locked_at = NULL
             WHERE id = :theme_id
             """
-        ),
-        {"used_at": now.isoformat(), "run_id": run_id, "theme_id": theme_id},
+        ).bindparams(bindparam("used_at", type_=DateTime(timezone=True))),
+        {"used_at": now, "run_id": run_id, "theme_id": theme_id},  # 原生时间类型绑定，与软锁时间格式一致
     )
     db.commit()
 
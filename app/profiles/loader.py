@@ -92,6 +92,10 @@ def sync_profiles() -> List[Profile]:  # 同步函数
                 record.dispatch_mode = dispatch_mode  # 更新调度模式
                 LOGGER.info("更新 profile name=%s", name)  # 记录日志
             profiles.append(record)  # 加入返回列表
+    # 延迟导入，加载 Profile 模块时不创建分发库引擎
+    from app.dispatch.service import invalidate_profile_labels
+
+    invalidate_profile_labels()  # Profile 可能新增或变更，清除指标标签缓存
     return profiles  # 返回同步结果
 
 
@@ -2,29 +2,31 @@
 
 from __future__ import annotations  # 启用未来注解语法，保证类型注解字符串化
 
+from functools import lru_cache  # 进程内只加载一次模板
 from pathlib import Path  # 处理模板目录
 from typing import Dict, Iterable, Mapping, Tuple  # 类型提示
 
 from app.prompting import strategies  # 引入策略模块用于挑选 Variant
 
 PROMPTS_DIR = Path(__file__).parent / "prompts"  # 定义模板目录路径
-_PROMPT_CACHE: Dict[str, str] = {}  # 缓存已加载的模板文本
 
 
+@lru_cache(maxsize=1)
 def _load_all_prompts() -> Dict[str, str]:  # 内部函数：读取全部模板
-    """扫描 prompts 目录并缓存所有 Prompt 文本。"""  # 中文注释
+    """扫描 prompts 目录并缓存所有 Prompt 文本，目录为空时同样只扫描一次。"""  # 中文注释
 
-    if not _PROMPT_CACHE:  # 若缓存为空则执行加载
-        for path in PROMPTS_DIR.glob("*.txt"):  # 遍历所有 txt 文件
-            variant = path.stem  # 以文件名（去扩展名）作为 Variant 名称
-            _PROMPT_CACHE[variant] = path.read_text(encoding="utf-8")  # 读取文件内容并缓存
-    return _PROMPT_CACHE  # 返回缓存字典
+    prompts: Dict[str, str] = {}  # 收集模板文本
+    for path in PROMPTS_DIR.glob("*.txt"):  # 遍历所有 txt 文件
+        variant = path.stem  # 以文件名（去扩展名）作为 Variant 名称
+        prompts[variant] = path.read_text(encoding="utf-8")  # 读取文件内容
+    return prompts  # 返回模板字典
 
 
+@lru_cache(maxsize=1)
 def list_variants() -> Iterable[str]:  # 列出当前可用 Variant
     """返回所有已注册的 Prompt Variant 名称。"""  # 中文注释
 
-    return _load_all_prompts().keys()  # 直接返回缓存字典的键集合
+    return tuple(_load_all_prompts())  # 返回不可变的名称元组，可安全复用
 
 
 def get_prompt(variant: str) -> str:  # 根据 Variant 名称获取 Prompt
@@ -2,9 +2,12 @@
 
 from __future__ import annotations  # 启用未来注解语法
 
+import atexit  # 进程退出时冲刷异步指标
+import queue  # 异步指标队列
+import threading  # 后台写入线程
 from collections import deque  # 使用 deque 作为环形缓冲
 from datetime import datetime, timezone  # 处理时间戳
-from typing import Deque, Dict  # 类型提示
+from typing import Any, Deque, Dict, Tuple  # 类型提示
 
 import httpx  # HTTP 客户端
 from zoneinfo import ZoneInfo  # 处理时区
@@ -18,6 +21,9 @@ LOGGER = get_logger(__name__)  # 初始化日志记录器
 
 _METRIC_BUFFER: Deque[Dict] = deque(maxlen=settings.metrics_buffer_max)  # 创建本地缓冲队列
 _LOCAL_TZ = ZoneInfo(settings.tz)  # 根据配置初始化本地时区
+_ASYNC_QUEUE: "queue.Queue[Tuple[tuple, Dict[str, Any]]]" = queue.Queue(maxsize=8192)  # 待后台写入的指标调用
+_ASYNC_WORKER: threading.Thread | None = None  # 后台写入线程
+_ASYNC_WORKER_LOCK = threading.Lock()  # 保护线程惰性启动
 
 
 def _utc_naive_now() -> datetime:  # 生成朴素 UTC 时间
@@ -26,11 +32,18 @@ def _utc_naive_now() -> datetime:  # 生成朴素 UTC 时间
     return datetime.now(_LOCAL_TZ).astimezone(timezone.utc).replace(tzinfo=None)  # 生成时区时间并转换
 
 
-def emit_metric(kind: str, key: str, value: float, profile_id: int | None = None, platform: str | None = None) -> None:  # 定义指标上报函数
-    """记录指标事件到本地数据库，并视配置尝试远程上报。"""  # 中文说明
+def emit_metric(
+    kind: str,
+    key: str,
+    value: float,
+    profile_id: int | None = None,
+    platform: str | None = None,
+    ts: datetime | None = None,
+) -> None:  # 定义指标上报函数
+    """记录指标事件到本地数据库，并视配置尝试远程上报；``ts`` 缺省为当前时间。"""  # 中文说明
 
     event = {  # 构造事件字典
-        "ts": _utc_naive_now(),
+        "ts": ts or _utc_naive_now(),
         "kind": kind,
         "profile_id": profile_id,
         "platform": platform,
@@ -44,6 +57,53 @@ def emit_metric(kind: str, key: str, value: float, profile_id: int | None = None
         _try_remote_flush()  # 触发远程上报
 
 
+def emit_metric_async(kind: str, key: str, value: float, profile_id: int | None = None, platform: str | None = None) -> None:  # 非阻塞指标上报
+    """将指标调用放入队列由后台线程写入，队列已满时退回同步写入。"""  # 中文说明
+
+    ts = _utc_naive_now()  # 入队时刻即事件时间，避免记录为落库时间
+    _ensure_async_worker()  # 确保后台线程已启动
+    try:
+        _ASYNC_QUEUE.put_nowait(((kind, key, value), {"profile_id": profile_id, "platform": platform, "ts": ts}))  # 入队即返回
+    except queue.Full:  # 写入跟不上时施加背压
+        emit_metric(kind, key, value, profile_id=profile_id, platform=platform, ts=ts)  # 同步写入
+
+
+def flush_metrics() -> None:  # 等待异步指标落库
+    """阻塞直到已入队的异步指标全部写入，供关停流程与测试使用。"""  # 中文说明
+
+    if _ASYNC_WORKER is None or not _ASYNC_WORKER.is_alive():  # 线程未启动时无需等待
+        return
+    _ASYNC_QUEUE.join()  # 等待队列清空
+
+
+atexit.register(flush_metrics)  # 守护线程随解释器退出前先冲刷队列
+
+
+def _ensure_async_worker() -> None:  # 惰性启动后台线程
+    """首次使用时启动守护线程消费异步指标队列。"""  # 中文说明
+
+    global _ASYNC_WORKER  # 更新模块级线程引用
+    if _ASYNC_WORKER is not None and _ASYNC_WORKER.is_alive():  # 已在运行
+        return
+    with _ASYNC_WORKER_LOCK:  # 避免并发重复启动
+        if _ASYNC_WORKER is None or not _ASYNC_WORKER.is_alive():
+            _ASYNC_WORKER = threading.Thread(target=_drain_async_queue, name="metric-writer", daemon=True)  # 守护线程
+            _ASYNC_WORKER.start()  # 启动线程
+
+
+def _drain_async_queue() -> None:  # 后台线程主循环
+    """逐条取出异步指标并调用 emit_metric，单条失败只记录日志。"""  # 中文说明
+
+    while True:  # 常驻循环
+        args, kwargs = _ASYNC_QUEUE.get()  # 阻塞等待
+        try:
+            emit_metric(*args, **kwargs)  # 实际写入
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.warning("异步指标写入失败 key=%s error=%s", args[1], exc)  # 记录警告
+        finally:
+            _ASYNC_QUEUE.task_done()  # 标记完成
+
+
 def emit_log(event: Dict) -> None:  # 定义日志事件函数
     """暂存日志事件，当前版本主要写入调度库供 Dashboard 查询。"""  # 中文说明
 
@@ -1,12 +1,20 @@
 """通用工具函数集合。
 
-当前包含分块迭代器与时间工具，后续可扩展更多辅助函数。
+当前包含分块迭代器、时间工具与 JSON 解析，后续可扩展更多辅助函数。
 """
 
 from __future__ import annotations
 
+import json  # 标准库 JSON 解析
 from datetime import datetime  # 提供时间工具
-from typing import Iterable, List  # 类型注解，便于理解输入输出
+from typing import Any, Iterable, List  # 类型注解，便于理解输入输出
+
+try:  # 尝试引入 orjson，以 C 实现加速 JSON 解析
+    import orjson  # 可选依赖
+
+    ORJSON_AVAILABLE = True  # 标记 orjson 可用
+except Exception:  # noqa: BLE001
+    ORJSON_AVAILABLE = False  # 标记 orjson 不可用并回退到标准库
 
 
 def chunk_items(items: Iterable[str], size: int) -> List[List[str]]:
@@ -37,3 +45,11 @@ def utc_now_str() -> str:
     """返回当前 UTC 时间的 ISO 格式字符串。"""
 
     return datetime.utcnow().isoformat()  # 调用 datetime.utcnow 并转为字符串
+
+
+def load_json_bytes(data: bytes) -> Any:
+    """解析 UTF-8 编码的 JSON 字节串，安装了 orjson 时优先使用。"""
+
+    if ORJSON_AVAILABLE:  # orjson 直接接受字节串，省去解码
+        return orjson.loads(data)
+    return json.loads(data)  # 标准库同样接受 UTF-8 字节串
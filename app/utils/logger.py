@@ -9,6 +9,8 @@ from logging.handlers import TimedRotatingFileHandler  # 提供按时间滚动
 from pathlib import Path  # 统一处理路径
 from typing import Dict  # 类型注解字典
 
+import structlog  # 结构化日志库，部分模块直接使用
+
 from config.settings import LOG_DIR, LOG_LEVEL  # 导入日志目录和级别配置
 
 _COLOR_MAP = {  # 定义日志级别到 ANSI 颜色的映射表
@@ -84,3 +86,15 @@ def get_logger(name: str) -> logging.Logger:  # 对外提供获取日志记录
 
     _LOGGER_CACHE[name] = logger  # 将记录器缓存以复用
     return logger  # 返回配置好的记录器
+
+
+def _configure_structlog() -> None:  # 让 structlog 记录器同样遵循 LOG_LEVEL
+    """未被显式配置时，为 structlog 设置按级别过滤的包装类，低于级别的调用直接返回、不再渲染。"""  # 函数说明
+
+    if structlog.is_configured():  # 入口或测试已自行配置时不覆盖
+        return
+    level = getattr(logging, LOG_LEVEL, logging.INFO)  # 与标准日志记录器使用同一级别
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(level))  # 仅替换包装类，保留默认处理器
+
+
+_configure_structlog()  # 模块导入即生效，覆盖直接调用 structlog.get_logger() 的模块
@@ -7,7 +7,7 @@ import os  # 使用标准库 os 读取环境变量，兼容部署时的配置注
 import re  # 使用正则表达式校验部分凭据形状，避免格式错误
 from dataclasses import dataclass, field  # 从 dataclasses 导入 dataclass 与 field 以构建配置数据类
 from pathlib import Path  # 使用 Path 统一处理文件路径，避免硬编码字符串
-from typing import List  # 引入 List 类型注解以提升可读性
+from typing import Callable, List  # 引入 List 类型注解以提升可读性
 
 from dotenv import load_dotenv  # TODO: 继续支持 .env 加载
 
@@ -494,8 +494,8 @@ def _mask_value(value: str | None) -> str:  # 定义内部函数用于屏蔽敏
     return f"{value[0]}{'*' * (len(value) - 2)}{value[-1]}"  # 保留首尾字符并遮蔽中间部分
 
 
-def print_config(mask_secrets: bool = True) -> None:  # 定义打印配置的便捷函数
-    """输出关键配置，支持屏蔽敏感字段。"""  # 函数中文说明
+def print_config(mask_secrets: bool = True, emit: Callable[[str], None] = print) -> None:  # 定义打印配置的便捷函数
+    """输出关键配置，支持屏蔽敏感字段；``emit`` 可替换为 GUI 等其他逐行输出目标。"""  # 函数中文说明
 
     config_items = [  # 构造待打印配置项列表
         ("数据库 URL", settings.database.url, True),  # 数据库连接字符串属于敏感信息
@@ -533,7 +533,7 @@ def print_config(mask_secrets: bool = True) -> None:  # 定义打印配置的便
         ("日志级别", LOG_LEVEL, False),  # 当前日志级别
     ]  # 列表定义结束
 
-    print("当前配置概览:")  # 打印标题
+    emit("当前配置概览:")  # 打印标题
     for label, value, sensitive in config_items:  # 遍历配置项
         display_value = _mask_value(value) if mask_secrets and sensitive else value  # 根据敏感标记决定是否脱敏
-        print(f" - {label}: {display_value}")  # 逐行输出键值对
+        emit(f" - {label}: {display_value}")  # 逐行输出键值对
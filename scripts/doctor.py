@@ -3,6 +3,7 @@
 from __future__ import annotations  # 启用未来注解语法
 
 from pathlib import Path  # 处理路径
+from typing import Callable  # 输出回调类型
 
 from config.settings import settings, print_config  # 配置对象与打印函数
 from app.db.migrate import init_database  # 主业务数据库迁移
@@ -73,21 +74,28 @@ def check_scheduler() -> list[tuple[str, str]]:  # 检查调度表
     return items
 
 
-def main() -> None:  # 主函数
-    """执行全部自检并打印结果。"""  # 中文说明
+def run(log: Callable[[str], None] = print) -> int:  # 可在进程内调用的自检入口
+    """执行全部自检并逐行输出结果，返回退出码；GUI 直接调用以省去子进程启动。"""  # 中文说明
 
-    print_config(mask_secrets=True)  # 输出配置
+    print_config(mask_secrets=True, emit=log)  # 输出配置
     init_database()  # 确保主数据库存在
     run_migrations()  # 确保调度数据库存在
     status, message = check_secret()
-    print(status, message)
+    log(f"{status} {message}")
     for status_item, message_item in check_directories():
-        print(status_item, message_item)
+        log(f"{status_item} {message_item}")
     for status_item, message_item in check_profiles():
-        print(status_item, message_item)
+        log(f"{status_item} {message_item}")
     for status_item, message_item in check_scheduler():
-        print(status_item, message_item)
-    print(STATUS_OK, "自检完成")
+        log(f"{status_item} {message_item}")
+    log(f"{STATUS_OK} 自检完成")
+    return 0
+
+
+def main() -> None:  # 主函数
+    """执行全部自检并打印结果。"""  # 中文说明
+
+    run()  # 输出到标准输出
 
 
 if __name__ == "__main__":  # 脚本入口
@@ -0,0 +1,215 @@
+"""分发队列批量完成/失败与共享负载的集成测试，校验状态计数、JobRun 回写与负载读取。"""  # 中文说明
+
+from __future__ import annotations  # 启用未来注解语法
+
+import json  # 解析负载
+from datetime import date, datetime  # 构造 JobRun 运行日期与可领取时间
+from pathlib import Path  # 路径处理
+
+import pytest  # 测试框架
+from sqlalchemy.orm import sessionmaker  # Session 工厂
+
+from app.db import migrate_sched  # 引入调度库模块以便重绑 Session
+from app.db.migrate_sched import (  # 调度库工具
+    get_sched_engine,
+    run_migrations,
+    sched_session_scope,
+)
+from app.db.models_sched import (  # ORM 模型
+    JobRun,
+    PayloadBlob,
+    Profile,
+    QueueCounter,
+    TaskQueue,
+)
+from app.dispatch import service  # 分发业务逻辑
+from app.dispatch.store import dispatch_session_scope  # 分发库会话
+from config.settings import settings  # 全局配置
+
+
+@pytest.fixture
+def dispatch_env(tmp_path: Path, monkeypatch, temp_settings):  # 准备调度库与分发库
+    """重定向调度库并写入一个 Profile，返回其 ID。"""  # 函数中文说明
+
+    monkeypatch.setattr(settings, "sched_db_url", f"sqlite:///{tmp_path/'sched.db'}")  # 重定向调度数据库
+    monkeypatch.setattr(settings, "outbox_quarantine_dir", str(tmp_path / "quarantine"))  # 隔离目录
+    monkeypatch.setattr(migrate_sched, "SessionSched", sessionmaker(bind=get_sched_engine()))  # 重新绑定调度 Session
+    run_migrations()  # 初始化调度数据库
+    with sched_session_scope() as session:  # 写入 Profile
+        profile = Profile(name="batch_profile", yaml_path=str(tmp_path / "batch.yml"))
+        session.add(profile)
+        session.flush()
+        return profile.id
+
+
+def _enqueue_with_job_runs(profile_id: int, count: int, max_attempts: int) -> list[int]:  # 创建关联 JobRun 的任务
+    """为每个任务创建一条 JobRun，返回 JobRun ID 列表。"""  # 函数中文说明
+
+    job_run_ids = []  # 收集 JobRun ID
+    with sched_session_scope() as session:  # 创建 JobRun
+        for index in range(count):
+            job = JobRun(profile_id=profile_id, idempotency_key=f"batch-{index}", run_date=date.today(), status="queued")
+            session.add(job)
+            session.flush()
+            job_run_ids.append(job.id)
+    for job_run_id in job_run_ids:  # 逐个入队
+        service.enqueue_task(profile_id, {"job_run_id": job_run_id}, max_attempts=max_attempts)
+    return job_run_ids
+
+
+def _counters() -> dict[str, int]:  # 读取状态计数表
+    """返回 queue_counters 中非零的计数。"""  # 函数中文说明
+
+    with dispatch_session_scope() as session:
+        return {row.status: row.count for row in session.query(QueueCounter) if row.count}
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_fail_batch_splits_dead_and_retry(dispatch_env):  # 混合死亡与重试的批量失败
+    """同一批次内达到上限的任务转为 dead，其余退避重试，JobRun 分别标记 failed/retrying。"""  # 函数中文说明
+
+    job_run_ids = _enqueue_with_job_runs(dispatch_env, 2, max_attempts=1)  # 先入队两条仅允许一次尝试的任务
+    with dispatch_session_scope() as session:  # 将第二条放宽为可重试
+        task_ids = [task.id for task in session.query(TaskQueue).order_by(TaskQueue.id)]
+        session.get(TaskQueue, task_ids[1]).max_attempts = 3
+    leased = service.lease_tasks("batch-agent", limit=2)  # 租约两条任务
+    assert sorted(task.id for task in leased) == task_ids
+
+    results = service.fail_tasks_batch([(task_ids[0], "boom-0"), (task_ids[1], "boom-1")], "batch-agent")
+
+    assert [task.status for task in results] == ["dead", "pending"]  # 返回顺序与请求一致
+    assert _counters() == {"dead": 1, "pending": 1}  # 计数与状态同步
+    with sched_session_scope() as session:  # 校验 JobRun
+        jobs = {job.id: job for job in session.query(JobRun)}
+        assert (jobs[job_run_ids[0]].status, jobs[job_run_ids[0]].error) == ("failed", "boom-0")
+        assert (jobs[job_run_ids[1]].status, jobs[job_run_ids[1]].error) == ("retrying", "boom-1")
+    dead = service.list_dead_letters()  # 死信列表包含死亡任务
+    assert [item["task_id"] for item in dead] == [task_ids[0]]
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_complete_batch_updates_job_runs(dispatch_env):  # 批量完成
+    """批量完成一次写回全部任务与 JobRun，结果中的统计字段落库。"""  # 函数中文说明
+
+    job_run_ids = _enqueue_with_job_runs(dispatch_env, 2, max_attempts=3)
+    leased = service.lease_tasks("batch-agent", limit=2)
+    with sched_session_scope() as session:  # 租约后 JobRun 进入 running
+        assert {job.status for job in session.query(JobRun)} == {"running"}
+
+    results = service.complete_tasks_batch(
+        [(leased[0].id, {"emitted_articles": 2}), (leased[1].id, {"delivered_success": 1})], "batch-agent"
+    )
+
+    assert [task.status for task in results] == ["done", "done"]
+    assert _counters() == {"done": 2}
+    with sched_session_scope() as session:
+        jobs = {job.id: job for job in session.query(JobRun)}
+        assert {jobs[job_id].status for job_id in job_run_ids} == {"success"}
+        assert jobs[job_run_ids[0]].emitted_articles == 2
+        assert jobs[job_run_ids[1]].delivered_success == 1
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_batch_rejects_duplicate_task_ids(dispatch_env):  # 重复任务 ID
+    """同一任务在批次中出现两次时整体拒绝，计数保持不变。"""  # 函数中文说明
+
+    _enqueue_with_job_runs(dispatch_env, 1, max_attempts=3)
+    (task,) = service.lease_tasks("batch-agent", limit=1)
+
+    with pytest.raises(ValueError):
+        service.complete_tasks_batch([(task.id, {}), (task.id, {})], "batch-agent")
+
+    assert _counters() == {"leased": 1}
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_fail_batch_survives_quarantine_error(dispatch_env, monkeypatch):  # 隔离失败
+    """单个任务草稿隔离抛错时接口仍返回，其余任务的隔离信息照常回写。"""  # 函数中文说明
+
+    _enqueue_with_job_runs(dispatch_env, 2, max_attempts=1)
+    leased = service.lease_tasks("batch-agent", limit=2)
+    broken_id = leased[0].id  # 第一条任务隔离失败
+    original = service._move_task_drafts_to_quarantine
+
+    def flaky_move(task, error, now):  # 模拟权限错误
+        if task.id == broken_id:
+            raise PermissionError("quarantine dir not writable")
+        return original(task, error, now)
+
+    monkeypatch.setattr(service, "_move_task_drafts_to_quarantine", flaky_move)
+
+    results = service.fail_tasks_batch([(task.id, "boom") for task in leased], "batch-agent")
+
+    assert [task.status for task in results] == ["dead", "dead"]
+    with dispatch_session_scope() as session:
+        payloads = {task.id: task.payload_json for task in session.query(TaskQueue)}
+    assert payloads[broken_id] == ""  # 失败任务保持共享负载引用
+    assert "quarantined_paths" in payloads[leased[1].id]  # 其余任务已回写隔离信息
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_enqueue_stores_shared_payload_in_original_key_order(dispatch_env):  # 共享负载
+    """相同负载只存一份，任务行 payload_json 留空，租约后读到的负载保持入队时的键序。"""  # 函数中文说明
+
+    payload = {"run_date": "2024-01-01", "job_run_id": None, "dispatch": {"platforms": ["zhihu"]}}  # 非字母序的键
+    first = service.enqueue_task(dispatch_env, payload)
+    second = service.enqueue_task(dispatch_env, dict(payload))
+
+    with dispatch_session_scope() as session:
+        assert session.query(PayloadBlob).count() == 1  # 内容相同只写一行
+        rows = session.query(TaskQueue).order_by(TaskQueue.id).all()
+        assert [row.payload_json for row in rows] == ["", ""]
+        assert rows[0].payload_sha == rows[1].payload_sha
+    leased = service.lease_tasks("payload-agent", limit=2)
+    assert sorted(task.id for task in leased) == [first.id, second.id]
+    loaded = service.load_task_payload(leased[0])
+    assert loaded == payload
+    assert list(loaded) == list(payload)  # Worker 读到的键序与入队一致
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_quarantine_rewrites_shared_payload_inline(dispatch_env):  # 隔离改写
+    """任务死亡后隔离信息写入行内 payload_json，共享负载保持不变。"""  # 函数中文说明
+
+    payload = {"run_date": "2024-01-01", "job_run_id": None}
+    task = service.enqueue_task(dispatch_env, payload, max_attempts=1)
+    service.lease_tasks("payload-agent", limit=1)
+
+    (dead,) = service.fail_tasks_batch([(task.id, "boom")], "payload-agent")
+
+    assert dead.status == "dead"
+    with dispatch_session_scope() as session:
+        row = session.get(TaskQueue, task.id)
+        rewritten = service.load_task_payload(row)  # 行内负载优先
+        assert rewritten["run_date"] == "2024-01-01"
+        assert rewritten["quarantined_paths"] == []  # 无草稿可搬移
+        assert "quarantine_dir" in rewritten
+        (blob,) = session.query(PayloadBlob).all()
+        assert json.loads(blob.payload_json) == payload  # 共享行未被改写
+    (item,) = service.list_dead_letters()
+    assert (item["task_id"], item["quarantine_dir"]) == (task.id, rewritten["quarantine_dir"])
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_legacy_inline_payload_rows_still_load(dispatch_env):  # 旧数据兼容
+    """升级前写入的行内负载（payload_sha 为空）仍可租约、解析并完成。"""  # 函数中文说明
+
+    payload = {"job_run_id": None, "legacy": True}
+    with dispatch_session_scope() as session:  # 模拟升级前的任务行
+        legacy = TaskQueue(
+            profile_id=dispatch_env,
+            payload_json=json.dumps(payload),
+            payload_sha=None,
+            available_at=datetime.utcnow(),
+            status="pending",
+            max_attempts=3,
+        )
+        session.add(legacy)
+        session.flush()
+        legacy_id = legacy.id
+
+    (task,) = service.lease_tasks("payload-agent", limit=1)
+    assert task.id == legacy_id
+    assert service.load_task_payload(task) == payload
+    (done,) = service.complete_tasks_batch([(legacy_id, {})], "payload-agent")
+    assert done.status == "done"
@@ -0,0 +1,87 @@
+"""分发库迁移的集成测试，校验旧库补列、索引替换与状态计数重建可重复执行。"""  # 中文说明
+
+from __future__ import annotations  # 启用未来注解语法
+
+from pathlib import Path  # 路径处理
+
+import pytest  # 测试框架
+from sqlalchemy import create_engine, inspect, text  # 引擎、结构探测与原生 SQL
+
+from app.dispatch.store import SessionDispatch, run_dispatch_migrations  # 被测迁移
+from config.settings import settings  # 全局配置
+
+_LEGACY_SCHEMA = (  # 旧版队列表：缺少 payload_sha，仍带已退役的索引
+    """
+    CREATE TABLE task_queue (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        profile_id INTEGER NOT NULL,
+        payload_json TEXT NOT NULL,
+        created_at DATETIME NOT NULL,
+        available_at DATETIME NOT NULL,
+        priority INTEGER NOT NULL,
+        status VARCHAR(16) NOT NULL,
+        lease_until DATETIME,
+        lease_by VARCHAR(128),
+        attempts INTEGER NOT NULL,
+        max_attempts INTEGER NOT NULL,
+        last_error TEXT,
+        idempotency_key VARCHAR(128),
+        CONSTRAINT uq_taskqueue_idempo UNIQUE (idempotency_key)
+    )
+    """,
+    "CREATE INDEX idx_taskqueue_status_available ON task_queue(status, available_at)",
+    "CREATE TABLE queue_counters (status VARCHAR(16) PRIMARY KEY, count INTEGER NOT NULL)",
+    "INSERT INTO queue_counters (status, count) VALUES ('pending', 99), ('leased', 7)",  # 与队列不符的旧计数
+)
+
+_STATUSES = ("pending", "pending", "pending", "done", "done", "dead")  # 队列现状
+
+
+@pytest.fixture
+def dispatch_url(tmp_path: Path, monkeypatch):  # 准备旧版分发库
+    """在临时 SQLite 中写入旧版结构与任务，测试后恢复 Session 工厂绑定。"""  # 函数中文说明
+
+    url = f"sqlite:///{tmp_path/'dispatch.db'}"
+    engine = create_engine(url, future=True)
+    with engine.begin() as connection:
+        for statement in _LEGACY_SCHEMA:
+            connection.execute(text(statement))
+        connection.execute(
+            text(
+                "INSERT INTO task_queue (profile_id, payload_json, created_at, available_at, priority, status, attempts, max_attempts)"
+                " VALUES (1, '{}', '2024-01-01 00:00:00', '2024-01-01 00:00:00', 0, :status, 0, 3)"
+            ),
+            [{"status": status} for status in _STATUSES],
+        )
+    engine.dispose()
+    original_bind = SessionDispatch.kw.get("bind")  # 迁移会切换全局 Session 工厂绑定
+    monkeypatch.setattr(settings, "dispatch_db_url", url)
+    try:
+        yield url
+    finally:
+        SessionDispatch.configure(bind=original_bind)
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_migrations_upgrade_legacy_queue_idempotently(dispatch_url):  # 重复迁移
+    """连续执行两次迁移均成功，补齐新列与索引、删除退役索引，计数与队列现状一致。"""  # 函数中文说明
+
+    run_dispatch_migrations()
+    run_dispatch_migrations()
+
+    engine = create_engine(dispatch_url, future=True)
+    try:
+        inspector = inspect(engine)
+        columns = {column["name"] for column in inspector.get_columns("task_queue")}
+        indexes = {index["name"] for index in inspector.get_indexes("task_queue")}
+        with engine.connect() as connection:
+            counters = dict(connection.execute(text("SELECT status, count FROM queue_counters")).all())
+            task_count = connection.execute(text("SELECT COUNT(*) FROM task_queue")).scalar_one()
+    finally:
+        engine.dispose()
+
+    assert "payload_sha" in columns
+    assert {"idx_taskqueue_lease_order", "idx_taskqueue_dead"} <= indexes
+    assert "idx_taskqueue_status_available" not in indexes
+    assert counters == {"pending": 3, "done": 2, "dead": 1}
+    assert task_count == len(_STATUSES)
@@ -0,0 +1,132 @@
+"""生成结果批量持久化的集成测试，校验主键顺序、批内冲突回滚与单次提交。"""  # 中文说明
+
+from __future__ import annotations  # 启用未来注解语法
+
+from pathlib import Path  # 路径处理
+
+import pytest  # 测试框架
+from sqlalchemy import create_engine, event, text  # 引擎、会话事件与原生 SQL
+from sqlalchemy.orm import Session  # 会话类型
+
+from app.generator.persistence import insert_articles_tx  # 被测函数
+
+_SCHEMA = (  # 迁移 0006 之后 articles 与 used_pairs 的最小结构
+    """
+    CREATE TABLE articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT,
+        character_name TEXT NOT NULL,
+        work TEXT NOT NULL,
+        keyword TEXT NOT NULL,
+        title TEXT,
+        status TEXT NOT NULL,
+        content TEXT,
+        role_slug TEXT,
+        work_slug TEXT,
+        psych_keyword TEXT,
+        lang TEXT DEFAULT 'zh',
+        title_signature TEXT,
+        content_signature TEXT,
+        created_at TIMESTAMP NOT NULL,
+        meta JSON
+    )
+    """,
+    """
+    CREATE TABLE used_pairs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        character_name TEXT NOT NULL,
+        work TEXT NOT NULL,
+        keyword TEXT NOT NULL,
+        run_id TEXT NOT NULL,
+        used_on DATE NOT NULL,
+        similarity_hash TEXT,
+        role_slug TEXT,
+        work_slug TEXT,
+        psych_keyword TEXT,
+        lang TEXT DEFAULT 'zh',
+        first_used_at TIMESTAMP NOT NULL,
+        last_used_at TIMESTAMP NOT NULL
+    )
+    """,
+    "CREATE UNIQUE INDEX uq_used_pairs_combo ON used_pairs(role_slug, work_slug, psych_keyword, lang)",
+)
+
+_BODIES = (  # 内容差异足够大，避免触发 SimHash 近似判定
+    "清晨的港口飘着薄雾，渔船陆续靠岸，码头工人开始搬运一箱箱新鲜的海产。",
+    "深夜的图书馆只剩下翻书声，研究生在角落里反复推敲论文的实验设计。",
+    "山间小路蜿蜒曲折，徒步者背着沉重的行囊，沿着溪流寻找今晚的营地。",
+)
+
+
+@pytest.fixture
+def session(tmp_path: Path):  # 准备带最小结构的 SQLite 会话
+    """创建临时 SQLite 库并返回会话，测试结束后关闭。"""  # 函数中文说明
+
+    engine = create_engine(f"sqlite:///{tmp_path/'articles.db'}", future=True)
+    with engine.begin() as connection:  # 建表
+        for statement in _SCHEMA:
+            connection.execute(text(statement))
+    db_session = Session(bind=engine)
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        engine.dispose()
+
+
+def _rows(count: int) -> list[dict]:  # 构造互不冲突的文章
+    """返回 count 篇角色与正文各不相同的文章参数。"""  # 函数中文说明
+
+    return [
+        {"title": f"标题{index}", "body": _BODIES[index], "role": f"角色{index}", "work": "作品", "keyword": "关键词", "run_id": "run-1"}
+        for index in range(count)
+    ]
+
+
+def _count(session: Session, table: str) -> int:  # 统计表行数
+    """返回指定表的行数。"""  # 函数中文说明
+
+    return session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar_one()
+
+
+@pytest.mark.integration  # 标记为集成测试
+@pytest.mark.parametrize("returning", [True, False])
+def test_batch_returns_ids_in_row_order(session, monkeypatch, returning):  # 主键顺序
+    """RETURNING 批量路径与逐条插入回退路径返回的主键均与 rows 顺序一致。"""  # 函数中文说明
+
+    dialect = session.get_bind().dialect
+    monkeypatch.setattr(dialect, "insert_executemany_returning_sort_by_parameter_order", returning)
+    rows = _rows(3)
+
+    results = insert_articles_tx(session, rows)
+
+    ids_by_title = dict(session.execute(text("SELECT title, id FROM articles")).all())
+    assert [item["article_id"] for item in results] == [ids_by_title[row["title"]] for row in rows]
+    assert _count(session, "used_pairs") == 3
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_duplicate_in_batch_rolls_back_whole_batch(session):  # 批内冲突
+    """批内两篇组合相同时整批拒绝，articles 与 used_pairs 均不写入。"""  # 函数中文说明
+
+    rows = _rows(2)
+    rows.append(dict(rows[0], title="另一个标题", body=_BODIES[2]))  # 与第一篇组合相同、正文不同
+
+    with pytest.raises(ValueError, match="DUP_COMBO_DAY"):
+        insert_articles_tx(session, rows)
+
+    assert _count(session, "articles") == 0
+    assert _count(session, "used_pairs") == 0
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_batch_commits_once(session):  # 单次提交
+    """整批写入只提交一次事务。"""  # 函数中文说明
+
+    commits = []
+    event.listen(session, "after_commit", lambda _session: commits.append(1))
+
+    insert_articles_tx(session, _rows(3))
+
+    assert len(commits) == 1
+    assert _count(session, "articles") == 3
@@ -0,0 +1,123 @@
+"""主题软锁领取与释放的集成测试，覆盖 UPDATE ... RETURNING 与查询后更新两条路径。"""  # 中文说明
+
+from __future__ import annotations  # 启用未来注解语法
+
+import importlib  # 在替身模块就位后导入被测模块
+import sys  # 替换 app.prompting 模块
+import types  # 构造替身模块
+from pathlib import Path  # 路径处理
+
+import pytest  # 测试框架
+from sqlalchemy import create_engine, text  # 引擎与原生 SQL
+from sqlalchemy.orm import Session  # 会话类型
+
+from config.settings import settings  # 全局配置
+
+
+@pytest.fixture
+def generator(monkeypatch):  # 以替身 app.prompting 导入文章生成模块
+    """文章生成模块依赖的 Prompt 工具与软锁无关，替换为空模块后导入。"""  # 函数中文说明
+
+    package = types.ModuleType("app.prompting")  # 替身包，跳过真实 __init__
+    package.__path__ = []
+    registry = types.ModuleType("app.prompting.registry")
+    registry.choose_prompt_variant = registry.get_prompt = registry.list_variants = None
+    guards = types.ModuleType("app.prompting.guards")
+    guards.evaluate_quality = None
+    for name, module in (("app.prompting", package), ("app.prompting.registry", registry), ("app.prompting.guards", guards)):
+        monkeypatch.setitem(sys.modules, name, module)
+    sys.modules.pop("app.generator.article_generator", None)  # 确保在替身就位后重新导入
+    try:
+        yield importlib.import_module("app.generator.article_generator")
+    finally:
+        sys.modules.pop("app.generator.article_generator", None)  # 不把绑定替身的模块留给其他测试
+
+
+@pytest.fixture
+def session(tmp_path: Path):  # 准备含三条主题的 SQLite 会话
+    """创建临时 SQLite 库并写入三条未使用主题。"""  # 函数中文说明
+
+    engine = create_engine(f"sqlite:///{tmp_path/'themes.db'}", future=True)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE psychology_themes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    psychology_keyword TEXT NOT NULL,
+                    psychology_definition TEXT,
+                    character_name TEXT,
+                    show_name TEXT,
+                    locked_by_run_id TEXT,
+                    locked_at TIMESTAMP,
+                    used INTEGER DEFAULT 0,
+                    used_at TIMESTAMP,
+                    used_by_run_id TEXT
+                )
+                """
+            )
+        )
+        connection.execute(
+            text("INSERT INTO psychology_themes (psychology_keyword, character_name, show_name) VALUES (:keyword, '角色', '作品')"),
+            [{"keyword": f"关键词{index}"} for index in range(3)],
+        )
+    db_session = Session(bind=engine)
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        engine.dispose()
+
+
+@pytest.fixture(params=[True, False], ids=["returning", "select_update"])
+def lease_path(request, session, monkeypatch):  # 切换两条领取路径
+    """通过方言的 update_returning 标记选择 RETURNING 或查询后更新路径。"""  # 函数中文说明
+
+    monkeypatch.setattr(session.get_bind().dialect, "update_returning", request.param)
+    return request.param
+
+
+def _locks(session: Session) -> dict[int, str | None]:  # 读取软锁持有者
+    """返回主题 ID 到 locked_by_run_id 的映射。"""  # 函数中文说明
+
+    return dict(session.execute(text("SELECT id, locked_by_run_id FROM psychology_themes")).all())
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_lease_locks_themes_in_id_order(generator, session, lease_path):  # 领取
+    """按 id 顺序领取并软锁，已锁定的主题不会再被领取。"""  # 函数中文说明
+
+    first = generator.lease_themes_for_run(session, "run-a", limit=2)
+    second = generator.lease_themes_for_run(session, "run-b", limit=2)
+
+    assert [row["id"] for row in first] == [1, 2]
+    assert {row["locked_by_run_id"] for row in first} == {"run-a"}
+    assert [row["psychology_keyword"] for row in second] == ["关键词2"]
+    assert generator.lease_themes_for_run(session, "run-c", limit=1) == []
+    assert _locks(session) == {1: "run-a", 2: "run-a", 3: "run-b"}
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_expired_locks_can_be_leased_again(generator, session, lease_path, monkeypatch):  # 过期重领
+    """软锁超过过期时长后可被其他运行重新领取。"""  # 函数中文说明
+
+    generator.lease_themes_for_run(session, "run-a", limit=3)
+    assert generator.lease_themes_for_run(session, "run-b", limit=3) == []
+
+    monkeypatch.setattr(settings, "lock_expire_minutes", -1)  # 过期阈值晚于现有锁时间，全部视为过期
+    released = generator.lease_themes_for_run(session, "run-b", limit=3)
+
+    assert [row["id"] for row in released] == [1, 2, 3]
+    assert set(_locks(session).values()) == {"run-b"}
+
+
+@pytest.mark.integration  # 标记为集成测试
+def test_release_clears_locks_for_next_run(generator, session, lease_path):  # 释放
+    """批量释放只清除指定主题的软锁，释放后可立即被再次领取。"""  # 函数中文说明
+
+    generator.lease_themes_for_run(session, "run-a", limit=3)
+
+    generator.release_theme_locks(session, [1, 3])
+
+    assert _locks(session) == {1: None, 2: "run-a", 3: None}
+    assert [row["id"] for row in generator.lease_themes_for_run(session, "run-b", limit=3)] == [1, 3]
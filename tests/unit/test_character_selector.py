@@ -0,0 +1,77 @@
+"""角色选择工具的单元测试，校验元组缓存与按名索引的结果与逐条扫描一致。"""  # 模块中文说明
+
+from __future__ import annotations  # 启用未来注解
+
+import json  # 写入临时角色库
+import random  # 固定随机种子
+from pathlib import Path  # 路径处理
+
+import pytest  # 测试框架
+
+from app.generator import character_selector  # 被测模块
+
+_ENTRIES = [  # 含同名不同作品与首尾空白的角色库
+    {"name": " 艾丽丝 ", "work": "心理课堂", "traits": [" 自信 ", "好奇"]},
+    {"name": "拓也", "work": "东方疗愈", "traits": ["冷静"]},
+    {"name": "艾丽丝", "work": "镜中世界", "traits": ["敏感"]},
+    {"name": "米娅", "work": "城市夜行", "traits": ["独立", " 坚韧"]},
+]
+
+
+def _scan_reference() -> list[dict]:
+    """按改造前的逻辑逐条清洗，作为对照结果。"""  # 内部函数说明
+
+    return [
+        {"name": entry["name"].strip(), "work": entry["work"].strip(), "traits": [trait.strip() for trait in entry["traits"]]}
+        for entry in _ENTRIES
+    ]
+
+
+@pytest.fixture
+def character_file(tmp_path: Path, monkeypatch) -> Path:  # 重定向角色库文件
+    """写入临时角色库并清空加载缓存，测试结束后再次清空。"""  # 夹具说明
+
+    path = tmp_path / "characters.json"
+    path.write_text(json.dumps(_ENTRIES, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(character_selector, "CHARACTER_FILE_PATH", path)
+    character_selector._load_characters.cache_clear()
+    yield path
+    character_selector._load_characters.cache_clear()
+
+
+def _normalized(character: dict | None) -> dict | None:
+    """traits 改为只读元组后按列表比较。"""  # 内部函数说明
+
+    return None if character is None else dict(character, traits=list(character["traits"]))
+
+
+def test_lookup_by_name_matches_list_scan(character_file) -> None:
+    """按名索引返回逐条扫描的首个同名角色，未命中返回 None。"""  # 测试说明
+
+    reference = _scan_reference()
+    for name in ("艾丽丝", "拓也", "米娅", "不存在"):
+        expected = next((item for item in reference if item["name"] == name), None)
+        assert _normalized(character_selector.get_character_by_name(name)) == expected
+
+
+def test_random_selection_matches_list_scan(character_file) -> None:
+    """相同随机种子下与对列表调用 random.choice 的结果一致，traits 为清洗后的元组。"""  # 测试说明
+
+    reference = _scan_reference()
+    random.seed(7)
+    expected = [random.choice(reference) for _ in range(20)]
+    random.seed(7)
+    picked = [character_selector.get_random_character() for _ in range(20)]
+
+    assert [_normalized(item) for item in picked] == expected
+    assert all(isinstance(item["traits"], tuple) for item in picked)
+
+
+def test_duplicate_combination_is_rejected(character_file) -> None:
+    """同名同作品的重复条目仍被拒绝。"""  # 测试说明
+
+    character_file.write_text(json.dumps(_ENTRIES + [_ENTRIES[1]], ensure_ascii=False), encoding="utf-8")
+    character_selector._load_characters.cache_clear()
+
+    with pytest.raises(character_selector.CharacterSelectorError):
+        character_selector.ensure_unique_characters()
@@ -0,0 +1,27 @@
+"""异步指标上报的单元测试。"""  # 模块中文说明
+
+from __future__ import annotations  # 启用未来注解
+
+from datetime import datetime  # 构造固定时间戳
+
+from app.telemetry import client  # 引入被测遥测客户端
+
+
+def test_emit_metric_async_keeps_enqueue_timestamp(monkeypatch) -> None:
+    """后台线程落库时应使用入队时刻的时间戳，而非写入时刻。"""  # 测试说明
+
+    enqueued_at = datetime(2024, 1, 1, 8, 0)  # 固定入队时间
+    monkeypatch.setattr(client, "_utc_naive_now", lambda: enqueued_at)  # 固定时钟
+    written: list[dict] = []  # 记录实际写入参数
+
+    def fake_emit(kind, key, value, profile_id=None, platform=None, ts=None) -> None:
+        """记录写入参数而不访问数据库。"""  # 内部函数说明
+
+        written.append({"key": key, "ts": ts})  # 保存调用
+
+    monkeypatch.setattr(client, "emit_metric", fake_emit)  # 替换同步写入
+
+    client.emit_metric_async("dispatch", "task_success", 1)  # 异步上报
+    client.flush_metrics()  # 等待后台线程写完
+
+    assert written == [{"key": "task_success", "ts": enqueued_at}]
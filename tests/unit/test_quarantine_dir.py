@@ -0,0 +1,35 @@
+"""死信隔离目录提取的单元测试。"""  # 模块中文说明
+
+from __future__ import annotations  # 启用未来注解
+
+import json  # 序列化负载
+from types import SimpleNamespace  # 构造轻量行对象
+
+from app.dispatch.service import _extract_quarantine_dir  # 引入被测函数
+
+
+def _row(payload: dict) -> SimpleNamespace:
+    """构造仅含行内负载的任务行。"""  # 内部函数说明
+
+    return SimpleNamespace(payload_json=json.dumps(payload), payload_sha=None)
+
+
+def test_extract_quarantine_dir_prefers_top_level_key() -> None:
+    """顶层键位于嵌套同名键之前时仍返回顶层值。"""  # 测试说明
+
+    payload = {"quarantine_dir": "/q/top", "dispatch": {"quarantine_dir": "/q/nested"}}
+    assert _extract_quarantine_dir(_row(payload)) == "/q/top"
+
+
+def test_extract_quarantine_dir_unescapes_value() -> None:
+    """返回反转义后的字符串，未隔离返回 None。"""  # 测试说明
+
+    assert _extract_quarantine_dir(_row({"quarantine_dir": '/q/"x"'})) == '/q/"x"'
+    assert _extract_quarantine_dir(_row({"job_run_id": 1})) is None
+
+
+def test_extract_quarantine_dir_ignores_nested_key() -> None:
+    """只有嵌套对象含同名键时视为未隔离。"""  # 测试说明
+
+    payload = {"job_run_id": 1, "dispatch": {"quarantine_dir": "/nested/only"}}
+    assert _extract_quarantine_dir(_row(payload)) is None